@@ -0,0 +1,1247 @@
+#!/usr/bin/python3
+
+"""
+ABI-driven binary serializer of action data and transactions.
+
+.. module:: abi
+    :platform: Unix, Windows
+    :synopsis: ABI-driven binary serializer of action data and transactions.
+
+.. moduleauthor:: Tokenika
+
+An `Abi` object is made of the ABI of a contract, loaded once, from the `.abi`
+file produced by `teos.ABI`, or from the chain. It compiles a pair of pack and
+unpack functions for each type used, and packs action data to the binary form
+`nodeos` consumes, without a `cleos` process and its ABI lookup::
+
+    token_abi = abi.get_abi("eosio.token")
+    action = token_abi.action(
+        "eosio.token", "transfer",
+        {"from": "alice", "to": "carol", "quantity": "1.0000 EOS", "memo": ""},
+        "alice@active")
+
+The `data` of the action is hex, hence `cleos.PushTransaction` passes it to
+the node as is. Whole transactions are packed with `pack_transaction()`, and
+inspected with `unpack_transaction()`.
+
+Binary table rows, see `cleos.GetTable`, are decoded one by one with
+`Abi.unpack_rows()`, or in bulk with `Abi.unpack_columns()` if the rows have
+a fixed layout, like the `account` rows of `eosio.token`. If `numpy` is
+importable, bulk decoding returns a structured array, else a dictionary of
+`array.array` columns.
+"""
+
+import os
+import time
+import array
+import struct
+import hashlib
+import calendar
+import datetime
+import binascii
+import threading
+import tempfile
+import collections
+import json as json_module
+import setup
+import counters
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class AbiError(ValueError):
+    """ A value does not match its ABI type.
+    """
+    pass
+
+
+###############################################################################
+# names, symbols, assets, keys, time
+###############################################################################
+
+_NAME_CHARS = ".12345abcdefghijklmnopqrstuvwxyz"
+_NAME_VALUES = {c: i for i, c in enumerate(_NAME_CHARS)}
+
+
+def name_to_int(name):
+    """ Encode an account or action name as an `uint64`.
+    """
+    if len(name) > 13:
+        raise AbiError("The name '{}' is longer than 13 characters.".format(
+            name))
+    value = 0
+    for i in range(13):
+        c = 0
+        if i < len(name):
+            try:
+                c = _NAME_VALUES[name[i]]
+            except KeyError:
+                raise AbiError(
+                    "The name '{}' has an invalid character.".format(name))
+        if i < 12:
+            value = value | (c & 0x1f) << (64 - 5 * (i + 1))
+        else:
+            value = value | c & 0x0f
+    return value
+
+
+def int_to_name(value):
+    """ Decode an `uint64` to an account or action name.
+    """
+    chars = []
+    for i in range(13):
+        if i == 0:
+            chars.append(_NAME_CHARS[value & 0x0f])
+            value = value >> 4
+        else:
+            chars.append(_NAME_CHARS[value & 0x1f])
+            value = value >> 5
+    return "".join(reversed(chars)).rstrip(".")
+
+
+def symbol_code_to_int(code):
+    value = 0
+    for i, c in enumerate(code):
+        if not "A" <= c <= "Z" or i > 6:
+            raise AbiError("Invalid symbol code: '{}'.".format(code))
+        value = value | ord(c) << (8 * i)
+    return value
+
+
+def int_to_symbol_code(value):
+    chars = []
+    while value:
+        chars.append(chr(value & 0xff))
+        value = value >> 8
+    return "".join(chars)
+
+
+def symbol_to_int(symbol):
+    """ Encode a symbol, like `4,EOS`, as an `uint64`.
+    """
+    precision, code = symbol.split(",")
+    return int(precision) | symbol_code_to_int(code) << 8
+
+
+def int_to_symbol(value):
+    return "{},{}".format(value & 0xff, int_to_symbol_code(value >> 8))
+
+
+def asset_to_pair(asset):
+    """ Return the amount and the symbol integer of an asset, like
+    `1.0000 EOS`.
+    """
+    try:
+        amount, code = asset.split()
+    except ValueError:
+        raise AbiError("Invalid asset: '{}'.".format(asset))
+    sign = 1
+    if amount.startswith("-"):
+        sign = -1
+        amount = amount[1:]
+    precision = 0
+    if "." in amount:
+        precision = len(amount) - amount.index(".") - 1
+        amount = amount.replace(".", "")
+    return sign * int(amount), precision | symbol_code_to_int(code) << 8
+
+
+def pair_to_asset(amount, symbol):
+    precision = symbol & 0xff
+    sign = "-" if amount < 0 else ""
+    amount = abs(amount)
+    if precision:
+        number = "{}.{}".format(
+            amount // 10 ** precision,
+            str(amount % 10 ** precision).zfill(precision))
+    else:
+        number = str(amount)
+    return "{}{} {}".format(sign, number, int_to_symbol_code(symbol >> 8))
+
+
+_BASE58_CHARS = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_BASE58_VALUES = {c: i for i, c in enumerate(_BASE58_CHARS)}
+
+
+def base58_encode(data):
+    value = int.from_bytes(data, "big")
+    chars = []
+    while value:
+        value, remainder = divmod(value, 58)
+        chars.append(_BASE58_CHARS[remainder])
+    for byte in data:
+        if byte:
+            break
+        chars.append("1")
+    return "".join(reversed(chars))
+
+
+def base58_decode(text):
+    value = 0
+    for c in text:
+        try:
+            value = value * 58 + _BASE58_VALUES[c]
+        except KeyError:
+            raise AbiError("Invalid base58 character: '{}'.".format(c))
+    data = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    zeros = len(text) - len(text.lstrip("1"))
+    return b"\0" * zeros + data
+
+
+# RIPEMD-160, for the `hashlib` builds without it:
+_RMD_R1 = [
+    0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15,
+    7, 4, 13, 1, 10, 6, 15, 3, 12, 0, 9, 5, 2, 14, 11, 8,
+    3, 10, 14, 4, 9, 15, 8, 1, 2, 7, 0, 6, 13, 11, 5, 12,
+    1, 9, 11, 10, 0, 8, 12, 4, 13, 3, 7, 15, 14, 5, 6, 2,
+    4, 0, 5, 9, 7, 12, 2, 10, 14, 1, 3, 8, 11, 6, 15, 13]
+_RMD_R2 = [
+    5, 14, 7, 0, 9, 2, 11, 4, 13, 6, 15, 8, 1, 10, 3, 12,
+    6, 11, 3, 7, 0, 13, 5, 10, 14, 15, 8, 12, 4, 9, 1, 2,
+    15, 5, 1, 3, 7, 14, 6, 9, 11, 8, 12, 2, 10, 0, 4, 13,
+    8, 6, 4, 1, 3, 11, 15, 0, 5, 12, 2, 13, 9, 7, 10, 14,
+    12, 15, 10, 4, 1, 5, 8, 7, 6, 2, 13, 14, 0, 3, 9, 11]
+_RMD_S1 = [
+    11, 14, 15, 12, 5, 8, 7, 9, 11, 13, 14, 15, 6, 7, 9, 8,
+    7, 6, 8, 13, 11, 9, 7, 15, 7, 12, 15, 9, 11, 7, 13, 12,
+    11, 13, 6, 7, 14, 9, 13, 15, 14, 8, 13, 6, 5, 12, 7, 5,
+    11, 12, 14, 15, 14, 15, 9, 8, 9, 14, 5, 6, 8, 6, 5, 12,
+    9, 15, 5, 11, 6, 8, 13, 12, 5, 12, 13, 14, 11, 8, 5, 6]
+_RMD_S2 = [
+    8, 9, 9, 11, 13, 15, 15, 5, 7, 7, 8, 11, 14, 14, 12, 6,
+    9, 13, 15, 7, 12, 8, 9, 11, 7, 7, 12, 7, 6, 15, 13, 11,
+    9, 7, 15, 11, 8, 6, 6, 14, 12, 13, 5, 14, 13, 13, 7, 5,
+    15, 5, 8, 11, 14, 14, 6, 14, 6, 9, 12, 9, 12, 5, 15, 8,
+    8, 5, 12, 9, 12, 5, 14, 6, 8, 13, 6, 5, 15, 13, 11, 11]
+_RMD_K1 = [0x00000000, 0x5A827999, 0x6ED9EBA1, 0x8F1BBCDC, 0xA953FD4E]
+_RMD_K2 = [0x50A28BE6, 0x5C4DD124, 0x6D703EF3, 0x7A6D76E9, 0x00000000]
+
+
+def _rmd_f(j, x, y, z):
+    if j < 16:
+        return x ^ y ^ z
+    if j < 32:
+        return (x & y) | (~x & z)
+    if j < 48:
+        return (x | ~y) ^ z
+    if j < 64:
+        return (x & z) | (y & ~z)
+    return x ^ (y | ~z)
+
+
+def _rmd_rol(x, n):
+    x = x & 0xffffffff
+    return ((x << n) | (x >> (32 - n))) & 0xffffffff
+
+
+def _ripemd160(data):
+    h = [0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476, 0xC3D2E1F0]
+    message = bytes(data) + b"\x80" + b"\0" * ((55 - len(data)) % 64) \
+        + struct.pack("<Q", 8 * len(data))
+    for offset in range(0, len(message), 64):
+        x = struct.unpack("<16I", message[offset:offset + 64])
+        a1, b1, c1, d1, e1 = h
+        a2, b2, c2, d2, e2 = h
+        for j in range(80):
+            t = _rmd_rol(
+                a1 + _rmd_f(j, b1, c1, d1) + x[_RMD_R1[j]] + _RMD_K1[j // 16],
+                _RMD_S1[j]) + e1
+            a1, e1, d1, c1, b1 = e1, d1, _rmd_rol(c1, 10), b1, t & 0xffffffff
+            t = _rmd_rol(
+                a2 + _rmd_f(79 - j, b2, c2, d2) + x[_RMD_R2[j]]
+                    + _RMD_K2[j // 16],
+                _RMD_S2[j]) + e2
+            a2, e2, d2, c2, b2 = e2, d2, _rmd_rol(c2, 10), b2, t & 0xffffffff
+        t = (h[1] + c1 + d2) & 0xffffffff
+        h[1] = (h[2] + d1 + e2) & 0xffffffff
+        h[2] = (h[3] + e1 + a2) & 0xffffffff
+        h[3] = (h[4] + a1 + b2) & 0xffffffff
+        h[4] = (h[0] + b1 + c2) & 0xffffffff
+        h[0] = t
+    return struct.pack("<5I", *h)
+
+
+def ripemd160(data):
+    try:
+        return hashlib.new("ripemd160", data).digest()
+    except ValueError:
+        return _ripemd160(data)
+
+
+_KEY_TYPES = ["K1", "R1"]
+_KEY_TYPE_VALUES = {t: i for i, t in enumerate(_KEY_TYPES)}
+
+
+def _decode_key(text, prefix, size):
+    # Return the key type and the key data of a key string, like
+    # `PUB_K1_...`, verifying its checksum.
+    if text.startswith(prefix):
+        key_type, encoded = text[len(prefix):].split("_", 1)
+        suffix = key_type.encode()
+    elif prefix == "PUB_" and text.startswith("EOS"):
+        key_type, encoded, suffix = "K1", text[3:], b""
+    else:
+        raise AbiError("Invalid key: '{}'.".format(text))
+
+    data = base58_decode(encoded)
+    key, checksum = data[:-4], data[-4:]
+    if len(key) != size or ripemd160(key + suffix)[:4] != checksum:
+        raise AbiError("Invalid key checksum: '{}'.".format(text))
+    try:
+        return _KEY_TYPE_VALUES[key_type], key
+    except KeyError:
+        raise AbiError("Unknown key type: '{}'.".format(text))
+
+
+def _encode_key(key_type, key, prefix):
+    key_type = _KEY_TYPES[key_type]
+    if prefix == "PUB_" and key_type == "K1":
+        return "EOS" + base58_encode(key + ripemd160(key)[:4])
+    return "{}{}_{}".format(
+        prefix, key_type,
+        base58_encode(key + ripemd160(key + key_type.encode())[:4]))
+
+
+_EPOCH_2000_MS = 946684800000
+
+
+def time_to_sec(text):
+    """ Return the seconds since epoch of an UTC time, like
+    `2018-06-01T12:00:00`.
+    """
+    return calendar.timegm(datetime.datetime.strptime(
+        text[:19], "%Y-%m-%dT%H:%M:%S").timetuple())
+
+
+def sec_to_time(sec):
+    return datetime.datetime.utcfromtimestamp(sec).strftime(
+        "%Y-%m-%dT%H:%M:%S")
+
+
+def _time_to_us(text):
+    us = time_to_sec(text) * 1000000
+    if len(text) > 20:
+        us = us + int(text[20:].ljust(6, "0")[:6])
+    return us
+
+
+def _us_to_time(us):
+    return "{}.{:03d}".format(
+        sec_to_time(us // 1000000), us % 1000000 // 1000)
+
+
+###############################################################################
+# codecs: pairs of `pack(value, out)` and `unpack(data, pos)`
+###############################################################################
+
+def _fixed(format):
+    layout = struct.Struct("<" + format)
+    size = layout.size
+
+    def pack(value, out):
+        if isinstance(value, str):
+            value = float(value) if format in "fd" else int(value, 0)
+        out += layout.pack(value)
+
+    def unpack(data, pos):
+        return layout.unpack_from(data, pos)[0], pos + size
+
+    return pack, unpack
+
+
+def _pack_varuint32(value, out):
+    value = int(value)
+    while True:
+        byte = value & 0x7f
+        value = value >> 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def _unpack_varuint32(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos = pos + 1
+        value = value | (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift = shift + 7
+
+
+def _pack_varint32(value, out):
+    value = int(value)
+    _pack_varuint32(((value << 1) ^ (value >> 31)) & 0xffffffff, out)
+
+
+def _unpack_varint32(data, pos):
+    value, pos = _unpack_varuint32(data, pos)
+    return (value >> 1) ^ -(value & 1), pos
+
+
+def _int128(signed):
+    def pack(value, out):
+        if isinstance(value, str):
+            value = int(value, 0)
+        out += value.to_bytes(16, "little", signed=signed)
+
+    def unpack(data, pos):
+        return int.from_bytes(
+            data[pos:pos + 16], "little", signed=signed), pos + 16
+
+    return pack, unpack
+
+
+def _pack_bool(value, out):
+    out.append(1 if value else 0)
+
+
+def _unpack_bool(data, pos):
+    return bool(data[pos]), pos + 1
+
+
+def _pack_bytes(value, out):
+    if isinstance(value, str):
+        value = binascii.unhexlify(value)
+    _pack_varuint32(len(value), out)
+    out += value
+
+
+def _unpack_bytes(data, pos):
+    size, pos = _unpack_varuint32(data, pos)
+    return binascii.hexlify(data[pos:pos + size]).decode(), pos + size
+
+
+def _pack_string(value, out):
+    value = value.encode("utf-8")
+    _pack_varuint32(len(value), out)
+    out += value
+
+
+def _unpack_string(data, pos):
+    size, pos = _unpack_varuint32(data, pos)
+    return bytes(data[pos:pos + size]).decode("utf-8"), pos + size
+
+
+def _checksum(size):
+    def pack(value, out):
+        value = binascii.unhexlify(value)
+        if len(value) != size:
+            raise AbiError("Expected {} bytes of checksum.".format(size))
+        out += value
+
+    def unpack(data, pos):
+        return binascii.hexlify(data[pos:pos + size]).decode(), pos + size
+
+    return pack, unpack
+
+
+_uint64 = struct.Struct("<Q")
+_uint32 = struct.Struct("<I")
+_int64 = struct.Struct("<q")
+
+
+def _pack_name(value, out):
+    out += _uint64.pack(name_to_int(value))
+
+
+def _unpack_name(data, pos):
+    return int_to_name(_uint64.unpack_from(data, pos)[0]), pos + 8
+
+
+def _pack_symbol(value, out):
+    out += _uint64.pack(symbol_to_int(value))
+
+
+def _unpack_symbol(data, pos):
+    return int_to_symbol(_uint64.unpack_from(data, pos)[0]), pos + 8
+
+
+def _pack_symbol_code(value, out):
+    out += _uint64.pack(symbol_code_to_int(value))
+
+
+def _unpack_symbol_code(data, pos):
+    return int_to_symbol_code(_uint64.unpack_from(data, pos)[0]), pos + 8
+
+
+def _pack_asset(value, out):
+    amount, symbol = asset_to_pair(value)
+    out += _int64.pack(amount)
+    out += _uint64.pack(symbol)
+
+
+def _unpack_asset(data, pos):
+    amount = _int64.unpack_from(data, pos)[0]
+    symbol = _uint64.unpack_from(data, pos + 8)[0]
+    return pair_to_asset(amount, symbol), pos + 16
+
+
+def _pack_extended_asset(value, out):
+    _pack_asset(value["quantity"], out)
+    _pack_name(value["contract"], out)
+
+
+def _unpack_extended_asset(data, pos):
+    quantity, pos = _unpack_asset(data, pos)
+    contract, pos = _unpack_name(data, pos)
+    return {"quantity": quantity, "contract": contract}, pos
+
+
+def _key(prefix, size):
+    def pack(value, out):
+        key_type, key = _decode_key(value, prefix, size)
+        _pack_varuint32(key_type, out)
+        out += key
+
+    def unpack(data, pos):
+        key_type, pos = _unpack_varuint32(data, pos)
+        return _encode_key(
+            key_type, bytes(data[pos:pos + size]), prefix), pos + size
+
+    return pack, unpack
+
+
+def _pack_time_point_sec(value, out):
+    if isinstance(value, str):
+        value = time_to_sec(value)
+    out += _uint32.pack(value)
+
+
+def _unpack_time_point_sec(data, pos):
+    return sec_to_time(_uint32.unpack_from(data, pos)[0]), pos + 4
+
+
+def _pack_time_point(value, out):
+    if isinstance(value, str):
+        value = _time_to_us(value)
+    out += _int64.pack(value)
+
+
+def _unpack_time_point(data, pos):
+    return _us_to_time(_int64.unpack_from(data, pos)[0]), pos + 8
+
+
+def _pack_block_timestamp(value, out):
+    if isinstance(value, str):
+        value = (_time_to_us(value) // 1000 - _EPOCH_2000_MS) // 500
+    out += _uint32.pack(value)
+
+
+def _unpack_block_timestamp(data, pos):
+    slot = _uint32.unpack_from(data, pos)[0]
+    return _us_to_time((slot * 500 + _EPOCH_2000_MS) * 1000), pos + 4
+
+
+# The `struct` formats of the types of fixed size, flattened to columns:
+_FIXED_LAYOUTS = {
+    "bool": [("", "?")],
+    "int8": [("", "b")],
+    "uint8": [("", "B")],
+    "int16": [("", "h")],
+    "uint16": [("", "H")],
+    "int32": [("", "i")],
+    "uint32": [("", "I")],
+    "int64": [("", "q")],
+    "uint64": [("", "Q")],
+    "float32": [("", "f")],
+    "float64": [("", "d")],
+    "time_point": [("", "q")],
+    "time_point_sec": [("", "I")],
+    "block_timestamp_type": [("", "I")],
+    "name": [("", "Q")],
+    "symbol": [("", "Q")],
+    "symbol_code": [("", "Q")],
+    "asset": [(".amount", "q"), (".symbol", "Q")],
+    "extended_asset": [
+        (".quantity.amount", "q"), (".quantity.symbol", "Q"),
+        (".contract", "Q")],
+}
+
+
+_BUILTINS = {
+    "bool": (_pack_bool, _unpack_bool),
+    "int8": _fixed("b"),
+    "uint8": _fixed("B"),
+    "int16": _fixed("h"),
+    "uint16": _fixed("H"),
+    "int32": _fixed("i"),
+    "uint32": _fixed("I"),
+    "int64": _fixed("q"),
+    "uint64": _fixed("Q"),
+    "int128": _int128(True),
+    "uint128": _int128(False),
+    "varint32": (_pack_varint32, _unpack_varint32),
+    "varuint32": (_pack_varuint32, _unpack_varuint32),
+    "float32": _fixed("f"),
+    "float64": _fixed("d"),
+    "float128": _checksum(16),
+    "time_point": (_pack_time_point, _unpack_time_point),
+    "time_point_sec": (_pack_time_point_sec, _unpack_time_point_sec),
+    "block_timestamp_type": (_pack_block_timestamp, _unpack_block_timestamp),
+    "name": (_pack_name, _unpack_name),
+    "bytes": (_pack_bytes, _unpack_bytes),
+    "string": (_pack_string, _unpack_string),
+    "checksum160": _checksum(20),
+    "checksum256": _checksum(32),
+    "checksum512": _checksum(64),
+    "public_key": _key("PUB_", 33),
+    "signature": _key("SIG_", 65),
+    "symbol": (_pack_symbol, _unpack_symbol),
+    "symbol_code": (_pack_symbol_code, _unpack_symbol_code),
+    "asset": (_pack_asset, _unpack_asset),
+    "extended_asset": (_pack_extended_asset, _unpack_extended_asset),
+}
+
+
+###############################################################################
+# Abi
+###############################################################################
+
+class Abi:
+    """ The ABI of a contract, compiled to pack and unpack functions.
+
+    - **parameters**::
+
+        abi: The ABI, as a dictionary or as a JSON text.
+
+    - **attributes**::
+
+        json: The ABI, as a dictionary.
+        actions: The dictionary of action names to their struct names.
+        tables: The dictionary of table names to their struct names.
+
+    Values are represented the way `nodeos` represents them in JSON: names,
+    assets, symbols, keys and times are strings, `bytes` and checksums are
+    hex strings, structs are dictionaries, arrays are lists.
+    """
+    def __init__(self, abi):
+        if isinstance(abi, (str, bytes)):
+            abi = json_module.loads(abi)
+        self.json = abi
+        self._aliases = {
+            t["new_type_name"]: t["type"] for t in abi.get("types", [])}
+        self._structs = {s["name"]: s for s in abi.get("structs", [])}
+        self._variants = {
+            v["name"]: v["types"] for v in abi.get("variants", [])}
+        self.actions = {a["name"]: a["type"] for a in abi.get("actions", [])}
+        self.tables = {t["name"]: t["type"] for t in abi.get("tables", [])}
+        self._codecs = {}
+        # The codecs being compiled, published to `_codecs` when complete:
+        self._compiling = {}
+        self._depth = 0
+        self._lock = threading.RLock()
+
+
+    @classmethod
+    def from_file(cls, path):
+        """ Load the ABI from a file, like one produced by `teos.ABI`.
+        """
+        with open(path, "r") as input:
+            counters.count("file_read")
+            return cls(input.read())
+
+
+    @classmethod
+    def from_contract_dir(cls, contract_dir):
+        """ Load the ABI file of a contract directory, as resolved by
+        `teos.config()`.
+        """
+        import teos
+        return cls.from_file(teos.config(contract_dir).json["contract-abi"])
+
+
+    def codec(self, type_name):
+        """ Return the pair of the pack and unpack functions of a type.
+
+        The codecs of a type and of the types it uses are published together,
+        when compiled completely, hence other threads never see a struct with
+        its fields being compiled.
+        """
+        codec = self._codecs.get(type_name)
+        if codec is None:
+            with self._lock:
+                codec = self._codecs.get(type_name) \
+                    or self._compiling.get(type_name)
+                if codec is None:
+                    self._depth += 1
+                    try:
+                        codec = self._compile(type_name)
+                        if self._depth == 1:
+                            self._codecs.update(self._compiling)
+                    finally:
+                        self._depth -= 1
+                        if not self._depth:
+                            self._compiling.clear()
+        return codec
+
+
+    def _compile(self, type_name):
+        if type_name.endswith("[]"):
+            codec = self._array(self.codec(type_name[:-2]))
+        elif type_name.endswith("?"):
+            codec = self._optional(self.codec(type_name[:-1]))
+        elif type_name.endswith("$"):
+            codec = self.codec(type_name[:-1])
+        elif type_name in self._aliases:
+            codec = self.codec(self._aliases[type_name])
+        elif type_name in self._structs:
+            # Registered before its fields are compiled, for recursive types:
+            fields = []
+            codec = self._struct(type_name, fields)
+            self._compiling[type_name] = codec
+            self._struct_fields(type_name, fields)
+        elif type_name in self._variants:
+            codec = self._variant(self._variants[type_name])
+        elif type_name in _BUILTINS:
+            codec = _BUILTINS[type_name]
+        else:
+            raise AbiError("Unknown ABI type: '{}'.".format(type_name))
+
+        self._compiling[type_name] = codec
+        return codec
+
+
+    def _struct_fields(self, type_name, fields):
+        struct_ = self._structs[type_name]
+        if struct_.get("base"):
+            self.codec(struct_["base"])
+            self._struct_fields(struct_["base"], fields)
+        for field in struct_["fields"]:
+            pack, unpack = self.codec(field["type"])
+            fields.append(
+                (field["name"], pack, unpack, field["type"].endswith("$")))
+
+
+    @staticmethod
+    def _struct(type_name, fields):
+        def pack(value, out):
+            if isinstance(value, str):
+                value = json_module.loads(value)
+            if isinstance(value, (list, tuple)):
+                value = dict(zip([field[0] for field in fields], value))
+            for name, pack_field, _, is_extension in fields:
+                try:
+                    field_value = value[name]
+                except KeyError:
+                    if is_extension:
+                        return
+                    raise AbiError("Missing field '{}' of '{}'.".format(
+                        name, type_name))
+                try:
+                    pack_field(field_value, out)
+                except AbiError:
+                    raise
+                except Exception as e:
+                    raise AbiError(
+                        "Cannot pack field '{}' of '{}': {}".format(
+                            name, type_name, e))
+
+        def unpack(data, pos):
+            value = {}
+            for name, _, unpack_field, is_extension in fields:
+                if is_extension and pos >= len(data):
+                    break
+                value[name], pos = unpack_field(data, pos)
+            return value, pos
+
+        return pack, unpack
+
+
+    @staticmethod
+    def _array(codec):
+        pack_item, unpack_item = codec
+
+        def pack(value, out):
+            _pack_varuint32(len(value), out)
+            for item in value:
+                pack_item(item, out)
+
+        def unpack(data, pos):
+            size, pos = _unpack_varuint32(data, pos)
+            value = []
+            for i in range(size):
+                item, pos = unpack_item(data, pos)
+                value.append(item)
+            return value, pos
+
+        return pack, unpack
+
+
+    @staticmethod
+    def _optional(codec):
+        pack_item, unpack_item = codec
+
+        def pack(value, out):
+            if value is None:
+                out.append(0)
+            else:
+                out.append(1)
+                pack_item(value, out)
+
+        def unpack(data, pos):
+            if not data[pos]:
+                return None, pos + 1
+            return unpack_item(data, pos + 1)
+
+        return pack, unpack
+
+
+    def _variant(self, types):
+        def pack(value, out):
+            type_name, item = value
+            try:
+                index = types.index(type_name)
+            except ValueError:
+                raise AbiError("Type '{}' is not in the variant {}.".format(
+                    type_name, types))
+            _pack_varuint32(index, out)
+            self.codec(type_name)[0](item, out)
+
+        def unpack(data, pos):
+            index, pos = _unpack_varuint32(data, pos)
+            item, pos = self.codec(types[index])[1](data, pos)
+            return [types[index], item], pos
+
+        return pack, unpack
+
+
+    def pack(self, type_name, value):
+        """ Serialize a value of an ABI type, return `bytes`.
+        """
+        out = bytearray()
+        self.codec(type_name)[0](value, out)
+        return bytes(out)
+
+
+    def unpack(self, type_name, data):
+        """ Deserialize a value of an ABI type from `bytes`, or a hex string.
+        """
+        if isinstance(data, str):
+            data = binascii.unhexlify(data)
+        return self.codec(type_name)[1](memoryview(data), 0)[0]
+
+
+    def action_type(self, action):
+        try:
+            return self.actions[action]
+        except KeyError:
+            raise AbiError("Unknown action: '{}'.".format(action))
+
+
+    def pack_action_data(self, action, data):
+        """ Serialize the data of an action, given as a dictionary, a list
+        of the field values, or a JSON text. Return `bytes`.
+        """
+        return self.pack(self.action_type(action), data)
+
+
+    def unpack_action_data(self, action, data):
+        """ Deserialize the data of an action, return a dictionary.
+        """
+        return self.unpack(self.action_type(action), data)
+
+
+    def table_type(self, table):
+        try:
+            return self.tables[table]
+        except KeyError:
+            raise AbiError("Unknown table: '{}'.".format(table))
+
+
+    def unpack_table_row(self, table, data):
+        """ Deserialize a row of a table, return a dictionary.
+        """
+        return self.unpack(self.table_type(table), data)
+
+
+    def unpack_rows(self, table, rows):
+        """ Deserialize binary rows of a table, `bytes` or hex strings,
+        return a list of dictionaries.
+        """
+        unpack = self.codec(self.table_type(table))[1]
+        return [
+            unpack(memoryview(
+                binascii.unhexlify(row) if isinstance(row, str) else row),
+                0)[0]
+            for row in rows]
+
+
+    def layout(self, type_name):
+        """ Return the layout of a type of fixed size, as a list of pairs of
+        column names and `struct` format characters, or `None` if the size of
+        the type varies.
+
+        Struct fields are flattened, for example an `asset` field `balance`
+        is made of the columns `balance.amount` and `balance.symbol`. Names
+        and symbols are `uint64` columns, see `int_to_name()` and 
+        `int_to_symbol()`.
+        """
+        while type_name in self._aliases:
+            type_name = self._aliases[type_name]
+        if type_name in _FIXED_LAYOUTS:
+            return [
+                (column.lstrip("."), format)
+                for column, format in _FIXED_LAYOUTS[type_name]]
+        if not type_name in self._structs:
+            return None
+
+        struct_ = self._structs[type_name]
+        layout = []
+        if struct_.get("base"):
+            layout = self.layout(struct_["base"])
+            if layout is None:
+                return None
+        for field in struct_["fields"]:
+            field_layout = self.layout(field["type"])
+            if field_layout is None:
+                return None
+            for column, format in field_layout:
+                layout.append((
+                    field["name"] + "." + column if column else field["name"],
+                    format))
+        return layout
+
+
+    def unpack_columns(self, table, rows):
+        """ Deserialize binary rows of a table of fixed layout in bulk, see
+        `layout()`.
+
+        - **parameters**::
+
+            table: The table name.
+            rows: A list of rows, `bytes` or hex strings.
+
+        Return a `numpy` structured array, if `numpy` is importable, else
+        an ordered dictionary of column names to `array.array` objects.
+        """
+        layout = self.layout(self.table_type(table))
+        if layout is None:
+            raise AbiError(
+                "The rows of the table '{}' are not of fixed size.".format(
+                    table))
+
+        format = "<" + "".join([column[1] for column in layout])
+        size = struct.calcsize(format)
+        if rows and isinstance(rows[0], str):
+            data = binascii.unhexlify("".join(rows))
+        else:
+            data = b"".join(rows)
+        if len(data) != size * len(rows):
+            raise AbiError(
+                "The rows of the table '{}' are not {} bytes long.".format(
+                    table, size))
+
+        if not numpy is None:
+            return numpy.frombuffer(data, dtype=numpy.dtype(
+                [(column, "<" + format) for column, format in layout]))
+
+        columns = collections.OrderedDict()
+        values = list(zip(*struct.iter_unpack(format, data)))
+        for i, (column, format) in enumerate(layout):
+            columns[column] = array.array(
+                "B" if format == "?" else format, values[i] if values else [])
+        return columns
+
+
+    def action(self, account, action, data, permission=""):
+        """ Return an action, as accepted by `cleos.PushTransaction`, with its
+        data packed to hex.
+
+        - **parameters**::
+
+            account: The contract account. May be an object having the
+                attribute `name`, or a string.
+            action: The action name.
+            data: The action data, see `pack_action_data()`.
+            permission: An account and permission level, as in
+                'account@permission', or an object having the attribute
+                `name`. Defaults to the active permission of `account`.
+        """
+        import cleos
+        try:
+            account = account.name
+        except:
+            pass
+        if not permission:
+            permission = account
+        return {
+            "account": account,
+            "name": action,
+            "authorization": cleos.authorization(permission),
+            "data": binascii.hexlify(
+                self.pack_action_data(action, data)).decode()
+            }
+
+
+###############################################################################
+# transactions
+###############################################################################
+
+transaction_abi = Abi({
+    "structs": [
+        {"name": "permission_level", "base": "", "fields": [
+            {"name": "actor", "type": "name"},
+            {"name": "permission", "type": "name"}]},
+        {"name": "action", "base": "", "fields": [
+            {"name": "account", "type": "name"},
+            {"name": "name", "type": "name"},
+            {"name": "authorization", "type": "permission_level[]"},
+            {"name": "data", "type": "bytes"}]},
+        {"name": "extension", "base": "", "fields": [
+            {"name": "type", "type": "uint16"},
+            {"name": "data", "type": "bytes"}]},
+        {"name": "transaction_header", "base": "", "fields": [
+            {"name": "expiration", "type": "time_point_sec"},
+            {"name": "ref_block_num", "type": "uint16"},
+            {"name": "ref_block_prefix", "type": "uint32"},
+            {"name": "max_net_usage_words", "type": "varuint32"},
+            {"name": "max_cpu_usage_ms", "type": "uint8"},
+            {"name": "delay_sec", "type": "varuint32"}]},
+        {"name": "transaction", "base": "transaction_header", "fields": [
+            {"name": "context_free_actions", "type": "action[]"},
+            {"name": "actions", "type": "action[]"},
+            {"name": "transaction_extensions", "type": "extension[]"}]}
+        ]
+    })
+""" The ABI of the transaction structures defined by the `EOSIO` protocol.
+"""
+
+system_abi = Abi({
+    "structs": [
+        {"name": "permission_level", "base": "", "fields": [
+            {"name": "actor", "type": "name"},
+            {"name": "permission", "type": "name"}]},
+        {"name": "key_weight", "base": "", "fields": [
+            {"name": "key", "type": "public_key"},
+            {"name": "weight", "type": "uint16"}]},
+        {"name": "permission_level_weight", "base": "", "fields": [
+            {"name": "permission", "type": "permission_level"},
+            {"name": "weight", "type": "uint16"}]},
+        {"name": "wait_weight", "base": "", "fields": [
+            {"name": "wait_sec", "type": "uint32"},
+            {"name": "weight", "type": "uint16"}]},
+        {"name": "authority", "base": "", "fields": [
+            {"name": "threshold", "type": "uint32"},
+            {"name": "keys", "type": "key_weight[]"},
+            {"name": "accounts", "type": "permission_level_weight[]"},
+            {"name": "waits", "type": "wait_weight[]"}]},
+        {"name": "newaccount", "base": "", "fields": [
+            {"name": "creator", "type": "name"},
+            {"name": "name", "type": "name"},
+            {"name": "owner", "type": "authority"},
+            {"name": "active", "type": "authority"}]},
+        {"name": "buyram", "base": "", "fields": [
+            {"name": "payer", "type": "name"},
+            {"name": "receiver", "type": "name"},
+            {"name": "quant", "type": "asset"}]},
+        {"name": "buyrambytes", "base": "", "fields": [
+            {"name": "payer", "type": "name"},
+            {"name": "receiver", "type": "name"},
+            {"name": "bytes", "type": "uint32"}]},
+        {"name": "delegatebw", "base": "", "fields": [
+            {"name": "from", "type": "name"},
+            {"name": "receiver", "type": "name"},
+            {"name": "stake_net_quantity", "type": "asset"},
+            {"name": "stake_cpu_quantity", "type": "asset"},
+            {"name": "transfer", "type": "bool"}]}
+        ],
+    "actions": [
+        {"name": "newaccount", "type": "newaccount"},
+        {"name": "buyram", "type": "buyram"},
+        {"name": "buyrambytes", "type": "buyrambytes"},
+        {"name": "delegatebw", "type": "delegatebw"}
+        ]
+    })
+""" The ABI of the `eosio` actions creating and funding accounts, as used by
+`cleos system newaccount`. Packed with it, these actions do not depend on
+the contract deployed on `eosio`.
+"""
+
+
+def authority(key_public):
+    """ The authority of a single public key.
+    """
+    return {
+        "threshold": 1, "keys": [{"key": key_public, "weight": 1}],
+        "accounts": [], "waits": []}
+
+
+_TRANSACTION_DEFAULTS = {
+    "max_net_usage_words": 0,
+    "max_cpu_usage_ms": 0,
+    "delay_sec": 0,
+    "context_free_actions": [],
+    "transaction_extensions": []
+    }
+
+
+def transaction(actions, ref_block, expiration_sec=30, head_block_time=None):
+    """ Return a transaction, as a dictionary, referencing a block for TAPOS.
+
+    - **parameters**::
+
+        actions: The list of actions, see `Abi.action()`.
+        ref_block: The reference block, a `cleos.GetBlock` object. It is used
+            for TAPOS only, and may be old.
+        expiration_sec: The time in seconds before the transaction expires.
+        head_block_time: The time the transaction expires after, like the
+            `head_block_time` of `cleos.GetInfo`. Default is the current
+            UTC time.
+    """
+    if head_block_time is None:
+        now = time.time()
+    else:
+        now = time_to_sec(head_block_time)
+    return dict(
+        _TRANSACTION_DEFAULTS,
+        expiration=sec_to_time(int(now) + expiration_sec),
+        ref_block_num=ref_block.json["block_num"] & 0xffff,
+        ref_block_prefix=ref_block.json["ref_block_prefix"],
+        actions=actions)
+
+
+def _packed_actions(actions):
+    # The actions with their data packed with the ABI of their contracts:
+    packed = []
+    for action in actions:
+        if isinstance(action.get("data", ""), str):
+            packed.append(action)
+        else:
+            action = dict(action)
+            action["data"] = get_abi(action["account"]).pack_action_data(
+                action["name"], action["data"])
+            packed.append(action)
+    return packed
+
+
+def pack_transaction(transaction):
+    """ Serialize a transaction, return `bytes`.
+
+    The data of the actions is hex, or a dictionary that is packed with the
+    ABI of the contract, see `get_abi()`.
+    """
+    transaction = dict(_TRANSACTION_DEFAULTS, **transaction)
+    transaction["context_free_actions"] = _packed_actions(
+        transaction["context_free_actions"])
+    transaction["actions"] = _packed_actions(transaction["actions"])
+    return transaction_abi.pack("transaction", transaction)
+
+
+def unpack_transaction(data, abis=None):
+    """ Deserialize a transaction, return a dictionary.
+
+    - **parameters**::
+
+        data: The packed transaction, `bytes` or a hex string.
+        abis: A dictionary of contract account names to `Abi` objects. The
+            data of the actions of these contracts is unpacked, the data of
+            the other actions is left hex.
+    """
+    transaction = transaction_abi.unpack("transaction", data)
+    if abis:
+        for action in \
+                transaction["context_free_actions"] + transaction["actions"]:
+            if action["account"] in abis:
+                action["hex_data"] = action["data"]
+                action["data"] = abis[action["account"]].unpack_action_data(
+                    action["name"], action["data"])
+    return transaction
+
+
+def transaction_id(packed_transaction):
+    """ The id of a packed transaction.
+    """
+    return hashlib.sha256(packed_transaction).hexdigest()
+
+
+def signing_digest(chain_id, packed_transaction, context_free_data=b""):
+    """ The digest a packed transaction is signed with, for a chain id given
+    as a hex string.
+    """
+    return hashlib.sha256(
+        binascii.unhexlify(chain_id) + packed_transaction
+        + (hashlib.sha256(context_free_data).digest()
+            if context_free_data else bytes(32))).digest()
+
+
+###############################################################################
+# ABI of contracts on the chain
+###############################################################################
+
+_abis = {}
+_abis_lock = threading.Lock()
+
+
+def from_chain(account):
+    """ Load the ABI of a contract account from the chain, with
+    `cleos.GetCode`. Return an `Abi` object, or `None` if the account has no
+    ABI.
+    """
+    import cleos
+    try:
+        account = account.name
+    except:
+        pass
+
+    if setup.is_native_transport():
+        get_code = cleos.GetCode(account, is_verbose=-1)
+        if get_code.error:
+            return None
+        abi = get_code.json.get("abi")
+    else:
+        fd, path = tempfile.mkstemp(suffix=".abi")
+        os.close(fd)
+        try:
+            get_code = cleos.GetCode(account, abi=path, is_verbose=-1)
+            if get_code.error:
+                return None
+            with open(path, "r") as input:
+                counters.count("file_read")
+                abi = input.read()
+        finally:
+            os.remove(path)
+
+    if not abi:
+        return None
+    return Abi(abi)
+
+
+def get_abi(account):
+    """ Return the `Abi` object of a contract account, loaded from the chain
+    once in the process, see `from_chain()`.
+    """
+    try:
+        account = account.name
+    except:
+        pass
+
+    key = (setup.nodeos_URL()[1], account)
+    with _abis_lock:
+        abi = _abis.get(key)
+    if abi is None:
+        abi = from_chain(account)
+        if abi is None:
+            raise AbiError("The account '{}' has no ABI.".format(account))
+        with _abis_lock:
+            _abis[key] = abi
+    return abi
+
+
+def forget(account=None):
+    """ Forget the ABI of a contract account, loaded with `get_abi()`, or of
+    all the accounts. `cleos.SetContract` calls it.
+    """
+    with _abis_lock:
+        if account is None:
+            _abis.clear()
+        else:
+            for key in [k for k in _abis if k[1] == account]:
+                del _abis[key]
@@ -0,0 +1,155 @@
+#!/usr/bin/python3
+
+"""
+Asyncio front-end for `EOSIO cleos`.
+
+.. module:: aio
+    :platform: Unix, Windows
+    :synopsis: Asyncio front-end for `EOSIO cleos`.
+
+.. moduleauthor:: Tokenika
+
+Each coroutine of the module runs the corresponding `cleos` command class in
+a thread pool shared in the process, and returns the command object, for
+example::
+
+    import asyncio
+    import aio
+
+    tables = await asyncio.gather(*[
+        aio.get_table("eosio.token", "accounts", holder, is_verbose=-1)
+            for holder in holders])
+
+The module is also the attribute `cleos.aio`, imported at the first access,
+like `await cleos.aio.get_table(...)`.
+
+The module is an adapter of the blocking command classes to asyncio, not an
+asynchronous transport: each call is a `cleos` process, or an HTTP request
+with `setup.set_native_transport()`, blocking a thread of the pool. At most
+`set_max_workers()` calls are in flight, hence 1000 reads cost about
+1000 / 32 round trips to the node with the default pool.
+"""
+
+import asyncio
+import threading
+import contextvars
+import functools
+import concurrent.futures
+import cleos
+import cleos_system
+import tracing
+
+
+_max_workers = 32
+_executor = None
+_loop = None
+_lock = threading.Lock()
+# the span of the caller of `run()`, for the commands to nest under:
+_parent = contextvars.ContextVar("parent", default=None)
+
+
+def set_max_workers(max_workers=32):
+    """ Set the number of threads executing the `cleos` commands.
+    """
+    global _max_workers
+    global _executor
+    with _lock:
+        _max_workers = max_workers
+        if not _executor is None:
+            _executor.shutdown(wait=False)
+            _executor = None
+
+
+def executor():
+    """ The thread pool executing the `cleos` commands.
+    """
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=_max_workers, thread_name_prefix="cleos")
+        return _executor
+
+
+def loop():
+    """ The event loop shared in the process, running in a daemon thread.
+
+    It serves synchronous code, see `run()`.
+    """
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="cleos-aio",
+                daemon=True).start()
+        return _loop
+
+
+def run(*coroutines):
+    """ Run coroutines in the shared event loop, and return the result of
+    the only one, or the list of the results of all of them.
+
+    For synchronous code, for example::
+
+        blocks = aio.run(
+            *[aio.get_block(n, is_verbose=-1) for n in range(1, 1001)])
+
+    The coroutines are gathered in the shared loop: an `asyncio.gather()`
+    future made outside it is attached to a different loop.
+    """
+    parent = tracing.current()
+
+    async def wrap():
+        _parent.set(parent)
+        if len(coroutines) == 1:
+            return await coroutines[0]
+        return list(await asyncio.gather(*coroutines))
+    return asyncio.run_coroutine_threadsafe(wrap(), loop()).result()
+
+
+async def command(command_class, *args, **kwargs):
+    """ Execute a command class in the thread pool, return the command object.
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        executor(), functools.partial(
+            tracing.bind(command_class, _parent.get()), *args, **kwargs))
+
+
+def _awaitable(command_class):
+    async def call(*args, **kwargs):
+        return await command(command_class, *args, **kwargs)
+
+    call.__name__ = command_class.__name__
+    call.__qualname__ = command_class.__name__
+    call.__doc__ = "Awaitable `{}.{}`.\n{}".format(
+        command_class.__module__, command_class.__name__,
+        command_class.__doc__ or "")
+    return call
+
+
+get_account = _awaitable(cleos.GetAccount)
+get_accounts = _awaitable(cleos.GetAccounts)
+get_transaction = _awaitable(cleos.GetTransaction)
+get_info = _awaitable(cleos.GetInfo)
+get_block = _awaitable(cleos.GetBlock)
+get_code = _awaitable(cleos.GetCode)
+get_table = _awaitable(cleos.GetTable)
+
+wallet_create = _awaitable(cleos.WalletCreate)
+wallet_stop = _awaitable(cleos.WalletStop)
+wallet_list = _awaitable(cleos.WalletList)
+wallet_import = _awaitable(cleos.WalletImport)
+wallet_keys = _awaitable(cleos.WalletKeys)
+wallet_open = _awaitable(cleos.WalletOpen)
+wallet_lock_all = _awaitable(cleos.WalletLockAll)
+wallet_lock = _awaitable(cleos.WalletLock)
+wallet_unlock = _awaitable(cleos.WalletUnlock)
+
+create_key = _awaitable(cleos.CreateKey)
+create_account = _awaitable(cleos.CreateAccount)
+set_contract = _awaitable(cleos.SetContract)
+push_action = _awaitable(cleos.PushAction)
+push_transaction = _awaitable(cleos.PushTransaction)
+
+system_newaccount = _awaitable(cleos_system.SystemNewaccount)
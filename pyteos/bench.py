@@ -0,0 +1,338 @@
+#!/usr/bin/python3
+
+"""
+Throughput and latency benchmark against a local node.
+
+.. module:: bench
+    :platform: Unix, Windows
+    :synopsis: Throughput and latency benchmark against a local node.
+
+.. moduleauthor:: Tokenika
+
+The `eosio.token` contract is deployed, tokens are issued to a number of
+accounts, and a mix of actions is pushed with a
+`pipeline.TransactionPipeline`. The throughput, the latency percentiles of
+the pushes, the failures by the error class, and the fill of the blocks
+produced are reported, and written to a json file, so that runs can be
+compared::
+
+    python3 eosf.py bench --accounts 20 --actions 2000 --window 16 \\
+        --mix transfer:9,issue:1 --out bench.json
+
+or::
+
+    result = bench.run(accounts=20, actions=2000, mix="transfer:9,issue:1")
+    print(result["tps"])
+"""
+
+import re
+import sys
+import time
+import math
+import random
+import argparse
+import collections
+import codec
+import setup
+import node
+import cleos
+import eosf
+import pipeline
+
+
+_SYMBOL = "EOS"
+
+
+def percentile(values, percent):
+    """ Return the nearest-rank percentile of a sorted list, or `None` if the
+    list is empty.
+    """
+    if not values:
+        return None
+    rank = max(1, int(math.ceil(percent / 100.0 * len(values))))
+    return values[rank - 1]
+
+
+_error_pattern = re.compile(r"Error (\d+): ([^\n]*)")
+
+def error_class(err_msg):
+    """ Return the class of an error message: the EOSIO error code and title,
+    if found, or else the first line of the message.
+    """
+    match = _error_pattern.search(err_msg)
+    if match:
+        return "{} {}".format(match.group(1), match.group(2).strip())
+    for line in err_msg.splitlines():
+        if line.strip():
+            return line.strip()[:80]
+    return "unknown"
+
+
+def parse_mix(mix):
+    """ Parse a mix of actions, given as 'transfer:9,issue:1', into a list of
+    pairs of the action and its weight.
+    """
+    pairs = []
+    for item in mix.split(","):
+        action, _, weight = item.strip().partition(":")
+        if not action in _ACTIONS:
+            raise ValueError("Unknown action `{}`, known are: {}.".format(
+                action, ", ".join(sorted(_ACTIONS))))
+        pairs.append((action, float(weight) if weight else 1.0))
+    return pairs
+
+
+def _transfer(names, issuer, sequence):
+    sender, receiver = random.sample(names, 2)
+    data = codec.dumps({
+        "from": sender, "to": receiver,
+        "quantity": "0.0001 " + _SYMBOL, "memo": "bench " + str(sequence)})
+    return ("transfer", data, sender)
+
+
+def _issue(names, issuer, sequence):
+    data = codec.dumps({
+        "to": random.choice(names),
+        "quantity": "0.0001 " + _SYMBOL, "memo": "bench " + str(sequence)})
+    return ("issue", data, issuer)
+
+
+# The actions of a mix, returning the action, its data and the permission:
+_ACTIONS = {"transfer": _transfer, "issue": _issue}
+
+
+def prepare(accounts, is_verbose=-1):
+    """ Deploy the `eosio.token` contract, create its token, and issue
+    tokens to new accounts. Return the tuple of the `eosf.Contract` object,
+    the `eosf.AccountTable` of the accounts and the issuer account, or 
+    `None` on error.
+    """
+    account_master = eosf.AccountMaster(is_verbose=is_verbose)
+    wallet = eosf.Wallet(is_verbose=is_verbose)
+    wallet.import_key(account_master)
+    eosf.Contract(account_master, "eosio.bios", is_verbose=is_verbose) \
+        .deploy(is_verbose=is_verbose)
+
+    account_token = eosf.account(account_master, is_verbose=is_verbose)
+    wallet.import_key(account_token)
+    contract = eosf.Contract(
+        account_token, "eosio.token", is_verbose=is_verbose)
+    if not contract.deploy(is_verbose=is_verbose):
+        return None
+    contract.push_action(
+        "create", codec.dumps({
+            "issuer": account_master.name,
+            "maximum_supply": "1000000000.0000 " + _SYMBOL,
+            "can_freeze": 0, "can_recall": 0, "can_whitelist": 0}))
+
+    table = eosf.create_accounts(
+        account_master, accounts, wallet=wallet, is_verbose=is_verbose)
+    if table.error:
+        return None
+
+    with pipeline.TransactionPipeline(
+            window=8, keep_receipts=False, compact=True) as pipe:
+        for name in table.created():
+            pipe.push_action(
+                contract.account, "issue", codec.dumps({
+                    "to": name, "quantity": "10000.0000 " + _SYMBOL,
+                    "memo": "bench"}),
+                permission=account_master)
+    if pipe.failed:
+        return None
+
+    return (contract, table, account_master)
+
+
+def block_fill(start, end):
+    """ Return the statistics of the blocks from `start` to `end`: the number
+    of the transactions in a block, and the CPU and NET used, as the
+    fraction of the block limits, if the node reports them.
+    """
+    info = cleos.GetInfo(is_verbose=-1)
+    cpu_limit = info.json.get("block_cpu_limit") if not info.error else None
+    net_limit = info.json.get("block_net_limit") if not info.error else None
+
+    transactions = []
+    cpu_fill = []
+    net_fill = []
+    for block in cleos.iter_blocks(start, end):
+        if block.error:
+            continue
+        receipts = block.json.get("transactions", [])
+        transactions.append(len(receipts))
+        if cpu_limit:
+            cpu_fill.append(sum(
+                receipt.get("cpu_usage_us", 0) for receipt in receipts)
+                / cpu_limit)
+        if net_limit:
+            net_fill.append(sum(
+                receipt.get("net_usage_words", 0) * 8 for receipt in receipts)
+                / net_limit)
+
+    def summary(values):
+        if not values:
+            return None
+        return {"mean": sum(values) / len(values), "max": max(values)}
+
+    return {
+        "blocks": len(transactions),
+        "empty_blocks": transactions.count(0),
+        "transactions": summary(transactions),
+        "cpu": summary(cpu_fill),
+        "net": summary(net_fill)
+        }
+
+
+def drive(contract, names, issuer, actions=1000, mix="transfer", window=16):
+    """ Push `actions` actions of the mix, by accounts chosen at random from
+    `names`. Return the result dictionary, without the block fill.
+    """
+    pairs = parse_mix(mix)
+    choices = random.choices(
+        [action for action, weight in pairs],
+        [weight for action, weight in pairs], k=actions)
+
+    latencies = []
+    failures = collections.Counter()
+    counts = collections.Counter()
+    start = time.perf_counter()
+    with pipeline.TransactionPipeline(window=window, compact=True) as pipe:
+        for sequence, choice in enumerate(choices):
+            action, data, permission = _ACTIONS[choice](
+                names, issuer, sequence)
+            counts[choice] = counts[choice] + 1
+            pipe.push_action(contract.account, action, data, permission)
+        for receipt in pipe.receipts():
+            if receipt.error:
+                failures[error_class(receipt.err_msg)] += 1
+            elif not receipt.latency is None:
+                latencies.append(receipt.latency)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "actions": actions,
+        "mix": dict(counts),
+        "window": window,
+        "accounts": len(names),
+        "elapsed_sec": elapsed,
+        "succeeded": pipe.completed - pipe.failed,
+        "failed": pipe.failed,
+        "tps": (pipe.completed - pipe.failed) / elapsed if elapsed else 0,
+        "latency_ms": {
+            "p50": _ms(percentile(latencies, 50)),
+            "p95": _ms(percentile(latencies, 95)),
+            "p99": _ms(percentile(latencies, 99)),
+            "max": _ms(latencies[-1] if latencies else None)
+            },
+        "failures": dict(failures)
+        }
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+def run(
+        accounts=10, actions=1000, mix="transfer", window=16, reuse=False,
+        out="", is_verbose=-1):
+    """ Run the benchmark. Return the result dictionary, and write it to the
+    file `out`, if given.
+
+    - **parameters**::
+
+        accounts: The number of the accounts pushing the actions.
+        actions: The number of the actions pushed.
+        mix: The actions pushed, with their weights, like 'transfer:9,issue:1'.
+        window: The maximal number of the transactions in flight.
+        reuse: Use the local node, if it is running, instead of resetting it.
+        out: The path of the json file the result is written to.
+        is_verbose: Verbosity of the set-up.
+    """
+    parse_mix(mix)
+    if not (reuse and node.is_running()):
+        if node.reset(is_verbose).error:
+            return {"error": "Cannot start the local node."}
+
+    prepared = prepare(max(accounts, 2), is_verbose)
+    if prepared is None:
+        return {"error": "Cannot deploy the contract or create the accounts."}
+    contract, table, issuer = prepared
+
+    start_block = cleos.GetInfo(is_verbose=-1).head_block
+    result = drive(
+        contract, table.created(), issuer.name, actions, mix, window)
+    end_block = cleos.GetInfo(is_verbose=-1).head_block
+    result["block_fill"] = block_fill(start_block, end_block)
+    result["nodeos_URL"] = setup.nodeos_URL()[1]
+    result["json_backend"] = codec.backend
+    result["time"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+    if out:
+        with open(out, "w") as output:
+            output.write(codec.dumps(result, indent=4))
+    return result
+
+
+def report(result):
+    """ Print the result of `run()`.
+    """
+    if "error" in result:
+        print("ERROR: " + result["error"])
+        return
+
+    latency = result["latency_ms"]
+    print("""
+actions:      {actions} ({mix})
+succeeded:    {succeeded}
+failed:       {failed}
+elapsed:      {elapsed_sec:.2f} s
+TPS:          {tps:.1f}
+latency ms:   p50 {p50}  p95 {p95}  p99 {p99}  max {max}""".format(
+        p50=latency["p50"], p95=latency["p95"], p99=latency["p99"],
+        max=latency["max"], **result))
+    for error, count in sorted(
+            result["failures"].items(), key=lambda item: -item[1]):
+        print("    {:>6}  {}".format(count, error))
+
+    fill = result["block_fill"]
+    print("blocks:       {} ({} empty)".format(
+        fill["blocks"], fill["empty_blocks"]))
+    if fill["transactions"]:
+        print("trx/block:    mean {mean:.1f}  max {max}".format(
+            **fill["transactions"]))
+    if fill["cpu"]:
+        print("CPU fill:     mean {mean:.1%}  max {max:.1%}".format(
+            **fill["cpu"]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="eosf bench",
+        description="Throughput and latency benchmark against a local node.")
+    parser.add_argument("--accounts", type=int, default=10,
+        help="the number of the accounts pushing the actions")
+    parser.add_argument("--actions", type=int, default=1000,
+        help="the number of the actions pushed")
+    parser.add_argument("--mix", default="transfer",
+        help="actions with weights, like 'transfer:9,issue:1'")
+    parser.add_argument("--window", type=int, default=16,
+        help="the maximal number of the transactions in flight")
+    parser.add_argument("--reuse", action="store_true",
+        help="use the local node if running, instead of resetting it")
+    parser.add_argument("--out", default="bench.json",
+        help="the json file of the result")
+    args = parser.parse_args(argv)
+
+    setup.set_verbose(False)
+    eosf.set_verbosity([eosf.Verbosity.ERROR])
+    result = run(
+        args.accounts, args.actions, args.mix, args.window, args.reuse,
+        args.out)
+    report(result)
+    return 0 if not "error" in result else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+#!/usr/bin/python3
+
+"""
+Read-through cache of immutable chain data.
+
+.. module:: cache
+    :platform: Unix, Windows
+    :synopsis: Read-through cache of immutable chain data.
+
+.. moduleauthor:: Tokenika
+
+Irreversible blocks, transactions in irreversible blocks, and contract code
+and ABI, keyed with the code hash, never change. With `setup.set_cache()`,
+the responses of `cleos.GetBlock`, `cleos.GetTransaction` and `cleos.GetCode`
+are kept in an in-memory LRU dictionary, in front of an `sqlite3` file
+holding compressed responses. The cache is keyed with the URL of the node,
+and `node.reset()` clears it for the local node, whether the cache is set
+or not. If a chain is started anew in another way, clear its responses
+with `cache.clear(url)`.
+
+The stores are committed to the file in batches of `commit_every`, and at
+the exit of the process.
+
+A `cleos.GetCode` response is looked up with the code hash, hence only if
+the hash is given, like `cleos.GetCode(account, wasm=True, code_hash=...)`.
+"""
+
+import os
+import zlib
+import atexit
+import sqlite3
+import threading
+import collections
+import codec
+import setup
+
+
+# The number of stores committed to the file together:
+commit_every = 64
+
+
+class ChainCache:
+    """ In-memory LRU dictionary in front of an on-disk store.
+
+    - **parameters**::
+
+        path: The path of the `sqlite3` file.
+        max_entries: The maximal number of responses kept in memory.
+
+    - **attributes**::
+
+        hits: The number of responses found in memory.
+        disk_hits: The number of responses found in the file.
+        misses: The number of responses not found.
+        stores: The number of responses stored.
+    """
+    def __init__(self, path, max_entries=4096):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+        self._uncommitted = 0
+        self._memory = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "url TEXT, kind TEXT, key TEXT, response BLOB, "
+            "PRIMARY KEY (url, kind, key)) WITHOUT ROWID")
+        self._db.commit()
+
+
+    def get(self, kind, key, url=None):
+        """ Return the cached response text, or `None`.
+        """
+        if url is None:
+            url = setup.nodeos_URL()[1]
+        memory_key = (url, kind, key)
+        with self._lock:
+            response = self._memory.get(memory_key)
+            if not response is None:
+                self._memory.move_to_end(memory_key)
+                self.hits = self.hits + 1
+                return response
+
+            row = self._db.execute(
+                "SELECT response FROM responses "
+                "WHERE url = ? AND kind = ? AND key = ?",
+                memory_key).fetchone()
+            if row is None:
+                self.misses = self.misses + 1
+                return None
+
+            self.disk_hits = self.disk_hits + 1
+            response = zlib.decompress(row[0]).decode("utf-8")
+            self._remember(memory_key, response)
+            return response
+
+
+    def put(self, kind, key, response, url=None):
+        """ Store a response text.
+        """
+        if url is None:
+            url = setup.nodeos_URL()[1]
+        memory_key = (url, kind, key)
+        with self._lock:
+            self._remember(memory_key, response)
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                memory_key + (zlib.compress(response.encode("utf-8")),))
+            self.stores = self.stores + 1
+            self._uncommitted = self._uncommitted + 1
+            if self._uncommitted >= commit_every:
+                self._commit()
+
+
+    def _commit(self):
+        self._db.commit()
+        self._uncommitted = 0
+
+
+    def flush(self):
+        """ Commit the responses stored to the file.
+        """
+        with self._lock:
+            if self._uncommitted:
+                self._commit()
+
+
+    def _remember(self, memory_key, response):
+        self._memory[memory_key] = response
+        self._memory.move_to_end(memory_key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+
+    def clear(self, url):
+        """ Forget all the responses of the node with the given URL.
+        """
+        with self._lock:
+            for memory_key in [k for k in self._memory if k[0] == url]:
+                del self._memory[memory_key]
+            self._db.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self._commit()
+
+
+    def stats(self):
+        return {
+            "hits": self.hits, "disk_hits": self.disk_hits,
+            "misses": self.misses, "stores": self.stores
+            }
+
+
+_chain_cache = None
+_chain_cache_lock = threading.Lock()
+
+
+def chain_cache():
+    """ Return the cache shared in the process, stored in `setup.cache_file`.
+    """
+    global _chain_cache
+    with _chain_cache_lock:
+        if _chain_cache is None or _chain_cache.path != setup.cache_file:
+            if not _chain_cache is None:
+                _chain_cache.flush()
+            _chain_cache = ChainCache(setup.cache_file)
+        return _chain_cache
+
+
+def _flush():
+    if not _chain_cache is None:
+        _chain_cache.flush()
+
+
+atexit.register(_flush)
+
+
+def stats():
+    """ Return the hit and miss counters of the cache.
+    """
+    return chain_cache().stats()
+
+
+_last_irreversible_block_num = {}
+
+# The time in seconds the last irreversible block number is reused before
+# it is refreshed:
+refresh_sec = 1
+
+
+def set_last_irreversible_block_num(block_num, url=None):
+    """ Record the last irreversible block number, as reported by the node.
+    """
+    if url is None:
+        url = setup.nodeos_URL()[1]
+    _last_irreversible_block_num[url] = block_num
+
+
+def is_irreversible(block_num):
+    """ Whether a block is at or below the last irreversible block, that is,
+    whether its data is safe to cache.
+
+    The last irreversible block number is refreshed with 
+    `cleos.chain_head()`, at most once in `refresh_sec` seconds.
+    """
+    url = setup.nodeos_URL()[1]
+    if block_num <= _last_irreversible_block_num.get(url, 0):
+        return True
+
+    import cleos
+    # `GetInfo` calls `set_last_irreversible_block_num()`:
+    cleos.chain_head().get_info(max_age_sec=refresh_sec)
+    return block_num <= _last_irreversible_block_num.get(url, 0)
+
+
+def clear(url):
+    """ Forget all the cached data of the node with the given URL. The cache
+    file is not made, if it does not exist.
+    """
+    _last_irreversible_block_num.pop(url, None)
+    if _chain_cache is None and not os.path.exists(setup.cache_file):
+        return
+    chain_cache().clear(url)
+
+
+def get_code(code_hash):
+    """ Return the `cleos.GetCode` response, as a dictionary, for the given
+    code hash, if cached, or `None`.
+    """
+    response = chain_cache().get("code", code_hash)
+    return None if response is None else codec.loads(response)
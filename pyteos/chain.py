@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+
+"""
+Native client of the EOSIO chain API.
+
+.. module:: chain
+    :platform: Unix, Windows
+    :synopsis: Native client of the EOSIO chain API, with pooled keep-alive
+        connections to the node.
+
+.. moduleauthor:: Tokenika
+
+"""
+
+import threading
+import queue
+import http.client
+import urllib.parse
+import codec
+import setup
+import counters
+
+
+class ChainClient:
+    """ HTTP client of a `nodeos` node, keeping alive a pool of connections.
+
+    - **parameters**::
+
+        url: The URL of the node, for example `http://localhost:8888`.
+        pool_size: The maximal number of idle connections kept open.
+        timeout: Socket timeout in seconds.
+
+    A connection is taken from the pool for each request, and it is returned
+    to the pool afterwards. Hence, concurrent threads can share one client.
+    """
+    def __init__(self, url, pool_size=32, timeout=30):
+        self.url = url
+        self.timeout = timeout
+        split = urllib.parse.urlsplit(url)
+        self.is_https = split.scheme == "https"
+        self.host = split.hostname
+        self.port = split.port
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+    def _connection(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+
+        if self.is_https:
+            return http.client.HTTPSConnection(
+                self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(
+            self.host, self.port, timeout=self.timeout)
+
+    def _release(self, connection):
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def request(self, path, body=None):
+        """ Send a POST request to the node.
+
+        Return the status and the text of the response. A connection found
+        stale, because the node has closed it, is replaced once.
+        """
+        if body is None:
+            body = {}
+        if not isinstance(body, (str, bytes)):
+            body = codec.dumps(body)
+        headers = {
+            "Content-Type": "application/json",
+            "Connection": "keep-alive"
+            }
+
+        for attempt in range(2):
+            connection = self._connection()
+            counters.count("http")
+            try:
+                connection.request("POST", path, body=body, headers=headers)
+                response = connection.getresponse()
+                text = response.read().decode("utf-8")
+            except (http.client.HTTPException, OSError):
+                connection.close()
+                if attempt > 0:
+                    raise
+                continue
+
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(connection)
+            return response.status, text
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_clients = {}
+_client_lock = threading.Lock()
+
+
+def client(url=None):
+    """ Return the client shared in the process, connected to the given URL,
+    default is the node set with `setup.set_nodeos_URL()`.
+    """
+    if url is None:
+        url = setup.nodeos_URL()[1]
+    with _client_lock:
+        if not url in _clients:
+            _clients[url] = ChainClient(url)
+        return _clients[url]
+
+
+def error_message(text):
+    """ Render an error response of the node the way `cleos` does.
+    """
+    try:
+        error = codec.loads(text)["error"]
+    except:
+        return "Error: {}".format(text)
+
+    msg = "Error {}: {}".format(error["code"], error["what"])
+    details = [detail["message"] for detail in error.get("details", [])]
+    if details:
+        msg = msg + "\nError Details:\n" + "\n".join(details)
+    return msg
+
+
+def call(path, body=None, url=None):
+    """ Call the node API, or the API of a Wallet Manager at the given URL,
+    return the pair of the response text and the error message, like
+    `stdout` and `stderr` of a `cleos` process.
+    """
+    if url is None:
+        url = setup.nodeos_URL()[1]
+    try:
+        status, text = client(url).request(path, body)
+    except Exception as e:
+        return "", "Error: Failed to connect to {}: {}".format(url, e)
+
+    if not 200 <= status < 300:
+        return "", error_message(text)
+    return text, ""
@@ -13,11 +13,24 @@ Python front-end for `EOSIO cleos`.
 
 import random
 import os
+import re
+import time
+import threading
+import collections
+import concurrent.futures
 import subprocess
-import json as json_module
+import socket
+import urllib.parse
+import codec
 import pathlib
+import tempfile
 import setup
 import teos
+import chain
+import cache
+import tracing
+import counters
+import profiler
 from textwrap import dedent
 
 
@@ -29,7 +42,7 @@ setup_setup = setup.Setup()
 
 def reset_nodeos_URL():
     import teos
-    config = teos.GetConfig(is_verbose=0)
+    config = teos.config()
     try:       
         url = config.json["EOSIO_DAEMON_ADDRESS"]
     except:
@@ -47,8 +60,78 @@ def wallet_url():
     return _wallet_url_arg
 
 
+def wallet_api_url():
+    """ The URL of the Wallet Manager, if it is set explicitly, as for the
+    local node, or `None`.
+    """
+    if _wallet_url_arg:
+        return _wallet_url_arg[1]
+    return None
+
+
+# The time in seconds the result of `node_is_running()` is reused:
+node_is_running_ttl_sec = 1
+_node_is_running = None
+_node_is_running_time = 0
+
+
+def _is_nodeos_process():
+    """ Whether a `nodeos` process is listed in the `/proc` directory.
+    """
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        try:
+            with open("/proc/" + pid + "/comm") as comm:
+                if "nodeos" in comm.read():
+                    return True
+        except OSError: # the process has terminated
+            pass
+    return False
+
+
+def _is_nodeos_port_open():
+    """ Whether the node at `setup.nodeos_URL()` accepts connections.
+    """
+    if setup.nodeos_URL() is None:
+        reset_nodeos_URL()
+    split = urllib.parse.urlsplit(setup.nodeos_URL()[1])
+    try:
+        socket.create_connection(
+            (split.hostname, split.port or 80), timeout=0.5).close()
+        return True
+    except OSError:
+        return False
+
+
 def node_is_running():
-    return not teos.NodeIsRunning(is_verbose=0).daemon_pid == ""
+    """ Whether the local node is running.
+
+    The `/proc` directory is searched for a `nodeos` process, or, if there is
+    no `/proc`, the HTTP port of the node is probed. The result is reused 
+    for `node_is_running_ttl_sec` seconds, or until 
+    `invalidate_node_is_running()` is called.
+    """
+    global _node_is_running
+    global _node_is_running_time
+    if not _node_is_running is None \
+            and time.time() - _node_is_running_time < node_is_running_ttl_sec:
+        return _node_is_running
+
+    if os.path.isdir("/proc"):
+        _node_is_running = _is_nodeos_process()
+    else:
+        _node_is_running = _is_nodeos_port_open()
+    _node_is_running_time = time.time()
+    return _node_is_running
+
+
+def invalidate_node_is_running():
+    """ Forget the result of `node_is_running()`, as the node is started or
+    stopped.
+    """
+    global _node_is_running
+    _node_is_running = None
     
 
 def is_notrunningnotkeosd_error(cleos_object):
@@ -92,16 +175,57 @@ def heredoc(msg):
     return dedent(msg).strip()
 
 
-class _Cleos:
+class _Cleos(tracing.Traced):
     """ A prototype for the `cleos` command classes.
     """
     global setup_setup
 
     error = False
     is_verbose = 1
-    json = {}
     err_msg = ""
     _out = ""
+    _json = None
+    _json_text = None
+    _out_file = None
+    _err_file = None
+
+    # The length of the output of `cleos` kept as text. A longer output is
+    # spooled to a temporary file, and the text keeps its head only:
+    max_output_length = None
+
+    @property
+    def json(self):
+        """ The json representation of the object. A text given to 
+        `defer_json()` is parsed at the first access. 
+        """
+        if self._json is None:
+            self._json = {}
+            text = self._json_text
+            self._json_text = None
+            if text:
+                try:
+                    with tracing.span(
+                            "cleos.parse", "cleos", stdout_bytes=len(text)):
+                        self._json = codec.loads(text)
+                except ValueError:
+                    pass
+                else:
+                    if setup.is_lazy_results() and text is self._out:
+                        self._out = ""
+        return self._json
+
+    @json.setter
+    def json(self, json):
+        self._json = json
+        self._json_text = None
+
+    def defer_json(self, text):
+        """ Set `json` to be parsed from the given text at the first access.
+        With `setup.set_lazy_results()`, if the text is the output of the 
+        command, the output is released then.
+        """
+        self._json = None
+        self._json_text = text
 
     def copy_to(self, to_object):
         to_object.error = self.error
@@ -120,17 +244,52 @@ class _Cleos:
                 self.is_verbose = 0
 
     def __init__(
-                self, args, first, second, is_verbose=1):
+                self, args, first, second, is_verbose=1, api=None, 
+                cached=None):
 
+        span = tracing.current()
         cl = [setup_setup.cleos_exe]
 
         if setup.nodeos_URL() is None:
             reset_nodeos_URL()
         cl.extend(setup.nodeos_URL())
 
-        set_wallet_url_arg(self) # this may set self.error ON
+        # `cached` is the pair of the kind and the key of the response in the
+        # chain cache:
+        self.args = args
+        self.is_cached = False
+        if not cached is None and setup.is_cache():
+            out = cache.chain_cache().get(cached[0], cached[1])
+            if not out is None:
+                self.is_cached = True
+                self._out, self.err_msg = out, ""
+                counters.count("cache_hit")
+
+        # `api` is the pair of the node API path and the request body, and
+        # possibly the URL of a Wallet Manager:
+        is_native = not api is None and setup.is_native_transport()
+        if self.is_cached:
+            pass
+        elif is_native:
+            if setup.is_print_request():
+                print("request sent to the node:")
+                print(api[0])
+                print(codec.dumps(api[1]))
+                print("")
+            start = time.perf_counter()
+            self._out, self.err_msg = chain.call(*api)
+            counters.count("round_trip")
+            if span:
+                span.set(
+                    argv=[api[0]],
+                    request_us=round((time.perf_counter() - start) * 1e6, 1))
+            if setup.is_print_response():
+                print(self._out)
+        else:
+            set_wallet_url_arg(self) # this may set self.error ON
+
         global _wallet_url_arg
-        if not self.error:
+        if not self.error and not is_native and not self.is_cached:
             cl.extend(_wallet_url_arg)
 
             if setup.is_print_request():
@@ -140,21 +299,30 @@ class _Cleos:
 
             cl.extend([first, second])
             cl.extend(args)
-            self.args = args
 
             if setup.is_print_command_line():
                 print("command line sent to cleos:")
                 print(" ".join(cl))
                 print("")
 
-            process = subprocess.run(
-                cl,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                cwd=str(pathlib.Path(setup_setup.cleos_exe).parent)) 
-
-            self._out = process.stdout.decode("utf-8")
-            self.err_msg = process.stderr.decode("utf-8")
+            counters.count("subprocess")
+            counters.count("round_trip", _round_trips(first, second, args))
+            start = time.perf_counter()
+            if self.max_output_length is None:
+                process = subprocess.run(
+                    cl,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    cwd=str(pathlib.Path(setup_setup.cleos_exe).parent)) 
+
+                self._out = process.stdout.decode("utf-8")
+                self.err_msg = process.stderr.decode("utf-8")
+            else:
+                self._run_spooled(cl)
+            if span:
+                span.set_argv(cl)
+                span.set(
+                    spawn_us=round((time.perf_counter() - start) * 1e6, 1))
 
         self.set_is_verbose(is_verbose)
         self.json = {}
@@ -173,6 +341,54 @@ class _Cleos:
             self.json["ERROR"] = self.err_msg
             self.print_error()
 
+        if span:
+            self._trace(span)
+
+
+    def _trace(self, span):
+        span.set(
+            cached=self.is_cached,
+            stdout_bytes=self._output_length(self._out, self._out_file),
+            stderr_bytes=self._output_length(self.err_msg, self._err_file),
+            error=self.error)
+        match = _elapsed_pattern.search(self._out) \
+            or _executed_pattern.search(self.err_msg)
+        if match:
+            span.set(elapsed_us=int(match.group(1)))
+        span.mark_command_end()
+
+    def _output_length(self, text, spool):
+        if spool:
+            return spool.seek(0, os.SEEK_END)
+        return len(text)
+
+    def _run_spooled(self, cl):
+        out_file = tempfile.TemporaryFile()
+        err_file = tempfile.TemporaryFile()
+        subprocess.run(
+            cl,
+            stdout=out_file,
+            stderr=err_file,
+            cwd=str(pathlib.Path(setup_setup.cleos_exe).parent))
+
+        self._out, self._out_file = self._spooled_text(out_file)
+        self.err_msg, self._err_file = self._spooled_text(err_file)
+        if self._err_file and scan_file(self._err_file, _error_pattern):
+            # an error message is kept in full:
+            self.err_msg = read_file(self._err_file)
+            self._err_file.close()
+            self._err_file = None
+
+    def _spooled_text(self, spool):
+        length = spool.seek(0, os.SEEK_END)
+        spool.seek(0)
+        if length <= self.max_output_length:
+            text = spool.read().decode("utf-8")
+            spool.close()
+            return (text, None)
+
+        text = spool.read(self.max_output_length).decode("utf-8", "ignore")
+        return (text + "\n... ({} bytes)\n".format(length), spool)
 
     def printself(self):
         if self.is_verbose > 0:
@@ -187,7 +403,11 @@ class _Cleos:
 
 
     def __str__(self):
-        out = self._out + "\n"
+        out = self._out
+        if not out and self._json:
+            # the output is released, see `setup.set_lazy_results()`:
+            out = codec.dumps(self._json, indent=4)
+        out = out + "\n"
         out = out + self.err_msg
         return out
 
@@ -196,21 +416,80 @@ class _Cleos:
         return ""
 
 
+# The requests `cleos` sends for a transaction: `get_info`, the Wallet
+# Manager's `get_public_keys`, `get_required_keys`, the Wallet Manager's
+# `sign_transaction` and `push_transaction`:
+_transaction_requests = 5
+# The requests of the commands, other than one, see `counters`. The JSON data
+# of an action is converted with an `abi_json_to_bin` request:
+_command_requests = {
+    ("create", "key"): 0,
+    ("create", "account"): _transaction_requests,
+    ("set", "contract"): _transaction_requests,
+    ("push", "transaction"): _transaction_requests,
+    ("push", "action"): _transaction_requests + 1,
+    # `newaccount`, with `buyram` and `delegatebw` converted:
+    ("system", "newaccount"): _transaction_requests + 2
+    }
+
+
+def _round_trips(first, second, args):
+    """ The number of the requests `cleos` sends for a command.
+    """
+    count = _command_requests.get((first, second), 1)
+    if count >= _transaction_requests:
+        if "--skip-sign" in args: # no keys and signature
+            count = count - 3
+        if "--dont-broadcast" in args:
+            count = count - 1
+        if "--ref-block" in args: # `get_block`
+            count = count + 1
+    return count
+
+_transaction_id_pattern = re.compile(r'"transaction_id"\s*:\s*"(\w*)"')
+_error_pattern = re.compile(rb"Error|error|Failed")
+# The time reported by the node, in json and in text:
+_elapsed_pattern = re.compile(r'"elapsed"\s*:\s*(\d+)')
+_executed_pattern = re.compile(r"executed transaction: \w+\s+\d+ bytes\s+(\d+) us")
+
+
+def read_file(spool):
+    """ Return the text of a file spooling the output of `cleos`.
+    """
+    spool.seek(0)
+    return spool.read().decode("utf-8")
+
+
+def scan_file(spool, pattern, chunk_length=1 << 16, overlap=256):
+    """ Return the first match of a compiled bytes pattern in a file 
+    spooling the output of `cleos`, read in chunks, or `None`. A match is 
+    assumed shorter than `overlap`.
+    """
+    spool.seek(0)
+    tail = b""
+    while True:
+        chunk = spool.read(chunk_length)
+        if not chunk:
+            return None
+        data = tail + chunk
+        match = pattern.search(data)
+        if match:
+            return match
+        tail = data[-overlap:]
+
 def get_transaction_id(cleos_object):
     transaction_id = ""
     msg_keyword = "executed transaction: "
     msg = cleos_object.err_msg
-    json = {}
     if msg_keyword in msg:
         beg = msg.find(msg_keyword, 0) + len(msg_keyword)
         end = msg.find(" ", beg + 1)
         transaction_id = msg[beg : end]
     else:
-        try:
-            json = json_module.loads(cleos_object._out)
-            transaction_id = json["transaction_id"]
-        except:
-            pass
+        # The id leads the json output, hence the output is not parsed:
+        match = _transaction_id_pattern.search(cleos_object._out)
+        if match:
+            transaction_id = match.group(1)
     return transaction_id
 
     
@@ -241,15 +520,12 @@ class GetAccount(_Cleos):
             args.append("--json")
 
         _Cleos.__init__(
-            self, args, "get", "account", is_verbose)
+            self, args, "get", "account", is_verbose,
+            api=("/v1/chain/get_account", 
+                {"account_name": self.account_name}))
 
         if not self.error:
-            try:
-                j = json_module.loads(self._out)
-                self.json = j
-            except:
-                pass
-
+            self.defer_json(self._out)
             self.printself()
 
 
@@ -278,7 +554,7 @@ class GetAccounts(_Cleos):
             self, [key_public], "get", "accounts", is_verbose)
 
         if not self.error:
-            self.json = json_module.loads(self._out)
+            self.json = codec.loads(self._out)
             self.names = self.json['account_names']
             self.printself()
 
@@ -303,10 +579,16 @@ class GetTransaction(_Cleos):
         
         self.transaction_id = transaction_id
         _Cleos.__init__(
-            self, [transaction_id], "get", "transaction", is_verbose)
+            self, [transaction_id], "get", "transaction", is_verbose,
+            api=("/v1/history/get_transaction", {"id": transaction_id}),
+            cached=("transaction", transaction_id))
 
         if not self.error:
-            self.json = json_module.loads(self._out)
+            self.json = codec.loads(self._out)
+            if setup.is_cache() and not self.is_cached \
+                    and cache.is_irreversible(self.json["block_num"]):
+                cache.chain_cache().put(
+                    "transaction", transaction_id, self._out)
 
             self.printself()
 
@@ -397,7 +679,7 @@ class WalletList(_Cleos):
             self, [], "wallet", "list", is_verbose)
 
         if not self.error:
-            self.json = json_module.loads("{" + self._out.replace("Wallets", \
+            self.json = codec.loads("{" + self._out.replace("Wallets", \
                 '"Wallets"', 1) + "}")
             self.printself()
 
@@ -438,9 +720,14 @@ class WalletImport(_Cleos):
         except:
             wallet_name = wallet
 
+        api = None
+        if wallet_api_url():
+            api = ("/v1/wallet/import_key", [wallet_name, key_private],
+                wallet_api_url())
+
         _Cleos.__init__(
             self, [key_private, "--name", wallet_name],
-            "wallet", "import", is_verbose)
+            "wallet", "import", is_verbose, api=api)
 
         if not self.error:
             self.json["key_private"] = key_private
@@ -611,19 +898,142 @@ class GetInfo(_Cleos):
     """
     def __init__(self, is_verbose=1):
         _Cleos.__init__(
-            self, [], "get", "info", is_verbose)
+            self, [], "get", "info", is_verbose, 
+            api=("/v1/chain/get_info", {}))
 
         if not self.error:
-            self.json = json_module.loads(str(self._out))
+            self.json = codec.loads(str(self._out))
             self.head_block = self.json["head_block_num"]
             self.head_block_time = self.json["head_block_time"]
             self.last_irreversible_block_num \
                 = self.json["last_irreversible_block_num"]
+            cache.set_last_irreversible_block_num(
+                self.last_irreversible_block_num)
             self.printself()
 
 
+block_interval_sec = 0.5
+
+
+class ChainHead:
+    """ Head state of the chain, shared by the callers of `GetInfo`.
+
+    - **parameters**::
+
+        max_age_sec: The time in seconds a `GetInfo` object is served
+            before it is refreshed.
+
+    Concurrent requests for a fresh state are coalesced into a single 
+    `GetInfo` call. See `chain_head()`.
+    """
+    def __init__(self, max_age_sec=0.1):
+        self.max_age_sec = max_age_sec
+        self._condition = threading.Condition()
+        self._info = None
+        self._time = 0
+        self._generation = 0
+        self._is_in_flight = False
+
+
+    def get_info(self, max_age_sec=None):
+        """ Return a `GetInfo` object not older than `max_age_sec`, default is
+        the value given to the constructor.
+
+        If another thread is calling `GetInfo` already, wait for its result.
+        """
+        if max_age_sec is None:
+            max_age_sec = self.max_age_sec
+
+        with self._condition:
+            generation = self._generation
+            while True:
+                if not self._info is None \
+                        and time.time() - self._time <= max_age_sec:
+                    return self._info
+                if not self._is_in_flight:
+                    self._is_in_flight = True
+                    break
+                self._condition.wait()
+                if self._generation != generation:
+                    return self._info
+
+        info = None
+        try:
+            info = GetInfo(is_verbose=-1)
+        finally:
+            with self._condition:
+                self._is_in_flight = False
+                if not info is None:
+                    self._info = info
+                    self._time = 0 if info.error else time.time()
+                    self._generation = self._generation + 1
+                self._condition.notify_all()
+        return info
+
+
+    def invalidate(self):
+        """ Forget the cached state.
+        """
+        with self._condition:
+            self._time = 0
+
+
+    def _wait_for(self, block_num, field, timeout):
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            info = self.get_info()
+            if not info.error and info.json[field] >= block_num:
+                return info
+
+            # sleep until the block is expected:
+            delay = block_interval_sec
+            if not info.error:
+                delay = max(delay, 
+                    (block_num - info.json[field]) * block_interval_sec)
+            if not deadline is None:
+                delay = min(delay, deadline - time.time())
+                if delay <= 0:
+                    return None
+            time.sleep(delay)
+
+
+    def wait_for_block(self, block_num, timeout=None):
+        """ Wait until the head block number is at least `block_num`.
+
+        Return the `GetInfo` object, or `None` on timeout.
+        """
+        return self._wait_for(block_num, "head_block_num", timeout)
+
+
+    def wait_for_irreversible(self, block_num, timeout=None):
+        """ Wait until the last irreversible block number is at least 
+        `block_num`.
+
+        Return the `GetInfo` object, or `None` on timeout.
+        """
+        return self._wait_for(
+            block_num, "last_irreversible_block_num", timeout)
+
+
+_chain_heads = {}
+_chain_heads_lock = threading.Lock()
+
+
+def chain_head():
+    """ Return the `ChainHead` object of the node set with 
+    `setup.set_nodeos_URL()`, shared in the process.
+    """
+    if setup.nodeos_URL() is None:
+        reset_nodeos_URL()
+    url = setup.nodeos_URL()[1]
+    with _chain_heads_lock:
+        if not url in _chain_heads:
+            _chain_heads[url] = ChainHead()
+        return _chain_heads[url]
+
+
 def get_last_block():
-    info = GetInfo()
+    info = chain_head().get_info()
     return GetBlock(info.head_block)
 
 
@@ -645,6 +1055,51 @@ def get_block_trx_cout(block_num):
     return len(trxs)
 
 
+def iter_blocks(start, end=None, follow=False, prefetch=16, is_verbose=-1):
+    """ Yield `GetBlock` objects, in order, from the block number `start`.
+
+    - **parameters**::
+
+        start: The number of the first block.
+        end: The number of the last block. Default is the head block at the
+            time of the call, or no limit, if `follow` is set.
+        follow: If set, do not stop at the head block, but wait for new
+            blocks, and yield them as they are produced.
+        prefetch: The number of blocks fetched ahead of the consumer, in a
+            thread pool. It bounds the number of blocks held in memory.
+        is_verbose: Verbosity of the `GetBlock` objects, default is `-1`.
+
+    The iteration stops, if the head block cannot be determined.
+    """
+    info = chain_head().get_info()
+    if info.error:
+        return
+    head = info.head_block
+
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=prefetch, thread_name_prefix="iter_blocks") as executor:
+        pending = collections.deque()
+        block_num = start
+        while True:
+            last = head
+            if not end is None:
+                last = min(head, end) if follow else end
+            while len(pending) < prefetch and block_num <= last:
+                pending.append(executor.submit(
+                    tracing.bind(GetBlock), block_num, is_verbose=is_verbose))
+                block_num = block_num + 1
+
+            if pending:
+                yield pending.popleft().result()
+                continue
+
+            if not follow or (not end is None and block_num > end):
+                return
+
+            info = chain_head().wait_for_block(block_num)
+            head = info.head_block
+
+
 class GetBlock(_Cleos):
     """ Retrieve a full block from the blockchain.
 
@@ -669,11 +1124,16 @@ class GetBlock(_Cleos):
             args = [block_id]
         
         _Cleos.__init__(
-            self, args, "get", "block", is_verbose)
+            self, args, "get", "block", is_verbose,
+            api=("/v1/chain/get_block", {"block_num_or_id": args[0]}),
+            cached=("block", args[0]))
 
         if not self.error:
-            self.json = json_module.loads(self._out)
+            self.json = codec.loads(self._out)
             self.block_num = self.json["block_num"]
+            if setup.is_cache() and not self.is_cached \
+                    and cache.is_irreversible(self.block_num):
+                cache.chain_cache().put("block", args[0], self._out)
             self.ref_block_prefix = self.json["ref_block_prefix"]
             self.timestamp = self.json["timestamp"]
             self.printself()
@@ -690,16 +1150,21 @@ class GetCode(_Cleos):
         code: The name of the file to save the contract .wast/wasm to.
         abi: The name of the file to save the contract .abi to.
         wasm: Save contract as wasm.
+        code_hash: The code hash of the account, if known. With
+            `setup.set_cache()`, the response is then looked up in the chain
+            cache before the node is called.
 
     - **attributes**::
 
         error: Whether any error ocurred.
         json: The json representation of the object.
+        code_hash: The code hash.
+        is_cached: Whether the response is taken from the chain cache.
         is_verbose: Verbosity at the construction time.    
     """
     def __init__(
             self, account, code="", abi="", 
-            wasm=False, is_verbose=1
+            wasm=False, is_verbose=1, code_hash=""
         ):
 
         try:
@@ -715,12 +1180,27 @@ class GetCode(_Cleos):
         if wasm:
             args.extend(["--wasm"])
 
-        _Cleos.__init__(self, args, "get", "code", is_verbose)
+        api = None
+        cached = None
+        if not code and not abi: # the native transport does not save files
+            api = ("/v1/chain/get_code", 
+                {"account_name": account_name, "code_as_wasm": wasm})
+            if code_hash and wasm: # the cached responses hold the wasm
+                cached = ("code", code_hash)
+
+        _Cleos.__init__(
+            self, args, "get", "code", is_verbose, api=api, cached=cached)
 
         if not self.error:
             msg = str(self._out)
-            self.json["code_hash"] = msg[msg.find(":") + 2 : len(msg) - 1]
+            try: # the response of the node API:
+                self.json = codec.loads(msg)
+            except: # the text output of `cleos`:
+                self.json["code_hash"] = msg[msg.find(":") + 2 : len(msg) - 1]
             self.code_hash = self.json["code_hash"]
+            if setup.is_cache() and wasm and self.json.get("wasm") \
+                    and not self.is_cached:
+                cache.chain_cache().put("code", self.code_hash, msg)
             self.printself()
 
 
@@ -744,17 +1224,22 @@ class GetTable(_Cleos):
             defaults to first.
         upper: JSON representation of upper bound value value of key, 
             defaults to last.
+        decode: Fetch the rows in binary, and decode them locally with the
+            ABI of the contract, see `abi.get_abi()`. The node does not
+            convert the rows to JSON then.
 
     - **attributes**::
 
         error: Whether any error ocurred.
         json: The json representation of the object.
         is_verbose: Verbosity at the construction time.
+        binary_rows: The list of the rows as hex strings, if `binary` or
+            `decode` is set.
     """  
     def __init__(
         self, contract, table, scope,
         binary=False, 
-        limit=10, key="", lower="", upper="",
+        limit=10, key="", lower="", upper="", decode=False,
         is_verbose=1
         ):
 
@@ -776,31 +1261,166 @@ class GetTable(_Cleos):
         args.append(scope_name)
         args.append(table)
 
+        self.contract_name = contract_name
+        self.table = table
+        self.binary_rows = []
+        if decode:
+            binary = True
         if binary:
             args.append("--binary")
         if limit:
             args.extend(["--limit", str(limit)])
+        key_public = ""
         if key:
             try:
                 key_public = key.active_key_public
             except:
                 key_public = key
             args.extend(["--key", key_public])
+        # the bounds may be numbers, like the `next_key` of a page:
+        lower = str(lower) if lower else ""
+        upper = str(upper) if upper else ""
         if lower:
             args.extend(["--lower", lower])
         if upper:
             args.extend(["--upper", upper])
 
-        _Cleos.__init__(self, args, "get", "table", is_verbose)
+        _Cleos.__init__(
+            self, args, "get", "table", is_verbose,
+            api=("/v1/chain/get_table_rows", {
+                "code": contract_name, "scope": scope_name, "table": table,
+                "json": not binary, "limit": limit,
+                "table_key": key_public,
+                "lower_bound": lower, "upper_bound": upper
+                }))
 
         if not self.error:
             try:
-                self.json = json_module.loads(self._out)
+                self.json = codec.loads(self._out)
             except:
                 pass
 
+            if binary and isinstance(self.json, dict):
+                self.binary_rows = self.json.get("rows", [])
+                if decode:
+                    import abi
+                    try:
+                        self.json["rows"] = abi.get_abi(
+                            contract_name).unpack_rows(table, self.binary_rows)
+                    except Exception as e:
+                        self.error = True
+                        self.err_msg = "Error: cannot decode the rows: {}" \
+                            .format(e)
+                        self.json["ERROR"] = self.err_msg
+                        self.print_error()
+                        return
+
             self.printself()
 
+    def columns(self):
+        """ Decode the binary rows in bulk, see `abi.Abi.unpack_columns()`.
+        """
+        import abi
+        return abi.get_abi(self.contract_name).unpack_columns(
+            self.table, self.binary_rows)
+
+
+def scan_table(
+        contract, table, scopes, 
+        limit=100, key="", lower="", upper="", 
+        next_lower=None, workers=8, binary=False, decode=False,
+        max_limit=10000, is_verbose=0):
+    """ Yield all the rows of a table, in many scopes, as pairs of the scope 
+    name and the row.
+
+    - **parameters**::
+
+        contract: The contract that owns the table. May be an object having 
+            the attribute `name`, or a string.
+        table: The name of the table as specified by the contract abi.
+        scopes: An iterable of the scopes to scan. Items may be objects
+            having the attribute `name`, or strings.
+        limit: The maximum number of rows in a page, that is a request.
+        key, lower, upper: See `GetTable`.
+        next_lower: A function of the last row of a page that returns the
+            lower bound of the next page. If not set, and the node does not
+            return the next key, the page is requested again, with doubled
+            `limit`, and the rows already yielded are skipped.
+        max_limit: The maximum `limit` of a page requested again. A scope
+            needing more is reported as an error, and the rest of it is 
+            skipped.
+        workers: The number of scopes requested concurrently.
+        binary: Yield the rows as hex strings, see `GetTable`. Collected,
+            they can be decoded in bulk with `abi.Abi.unpack_columns()`.
+        decode: Decode binary rows locally, see `GetTable`.
+        is_verbose: Verbosity of the `GetTable` objects. Default is `0`, 
+            print errors only. A scope with an error is skipped.
+
+    Pages are requested lazily: the next page of a scope is requested when 
+    the rows of the current one are yielded.
+    """
+    def page(scope_name, lower, limit):
+        return GetTable(
+            contract, table, scope_name, binary=binary, limit=limit, key=key,
+            lower=lower, upper=upper, decode=decode, is_verbose=is_verbose)
+
+    scopes = iter(scopes)
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="scan_table") as executor:
+        active = collections.deque()
+
+        def activate():
+            for scope in scopes:
+                try:
+                    scope_name = scope.name
+                except:
+                    scope_name = scope
+                active.append([
+                    scope_name, executor.submit(
+                        tracing.bind(page), scope_name, lower, limit),
+                    lower, limit, 0])
+                if len(active) >= workers:
+                    break
+
+        activate()
+        while active:
+            scope_name, future, page_lower, page_limit, skip = active[0]
+            get_table = future.result()
+            if get_table.error:
+                active.popleft()
+                activate()
+                continue
+
+            rows = get_table.json.get("rows", [])
+            fresh_rows = rows[skip:]
+            if get_table.json.get("more") and rows:
+                if next_lower:
+                    next_page = [next_lower(rows[-1]), limit, 0]
+                elif get_table.json.get("next_key"):
+                    next_page = [get_table.json["next_key"], limit, 0]
+                elif page_limit < max_limit: # the same page again, longer:
+                    next_page = [
+                        page_lower, min(page_limit * 2, max_limit), len(rows)]
+                else:
+                    next_page = None
+                    if is_verbose > -1:
+                        print("ERROR:")
+                        print("Cannot scan the scope '{}' of the table '{}' "
+                            "beyond {} rows, set `next_lower`.\n".format(
+                                scope_name, table, len(rows)))
+            else:
+                next_page = None
+
+            if next_page:
+                active[0][1:] = [executor.submit(
+                    tracing.bind(page), scope_name, next_page[0], next_page[1])] + next_page
+            else:
+                active.popleft()
+                activate()
+
+            for row in fresh_rows:
+                yield scope_name, row
+
 
 class CreateKey(_Cleos):
     """ Create a new keypair and print the public and private keys.
@@ -808,6 +1428,8 @@ class CreateKey(_Cleos):
     - **parameters**::
 
         key_name: Key name.
+        key_public, key_private: An existing keypair, for example made
+            with `keys.create_key()`. `cleos` is not called then.
         r1: Generate a key using the R1 curve (iPhone), instead of the 
             K1 curve (Bitcoin)
 
@@ -821,8 +1443,11 @@ class CreateKey(_Cleos):
             self, key_name, key_public="", key_private="", r1=False, is_verbose=1):
 
         if key_public:
+            self.json = {}
             self.json["publicKey"] = key_public            
             self.json["privateKey"] = key_private
+            self.key_public = key_public
+            self.key_private = key_private
             self._out = "Private key: {0}\nPublic key: {1}\n" \
                 .format(key_private,key_public)
         else:
@@ -951,6 +1576,8 @@ class CreateAccount(_Cleos):
             except:
                 permission_name = permission
             args.extend(["--permission", permission_name])
+        if expiration_sec != 30:
+            args.extend(["--expiration", str(expiration_sec)])
         if skip_signature:
             args.append("--skip-sign")
         if dont_broadcast:
@@ -1025,9 +1652,20 @@ class SetContract(_Cleos):
     - **attributes**::
 
         error: Whether any error ocurred.
-        json: The json representation of the object.
+        json: The transaction id and the receipt of the transaction, as in the
+            json of `PushAction`, without the code of the contract.
+        transaction: The transaction id.
+        status: The status of the transaction, like 'executed'.
+        cpu_usage_us: The billed CPU time.
+        net_usage_words: The billed NET usage.
         is_verbose: Verbosity at the construction time.    
+
+    The output of `cleos`, echoing the code of the contract, is spooled to a
+    temporary file if longer than `max_output_length`. The fields above are 
+    scanned from it, and `payload()` returns it in full.
     """
+    max_output_length = 1 << 16
+
     def __init__(
             self, account, contract_dir, 
             wast_file="", abi_file="", 
@@ -1049,7 +1687,7 @@ class SetContract(_Cleos):
              permission_name = permission
 
         import teos
-        config = teos.GetConfig(contract_dir, is_verbose=0)
+        config = teos.config(contract_dir)
         try:
             self.contract_path_absolute = config.json["contract-dir"]
             wast_file = config.json["contract-wast"]
@@ -1069,6 +1707,8 @@ class SetContract(_Cleos):
                 permission_name = permission
             args.extend(["--permission", permission_name])
 
+        if expiration_sec != 30:
+            args.extend(["--expiration", str(expiration_sec)])
         if skip_signature:
             args.append("--skip-sign")
         if dont_broadcast:
@@ -1090,14 +1730,147 @@ class SetContract(_Cleos):
             self, args, "set", "contract", is_verbose)
 
         if not self.error:
-            self.transaction = get_transaction_id(self)
+            import abi
+            abi.forget(self.account_name)
+            self._scan_receipt()
             self.printself()
 
+    _patterns = {
+        "transaction_id": re.compile(rb'"transaction_id"\s*:\s*"(\w*)"'),
+        "executed": re.compile(
+            rb"executed transaction: (\w+)\s+(\d+) bytes\s+(\d+) us"),
+        "status": re.compile(rb'"status"\s*:\s*"(\w+)"'),
+        "cpu_usage_us": re.compile(rb'"cpu_usage_us"\s*:\s*(\d+)'),
+        "net_usage_words": re.compile(rb'"net_usage_words"\s*:\s*(\d+)'),
+        }
+
+    def _scan(self, key):
+        # The standard output, and then the error output:
+        for text, spool in (
+                (self._out, self._out_file), (self.err_msg, self._err_file)):
+            if spool:
+                match = scan_file(spool, self._patterns[key])
+            else:
+                match = self._patterns[key].search(text.encode("utf-8"))
+            if match:
+                return [group.decode("utf-8") for group in match.groups()]
+        return None
+
+    def _scan_receipt(self):
+        self.transaction = ""
+        self.status = None
+        self.cpu_usage_us = None
+        self.net_usage_words = None
+
+        executed = self._scan("executed")
+        if executed: # the text output of `cleos`:
+            self.transaction = executed[0]
+            self.status = "executed"
+            self.net_usage_words = int(executed[1]) // 8
+            self.cpu_usage_us = int(executed[2])
+        else: # the json output, the transaction receipt goes first:
+            transaction_id = self._scan("transaction_id")
+            if transaction_id:
+                self.transaction = transaction_id[0]
+            status = self._scan("status")
+            if status:
+                self.status = status[0]
+            for key in ("cpu_usage_us", "net_usage_words"):
+                value = self._scan(key)
+                if value:
+                    setattr(self, key, int(value[0]))
+
+        self.json = {
+            "transaction_id": self.transaction,
+            "processed": {
+                "receipt": {
+                    "status": self.status,
+                    "cpu_usage_us": self.cpu_usage_us,
+                    "net_usage_words": self.net_usage_words
+                    }
+                }
+            }
+
+    def payload(self):
+        """ Return the full output of `cleos`, that is the transaction 
+        setting the contract, with its code. It is json in the json mode.
+        """
+        out = read_file(self._out_file) if self._out_file else self._out
+        if out.strip():
+            return out
+        return read_file(self._err_file) if self._err_file else self.err_msg
+
+    def get_transaction(self):
+        return GetTransaction(self.transaction)
+
+
+class _Receipt(_Cleos):
+    """ A prototype for the classes pushing transactions.
+    """
+    transaction = None
+
+    def set_receipt(self, compact=False):
+        """ Set the transaction id, and parse the output on demand. If 
+        `compact`, keep the transaction id, the receipt and the console 
+        outputs of the actions only.
+
+        With `profiler.start()`, the receipt is aggregated.
+        """
+        self.transaction = get_transaction_id(self)
+        self.defer_json(self._out)
+        if profiler.is_enabled():
+            profiler.record(self.json)
+        if compact:
+            json = self.json
+            processed = json.get("processed", {}) \
+                if isinstance(json, dict) else {}
+            self.json = {
+                "transaction_id": self.transaction,
+                "processed": {
+                    "receipt": processed.get("receipt", {}),
+                    "action_traces": [
+                        {"console": trace.get("console", "")} 
+                        for trace in processed.get("action_traces", [])]
+                    }
+                }
+            self._out = ""
+            self.err_msg = ""
+
+    def _receipt(self, key):
+        try:
+            return self.json["processed"]["receipt"][key]
+        except:
+            return None
+
+    @property
+    def status(self):
+        """ The status of the transaction, like 'executed'.
+        """
+        return self._receipt("status")
+
+    @property
+    def cpu_usage_us(self):
+        return self._receipt("cpu_usage_us")
+
+    @property
+    def net_usage_words(self):
+        return self._receipt("net_usage_words")
+
+    @property
+    def action_traces(self):
+        """ The list of the traces of the actions, in the order of the 
+        actions.
+        """
+        try:
+            return self.json["processed"]["action_traces"]
+        except:
+            return []
+
     def get_transaction(self):
         return GetTransaction(self.transaction)
 
 
-class PushAction(_Cleos):
+class PushAction(_Receipt):
     """ Push a transaction with a single action
 
     - **parameters**::
@@ -1126,11 +1899,21 @@ class PushAction(_Cleos):
             transaction (defaults to 0 which means no limit).
         ref_block: The reference block num or block id used for TAPOS 
             (Transaction as Proof-of-Stake).
+        compact: Keep the transaction id, the receipt and the console output
+            only, and release the output of `cleos`. It implies `json`.
+            So does `profiler.start()`.
 
     - **attributes**::
 
         error: Whether any error ocurred.
-        json: The json representation of the object.
+        json: The json representation of the object, parsed at the first 
+            access.
+        transaction: The transaction id.
+        status: The status of the transaction, like 'executed'.
+        cpu_usage_us: The billed CPU time.
+        net_usage_words: The billed NET usage.
+        console: The console output of the action.
+        data: The data of the action, if not `compact`.
         is_verbose: Verbosity at the construction time.
     """
     def __init__(
@@ -1140,7 +1923,8 @@ class PushAction(_Cleos):
             max_cpu_usage=0, max_net_usage=0,
             ref_block="",
             is_verbose=1,
-            json=False
+            json=False,
+            compact=False
         ):
         try:
             self.account_name = account.name
@@ -1148,7 +1932,7 @@ class PushAction(_Cleos):
             self.account_name = account
 
         args = [self.account_name, action, data]
-        if setup.is_json() or json:
+        if setup.is_json() or json or compact or profiler.is_enabled():
             args.append("--json")
 
         if permission:
@@ -1158,6 +1942,8 @@ class PushAction(_Cleos):
                 permission_name = permission
 
             args.extend(["--permission", permission_name])
+        if expiration_sec != 30:
+            args.extend(["--expiration", str(expiration_sec)])
         if skip_signature:
             args.append("--skip-sign")
         if dont_broadcast:
@@ -1171,20 +1957,153 @@ class PushAction(_Cleos):
         if  ref_block:
             args.extend(["--ref-block", ref_block])
                         
-        self.console = None
-        self.data = None
         _Cleos.__init__(self, args, "push", "action", is_verbose)
 
         if not self.error:
-            self.transaction = get_transaction_id(self)
-            try:
-                self.json = json_module.loads(self._out)
-                self.console = self.json["processed"]["action_traces"][0]["console"]
-                self.data = self.json["processed"]["action_traces"][0]["act"]["data"]
-            except:
-                pass
-
             self.printself()
+            self.set_receipt(compact)
 
-    def get_transaction(self):
-        return GetTransaction(self.transaction)
+    @property
+    def console(self):
+        try:
+            return self.action_traces[0]["console"]
+        except:
+            return None
+
+    @property
+    def data(self):
+        try:
+            return self.action_traces[0]["act"]["data"]
+        except:
+            return None
+
+
+def authorization(permission):
+    """ Translate a permission, given as an account object, an account name or
+    an 'account@permission' string, into the `authorization` field of an 
+    action.
+    """
+    try:
+        permission = permission.name
+    except:
+        pass
+    actor, _, level = permission.partition("@")
+    return [{"actor": actor, "permission": level if level else "active"}]
+
+
+class PushTransaction(_Receipt):
+    """ Push a transaction with many actions, possibly of many contracts.
+
+    - **parameters**::
+
+        actions: The list of actions. Each action is a dictionary having
+            the fields `account`, `name`, `authorization` and `data`, as 
+            the actions of a transaction in the JSON format. `data` may be
+            a dictionary, a JSON string, or a hex string of packed data,
+            see `abi.Abi.action()`.
+
+        expiration: The time in seconds before a transaction expires, 
+            defaults to 30s
+        skip_sign: Specify if unlocked wallet keys should be used to sign 
+            transaction.
+        dont_broadcast: Don't broadcast transaction to the network (just print).
+        forceUnique: Force the transaction to be unique. this will consume extra 
+            bandwidth and remove any protections against accidently issuing the 
+            same transaction multiple times.
+        max_cpu_usage: Upper limit on the milliseconds of cpu usage budget, for 
+            the execution of the transaction 
+            (defaults to 0 which means no limit).
+        max_net_usage: Upper limit on the net usage budget, in bytes, for the 
+            transaction (defaults to 0 which means no limit).
+        ref_block: The reference block num or block id used for TAPOS 
+            (Transaction as Proof-of-Stake).
+        compact: Keep the transaction id, the receipt and the console outputs
+            only, and release the output of `cleos`. The `actions` attribute
+            keeps the account and the name of the actions.
+
+    - **attributes**::
+
+        error: Whether any error ocurred.
+        json: The json representation of the object, parsed at the first 
+            access.
+        transaction: The transaction id.
+        status: The status of the transaction, like 'executed'.
+        cpu_usage_us: The billed CPU time.
+        net_usage_words: The billed NET usage.
+        action_traces: The list of the traces of the actions, in the order of
+            the actions.
+        consoles: The list of the console outputs of the actions.
+        is_verbose: Verbosity at the construction time.
+    """
+    # The limit of the length of a command line argument is 128kB in Linux:
+    max_arg_length = 100000
+
+    def __init__(
+            self, actions,
+            expiration_sec=30, 
+            skip_signature=0, dont_broadcast=0, forceUnique=0,
+            max_cpu_usage=0, max_net_usage=0,
+            ref_block="",
+            is_verbose=1,
+            compact=False
+        ):
+        self.actions = []
+        for action in actions:
+            action = dict(action)
+            if isinstance(action["data"], str) \
+                    and action["data"].lstrip()[:1] in ("{", "["):
+                action["data"] = codec.loads(action["data"])
+            self.actions.append(action)
+
+        transaction = codec.dumps({"actions": self.actions})
+        transaction_file = None
+        if len(transaction) > self.max_arg_length:
+            with tempfile.NamedTemporaryFile(
+                    "w", suffix=".json", delete=False) as out:
+                out.write(transaction)
+            counters.count("file_write")
+            transaction = transaction_file = out.name
+
+        args = [transaction, "--json"]
+        if expiration_sec != 30:
+            args.extend(["--expiration", str(expiration_sec)])
+        if skip_signature:
+            args.append("--skip-sign")
+        if dont_broadcast:
+            args.append("--dont-broadcast")
+        if forceUnique:
+            args.append("--force-unique")
+        if max_cpu_usage:
+            args.extend(["--max-cpu-usage-ms", str(max_cpu_usage)])
+        if  max_net_usage:
+            args.extend(["--max-net-usage", str(max_net_usage)])
+        if  ref_block:
+            args.extend(["--ref-block", str(ref_block)])
+
+        try:
+            _Cleos.__init__(self, args, "push", "transaction", is_verbose)
+        finally:
+            if transaction_file:
+                os.remove(transaction_file)
+
+        if not self.error:
+            self.printself()
+            self.set_receipt(compact)
+            if compact:
+                self.actions = [
+                    {"account": action["account"], "name": action["name"]}
+                    for action in self.actions]
+
+    @property
+    def consoles(self):
+        return [trace.get("console", "") for trace in self.action_traces]
+
+
+def __getattr__(name):
+    # `cleos.aio`, the asyncio front-end, imported at the first access, as it
+    # imports `cleos`:
+    if name == "aio":
+        import aio
+        return aio
+    raise AttributeError(
+        "module '{}' has no attribute '{}'".format(__name__, name))
@@ -114,6 +114,8 @@ class SystemNewaccount(cleos._Cleos):
                 permission_name = permission
 
             args.extend(["--permission", permission_name])
+        if expiration_sec != 30:
+            args.extend(["--expiration", str(expiration_sec)])
         if skip_signature:
             args.append("--skip-sign")
         if dont_broadcast:
@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+
+"""
+JSON codec of the responses and the requests.
+
+.. module:: codec
+    :platform: Unix, Windows
+    :synopsis: JSON codec of the responses and the requests.
+
+.. moduleauthor:: Tokenika
+
+The fastest importable backend is used, of `orjson`, `ujson` and the standard
+`json` module. If a fast backend rejects a document, the standard module is 
+tried::
+
+    block = codec.loads(get_block._out)
+    codec.set_backend("json")
+
+The backends give the same results: `orjson` reads an integer longer than 64
+bits as a float, and writes `NaN` and `Infinity` as `null`, hence such
+documents and objects are left to the standard module.
+"""
+
+import re
+import math
+import json as json_module
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+# A number of 19 digits or more, possibly an integer beyond 64 bits:
+_long_number = re.compile(r"\d{19}")
+_long_number_bytes = re.compile(rb"\d{19}")
+
+
+def _orjson_loads(text):
+    pattern = _long_number if isinstance(text, str) else _long_number_bytes
+    if pattern.search(text):
+        return json_module.loads(text)
+    return orjson.loads(text)
+
+
+def _is_finite(obj):
+    if isinstance(obj, float):
+        return math.isfinite(obj)
+    if isinstance(obj, dict):
+        return all(_is_finite(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return all(_is_finite(value) for value in obj)
+    return True
+
+
+def _orjson_dumps(obj):
+    text = orjson.dumps(obj)
+    if b"null" in text and not _is_finite(obj):
+        raise ValueError("Not finite numbers.")
+    return text.decode("utf-8")
+
+
+def _ujson_dumps(obj):
+    return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False)
+
+
+_backends = ["orjson", "ujson", "json"]
+
+backend = "json"
+_loads = json_module.loads
+_dumps = json_module.dumps
+
+
+def backends():
+    """ Return the list of the names of the backends importable, the fastest
+    first.
+    """
+    return [name for name in _backends if name == "json" or globals()[name]]
+
+
+def set_backend(name=None):
+    """ Set the backend, `orjson`, `ujson` or `json`. If `name` is `None`,
+    set the fastest importable backend. Return the name of the backend set.
+    """
+    global backend, _loads, _dumps
+    if name is None:
+        name = backends()[0]
+    if not name in backends():
+        raise ValueError("The JSON backend `{}` is not available.".format(name))
+
+    backend = name
+    if name == "orjson":
+        _loads, _dumps = _orjson_loads, _orjson_dumps
+    elif name == "ujson":
+        _loads, _dumps = ujson.loads, _ujson_dumps
+    else:
+        _loads, _dumps = json_module.loads, json_module.dumps
+    return backend
+
+
+def loads(text):
+    """ Parse a JSON text, raise `ValueError` if it is not valid.
+    """
+    try:
+        return _loads(text)
+    except ValueError:
+        if _loads is json_module.loads:
+            raise
+        return json_module.loads(text)
+
+
+def dumps(obj, **kwargs):
+    """ Serialize an object to a JSON text. With keyword arguments, like
+    `indent`, it is the `json.dumps()` of the standard module.
+    """
+    if not kwargs and not _dumps is json_module.dumps:
+        try:
+            return _dumps(obj)
+        except (TypeError, ValueError, OverflowError):
+            pass
+    return json_module.dumps(obj, **kwargs)
+
+
+set_backend()
@@ -0,0 +1,153 @@
+#!/usr/bin/python3
+
+"""
+Counters of the subprocesses, requests and file operations.
+
+.. module:: counters
+    :platform: Unix, Windows
+    :synopsis: Counters of the subprocesses, requests and file operations.
+
+.. moduleauthor:: Tokenika
+
+The counters count since the start of the process, in the process and in
+each thread::
+
+    print(counters.stats()["round_trip"])
+
+A `measure` context manager counts a block of code, and possibly asserts a
+budget for it::
+
+    with counters.measure("account", round_trip=6):
+        alice = eosf.account(account_master)
+
+The counts of a block include the operations of other threads at the same
+time, for example, of the workers of a `pipeline.TransactionPipeline`. A
+budget of a thread excludes them, and the operations the thread hands over
+to workers as well, like the transactions of a pipeline, or the key pairs
+made ahead by `keys.KeyPool`, so a budget of a thread does not catch the
+regressions there::
+
+    with counters.measure("account", this_thread=True, round_trip=6):
+        alice = eosf.account(account_master)
+"""
+
+import threading
+import collections
+
+
+# The kinds counted:
+KINDS = (
+    # processes started, `cleos`, `teos` or other:
+    "subprocess",
+    # HTTP requests sent with the in-process client, see `chain`:
+    "http",
+    # requests to the node or to a Wallet Manager, by HTTP, or the requests
+    # `cleos` sends for a command, like 5 for a transaction, see
+    # `cleos._round_trips()`:
+    "round_trip",
+    # `cleos` responses served from the chain cache, see `cache`:
+    "cache_hit",
+    "file_read",
+    "file_write"
+    )
+
+_lock = threading.Lock()
+_counts = collections.Counter()
+_local = threading.local()
+
+
+def _thread_counts():
+    try:
+        return _local.counts
+    except AttributeError:
+        _local.counts = collections.Counter()
+        return _local.counts
+
+
+def count(kind, number=1):
+    """ Add `number` to the counter of the kind, one of `KINDS`.
+    """
+    _thread_counts()[kind] += number
+    with _lock:
+        _counts[kind] += number
+
+
+def stats(this_thread=False):
+    """ Return the dictionary of the counters of all `KINDS`, in the process,
+    or, if `this_thread` is set, in the calling thread.
+    """
+    if this_thread:
+        counts = _thread_counts()
+        return {kind: counts[kind] for kind in KINDS}
+    with _lock:
+        return {kind: _counts[kind] for kind in KINDS}
+
+
+def reset():
+    """ Set the counters of the process, and of the calling thread, to zero.
+    """
+    _thread_counts().clear()
+    with _lock:
+        _counts.clear()
+
+
+class measure():
+    """ A context manager counting the operations of a block of code.
+
+    If limits are given, an `AssertionError` is raised at the end of the
+    block if any counter of the block exceeds its limit.
+
+    - **parameters**::
+
+        label: The name of the block, used in the report and in the error.
+        is_verbose: If set, the counts are printed at the end of the block.
+        this_thread: If set, only the operations of the calling thread are
+            counted.
+        budget: The limits, like `round_trip=2, subprocess=3`.
+
+    - **attributes**::
+
+        counts: The dictionary of the counts of the block, set at its end.
+        exceeded: The dictionary of the counts exceeding their limits.
+    """
+    def __init__(
+            self, label="", is_verbose=False, this_thread=False, **budget):
+        for kind in budget:
+            if not kind in KINDS:
+                raise ValueError("Unknown counter `{}`, known are: {}.".format(
+                    kind, ", ".join(KINDS)))
+        self.label = label
+        self.is_verbose = is_verbose
+        self.this_thread = this_thread
+        self.budget = budget
+        self.counts = {}
+        self.exceeded = {}
+        self._start = None
+
+
+    def __enter__(self):
+        self._start = stats(self.this_thread)
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end = stats(self.this_thread)
+        self.counts = {kind: end[kind] - self._start[kind] for kind in KINDS}
+        self.exceeded = {
+            kind: self.counts[kind] for kind, limit in self.budget.items()
+            if self.counts[kind] > limit}
+
+        if self.is_verbose:
+            print(self)
+        if self.exceeded and exc_type is None:
+            raise AssertionError("{} exceeds its budget: {}".format(
+                self.label or "The block", ", ".join(
+                    "{} {} > {}".format(kind, count, self.budget[kind])
+                    for kind, count in self.exceeded.items())))
+
+
+    def __str__(self):
+        return "{}: {}".format(
+            self.label or "counts", ", ".join(
+                "{} {}".format(kind, count)
+                for kind, count in self.counts.items() if count))
@@ -13,19 +13,29 @@ Python front-end for `EOSIO cleos`.
 
 import sys
 import os
+import stat
 import json
-import inspect
-import types
 import node
 import shutil
 import pprint
 import enum
+import collections
+import threading
+import tempfile
+import concurrent.futures
 from termcolor import cprint, colored
 
 import setup
+import codec
 import teos
 import cleos
 import cleos_system
+import keys
+import abi
+import pipeline
+import tracing
+import counters
+import profiler
 
 
 def reload():
@@ -51,6 +61,79 @@ def set_throw_error(status=False):
     global _is_throw_error
     _is_throw_error = status
 
+_is_implicit_naming = True
+def set_implicit_naming(status=True):
+    """ If set `True`, an account object without a registered name, see
+    `set_object_name()`, is named after the variable it is assigned to, in
+    the scope calling `Wallet.import_key()`, or in the scope above.
+    """
+    global _is_implicit_naming
+    _is_implicit_naming = status
+
+
+_wallet = None
+def set_wallet(wallet=None):
+    """ Set the active `Wallet` object. A `Wallet` object sets itself active
+    when it is created.
+    """
+    global _wallet
+    _wallet = wallet
+
+def active_wallet():
+    """ The active `Wallet` object, or `None`.
+    """
+    return _wallet
+
+
+def set_object_name(account_object, name):
+    """ Register the name of an account object, stored in the account map
+    by `Wallet.import_key()`.
+    """
+    account_object.object_name = name
+
+
+def object_name(account_object, depth=1):
+    """ Return the name of an account object, registered with
+    `set_object_name()`, or else, with the implicit naming, the name of the
+    variable referencing it in the scope `depth` frames above the function
+    calling `object_name()`, or in the scope above. Return `None` if not
+    found.
+    """
+    name = getattr(account_object, "object_name", None)
+    if name or not _is_implicit_naming:
+        return name
+
+    frame = _caller_frame(depth + 1)
+    for i in range(2):
+        if frame is None:
+            break
+        for name, value in list(frame.f_locals.items()):
+            if value is account_object:
+                return name
+        frame = _back(frame)
+    return None
+
+
+def _back(frame):
+    # the calling frame, not counting the wrappers of `tracing.traced()`:
+    frame = frame.f_back
+    while not frame is None and tracing.is_wrapper(frame):
+        frame = frame.f_back
+    return frame
+
+
+def _caller_frame(depth=1):
+    """ Return the frame `depth` frames above the function calling
+    `_caller_frame()`, not counting the wrappers of `tracing.traced()`, or
+    `None`.
+    """
+    frame = sys._getframe(1)
+    for i in range(depth):
+        if frame is None:
+            break
+        frame = _back(frame)
+    return frame
+
 
 def wallet_dir():
     if setup.is_use_keosd():
@@ -60,33 +143,96 @@ def wallet_dir():
     return wallet_dir_
 
 
-def account_map():
-    wallet_dir_ = wallet_dir()
-    try: # whether the setup map file exists:
-        with open(wallet_dir_ + setup.account_map, "r") as input:
-            account_map = json.load(input)
-    except:
-        account_map = {}
-    return account_map
+# The account maps read, keyed with their paths, as pairs of the file stamp
+# and the map:
+_account_maps = {}
+_account_maps_lock = threading.RLock()
 
 
-def clear_account_mapping(exclude=["account_master"]):
-    wallet_dir_ = wallet_dir()
-    account_map = {}
+def _file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
 
-    try: # whether the setup map file exists:
-        with open(wallet_dir_ + setup.account_map, "r") as input:
-            account_map = json.load(input)
-    except:
-        pass
+
+def account_map(wallet_dir_=None):
+    """ Return the map of account names to account object names, kept in
+    the file `setup.account_map` of the wallet directory.
+
+    The map is indexed in memory, and the file is parsed again only if it is
+    modified.
+    """
+    if wallet_dir_ is None:
+        wallet_dir_ = wallet_dir()
+    path = wallet_dir_ + setup.account_map
+    stamp = _file_stamp(path)
+    if stamp is None:
+        return {}
+
+    with _account_maps_lock:
+        entry = _account_maps.get(path)
+        if entry is None or entry[0] != stamp:
+            try:
+                with open(path, "r") as input:
+                    counters.count("file_read")
+                    entry = (stamp, codec.loads(input.read()))
+            except:
+                entry = (stamp, {})
+            _account_maps[path] = entry
+        return dict(entry[1])
+
+
+def _file_mode(path):
+    """ The permission bits of a file, or, if it does not exist, the bits
+    of a new file, as made with `open()`.
+    """
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def write_account_map(account_map_, wallet_dir_=None):
+    """ Replace the account map, see `account_map()`. The file is written to
+    a temporary file first, then renamed, hence it is never seen partial.
+    """
+    if wallet_dir_ is None:
+        wallet_dir_ = wallet_dir()
+    path = wallet_dir_ + setup.account_map
+    with _account_maps_lock:
+        with tempfile.NamedTemporaryFile(
+                "w", dir=os.path.dirname(path), prefix=".accounts",
+                delete=False) as out:
+            out.write(json.dumps(account_map_, sort_keys=True, indent=4))
+            counters.count("file_write")
+        # the temporary file is private, the map keeps its mode:
+        os.chmod(out.name, _file_mode(path))
+        os.replace(out.name, path)
+        _account_maps[path] = (_file_stamp(path), dict(account_map_))
+
+
+def update_account_map(entries, wallet_dir_=None):
+    """ Add entries to the account map, with one write of the file.
+    """
+    with _account_maps_lock:
+        account_map_ = account_map(wallet_dir_)
+        account_map_.update(entries)
+        write_account_map(account_map_, wallet_dir_)
+
+
+def clear_account_mapping(exclude=["account_master"]):
+    account_map_ = account_map()
         
     clear_map = {}
-    for account_name in account_map:
-        if account_map[account_name] in exclude:
-            clear_map[account_name] = account_map[account_name]
+    for account_name in account_map_:
+        if account_map_[account_name] in exclude:
+            clear_map[account_name] = account_map_[account_name]
         
-    with open(wallet_dir_ + setup.account_map, "w") as out:
-        out.write(json.dumps(clear_map, sort_keys=True, indent=4))
+    write_account_map(clear_map)
 
 
 def kill_keosd():
@@ -199,6 +345,7 @@ class Wallet(cleos.WalletCreate, _Eosf):
             try:
                 with open(self.wallet_dir_ + setup.password_map, "r") \
                         as input:    
+                    counters.count("file_read")
                     password_map = json.load(input)
                     password = password_map[name]
 
@@ -218,6 +365,8 @@ class Wallet(cleos.WalletCreate, _Eosf):
             """.format(cleos.node_is_running()))
 
         cleos.WalletCreate.__init__(self, name, password, is_verbose)
+        if not self.error:
+            set_wallet(self)
 
         self.DEBUG("""
             Name is `{}`
@@ -239,6 +388,7 @@ class Wallet(cleos.WalletCreate, _Eosf):
                 try:
                     with open(self.wallet_dir_ + setup.password_map, "r") \
                             as input:
+                        counters.count("file_read")
                         password_map = json.load(input)
                 except:
                     password_map = {}
@@ -247,6 +397,7 @@ class Wallet(cleos.WalletCreate, _Eosf):
                 with open(self.wallet_dir_ + setup.password_map, "w+") \
                         as out:
                     json.dump(password_map, out)
+                counters.count("file_write")
 
                 if not password: # new password
                     self.EOSF_TRACE("""
@@ -322,58 +473,26 @@ class Wallet(cleos.WalletCreate, _Eosf):
         return self.wallet_unlock
 
 
+    @tracing.traced("eosf.Wallet.import_key")
     def import_key(self, account_or_key):
         """ Imports private keys of an account into wallet.
         Returns list of `cleos.WalletImport` objects
-        """
-        # print("\ninspect.stack():\n")
-        # pprint.pprint(inspect.stack())
-        # print("\ninspect.stack()[1][0]:\n")
-        # pprint.pprint(inspect.stack()[1][0])
-        # print("\ninspect.stack()[1][0].f_locals:\n")
-        # pprint.pprint(inspect.stack()[1][0].f_locals)
-        # print("\ninspect.stack()[1][0].f_globals:\n")
-        # pprint.pprint(inspect.stack()[1][0].f_globals)
-
-        # print("\ninspect.stack()[2][0]:\n")
-        # pprint.pprint(inspect.stack()[2][0])
-        # print("\ninspect.stack()[2][0].f_locals:\n")
-        # pprint.pprint(inspect.stack()[2][0].f_locals)
-        # print("\ninspect.stack()[2][0].f_globals:\n")
-        # pprint.pprint(inspect.stack()[2][0].f_globals)
-            
-        lcls = dir()
-        try:
-            lcls = inspect.stack()[1][0].f_locals
-        except:
-            pass
-        try:
-            lcls.update(inspect.stack()[2][0].f_locals) 
-        except:
-            pass
 
+        The account is mapped to the name of its object, see `object_name()`.
+        """
         account_name = None
         try: # whether account_or_key is an account:
             account_name = account_or_key.name
         except:
             pass
         if not account_name is None:
-            for name in lcls:
-                if id(account_or_key) == id(lcls[name]):
-                    try: # whether the setup map file exists:
-                        with open(self.wallet_dir_ + setup.account_map, "r") \
-                            as input:
-                            account_map = json.load(input)
-                    except:
-                        account_map = {}
-
-                    if self.is_verbose > 0:
-                        print("'{}' ({}) >>> '{}'".format(
-                            name, account_name, self.wallet_dir_ + setup.account_map))
+            name = object_name(account_or_key)
+            if name:
+                if self.is_verbose > 0:
+                    print("'{}' ({}) >>> '{}'".format(
+                        name, account_name, self.wallet_dir_ + setup.account_map))
 
-                    account_map[account_name] = name
-                    with open(self.wallet_dir_ + setup.account_map, "w") as out:
-                        out.write(json.dumps(account_map, sort_keys=True, indent=4))
+                update_account_map({account_name: name}, self.wallet_dir_)
 
 
         imported_keys = []
@@ -394,6 +513,54 @@ class Wallet(cleos.WalletCreate, _Eosf):
         return imported_keys
 
 
+    @tracing.traced("eosf.Wallet.import_keys")
+    def import_keys(self, accounts_or_keys, object_names=None, workers=8):
+        """ Imports private keys of many accounts into wallet, concurrently.
+        Returns list of `cleos.WalletImport` objects
+
+        - **parameters**::
+
+            accounts_or_keys: An iterable of account objects, having the
+                attributes `owner_key` and `active_key`, of key objects,
+                having the attribute `key_private`, or of private keys.
+            object_names: A dictionary of account names to the names of
+                their account objects, added to the account map with one
+                write of the file.
+            workers: The number of keys imported concurrently.
+
+        The wallet API imports one key in a request, hence each key is a 
+        request, up to `workers` at a time. With 
+        `setup.set_native_transport()` and the node Wallet Manager, the 
+        requests are sent over kept-alive connections. Otherwise, a `cleos` 
+        process imports each key.
+        """
+        keys_private = []
+        for account_or_key in accounts_or_keys:
+            try: # whether account_or_key is an account:
+                for key in (account_or_key.owner_key, account_or_key.active_key):
+                    if key:
+                        keys_private.append(
+                            key.key_private if hasattr(key, "key_private")
+                                else key)
+            except AttributeError:
+                try:
+                    keys_private.append(account_or_key.key_private)
+                except AttributeError:
+                    keys_private.append(account_or_key)
+        keys_private = list(collections.OrderedDict.fromkeys(keys_private))
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="import_keys") \
+                as executor:
+            imported_keys = list(executor.map(tracing.bind(
+                lambda key: cleos.WalletImport(key, self.name, is_verbose=0)),
+                keys_private))
+
+        if object_names:
+            update_account_map(object_names, self.wallet_dir_)
+        return imported_keys
+
+
     def restore_accounts(self, namespace):
         account_names = set() # accounts in wallets
         keys = cleos.WalletKeys(is_verbose=0).json
@@ -408,21 +575,13 @@ class Wallet(cleos.WalletCreate, _Eosf):
 
         restored = dict()
         if len(account_names) > 0:
-            if setup.is_use_keosd():
-                wallet_dir_ = os.path.expandvars(teos.get_keosd_wallet_dir())
-            else:
-                wallet_dir_ = teos.get_node_wallet_dir()
-            try:
-                with open(wallet_dir_ + setup.account_map, "r") as input:    
-                    account_map = json.load(input)
-            except:
-                account_map = {}
+            account_map_ = account_map()
             
             object_names = set()
 
             for name in account_names:
                 try:
-                    object_name = account_map[name]
+                    object_name = account_map_[name]
                     if object_name in object_names:
                         object_name = object_name + "_" + name
                 except:
@@ -472,6 +631,149 @@ class Transaction():
         pass
 
 
+class PushTransaction(_Eosf):
+    """ Collect actions, possibly of many contracts, and push them in 
+    transactions.
+
+    - **parameters**::
+
+        account: The contract account of the actions, if not given with an
+            action. May be an object having the attribute `name`, or a string.
+        permission: The account authorizing the actions, if not given with an
+            action, as in 'account@permission'. Default is `account`.
+        max_actions: The maximal number of actions in a transaction. More 
+            actions are pushed with consecutive transactions.
+
+        expiration_sec, skip_signature, dont_broadcast, forceUnique, 
+            max_cpu_usage, max_net_usage, ref_block: See 
+            `cleos.PushTransaction`.
+        is_verbose: Verbosity of the pushes.
+        verbosity: The `Verbosity` list of the object.
+
+    - **attributes**::
+
+        actions: The list of the actions collected, and not pushed yet.
+        transactions: The list of the pushed `cleos.PushTransaction` objects.
+        error: Whether the last `push()` failed.
+
+    Usage::
+
+        transaction = contract.push_transaction()
+        for account_name in holders:
+            transaction.action(
+                "transfer", {"from": "alice", "to": account_name, 
+                "quantity": "1.0000 EOS", "memo": ""}, permission=alice)
+        transaction.push()
+    """
+    def __init__(
+            self, account="", permission="", max_actions=100,
+            expiration_sec=30,
+            skip_signature=0, dont_broadcast=0, forceUnique=0,
+            max_cpu_usage=0, max_net_usage=0,
+            ref_block="",
+            is_verbose=1,
+            verbosity=None):
+
+        is_verbose = self.verify_is_verbose(verbosity, is_verbose)
+        self.account = account
+        self.permission = permission
+        self.max_actions = max_actions
+        self.expiration_sec = expiration_sec
+        self.skip_signature = skip_signature
+        self.dont_broadcast = dont_broadcast
+        self.forceUnique = forceUnique
+        self.max_cpu_usage = max_cpu_usage
+        self.max_net_usage = max_net_usage
+        self.ref_block = ref_block
+        self.is_verbose = is_verbose
+
+        self.actions = []
+        self.transactions = []
+        self.error = False
+
+
+    def action(self, action, data, account="", permission=""):
+        """ Append an action. Return the `PushTransaction` object.
+        """
+        if not account:
+            account = self.account
+        try:
+            account_name = account.name
+        except:
+            account_name = account
+
+        if not permission:
+            permission = self.permission if self.permission else account_name
+
+        self.actions.append({
+            "account": account_name,
+            "name": action,
+            "authorization": cleos.authorization(permission),
+            "data": data
+            })
+        return self
+
+
+    def push(self):
+        """ Push the collected actions, `max_actions` in a transaction.
+        Return the list of the pushed `cleos.PushTransaction` objects.
+
+        If a transaction fails, the pushing stops, `error` is set, and the
+        actions of the failed transaction and of the following ones are kept
+        in `actions`, to be pushed again.
+        """
+        self.error = False
+        transactions = []
+        pushed = 0
+        for i in range(0, len(self.actions), self.max_actions):
+            transaction = cleos.PushTransaction(
+                self.actions[i : i + self.max_actions],
+                self.expiration_sec,
+                self.skip_signature, self.dont_broadcast, self.forceUnique,
+                self.max_cpu_usage, self.max_net_usage,
+                self.ref_block,
+                is_verbose=self.is_verbose)
+            transactions.append(transaction)
+
+            if transaction.error:
+                self.error = True
+                self.ERROR(
+                    transaction.err_msg
+                    + "\n{} of {} actions are not pushed, and are kept.".format(
+                        len(self.actions) - i, len(self.actions)))
+                break
+            pushed = i + self.max_actions
+
+        self.actions = self.actions[pushed:]
+        self.transactions.extend(transactions)
+        return transactions
+
+
+    def results(self):
+        """ Return the list of the results of the pushed actions, in the 
+        order of the actions. 
+        
+        Each result is a dictionary having the fields `transaction_id`,
+        `account`, `name`, `console` and `action_trace`.
+        """
+        results = []
+        for transaction in self.transactions:
+            for action, trace in zip(
+                    transaction.actions, transaction.action_traces):
+                results.append({
+                    "transaction_id": transaction.transaction,
+                    "account": action["account"],
+                    "name": action["name"],
+                    "console": trace["console"],
+                    "action_trace": trace
+                    })
+        return results
+
+
+    def __len__(self):
+        return len(self.actions)
+
+
 class ContractBuilder():
     def __init__(
             self, contract_dir,
@@ -551,6 +853,7 @@ class Contract():
         self.error = self.account.error
 
 
+    @tracing.traced("eosf.Contract.deploy")
     def deploy(self, permission="", is_verbose=1):
         self.contract = cleos.SetContract(
             self.account, self.contract_dir, 
@@ -562,13 +865,6 @@ class Contract():
             self.is_verbose > 0 and is_verbose > 0
         )
         if not self.contract.error:
-            try:
-                self.contract.json = json.loads(self.contract.err_msg)
-                for action in self.contract.json["actions"]:
-                    action["data"] = "contract code data, deleted for readability ..................."
-            except:
-                pass
-
             return self.contract
 
 
@@ -596,6 +892,7 @@ class Contract():
             self.is_mutable, self.is_verbose).build()
 
 
+    @tracing.traced("eosf.Contract.push_action")
     def push_action(
             self, action, data,
             permission="", expiration_sec=30,
@@ -617,6 +914,13 @@ class Contract():
         if output:
             is_verbose = 0
             json = True
+
+        # the accounts paying for RAM, likely, see `profiler`:
+        ram_accounts = []
+        if profiler.is_ram():
+            ram_accounts = list(collections.OrderedDict.fromkeys(
+                [self.account.name, permission.partition("@")[0]]))
+            ram_usage = _ram_usage(ram_accounts)
     
         self.action = cleos.PushAction(
             self.account.name, action, data,
@@ -626,10 +930,16 @@ class Contract():
             ref_block,
             self.is_verbose > 0 and is_verbose > 0, json)
 
+        if ram_accounts and not self.action.error and not ram_usage is None:
+            ram_usage_after = _ram_usage(ram_accounts)
+            if not ram_usage_after is None:
+                profiler.record_ram(
+                    self.account.name, action, ram_usage_after - ram_usage)
+
         if not self.action.error:
             try:
                 self._console = self.action.console
-                if self.is_verbose:
+                if self.is_verbose > 0:
                     print(self._console + "\n") 
             except:
                 pass
@@ -637,6 +947,23 @@ class Contract():
         return self.action
 
 
+    def push_transaction(
+            self, permission="", max_actions=100, expiration_sec=30,
+            skip_signature=0, dont_broadcast=0, forceUnique=0,
+            max_cpu_usage=0, max_net_usage=0,
+            ref_block="",
+            is_verbose=1):
+        """ Return a `PushTransaction` object collecting actions of the 
+        contract.
+        """
+        return PushTransaction(
+            self.account, permission, max_actions, expiration_sec,
+            skip_signature, dont_broadcast, forceUnique,
+            max_cpu_usage, max_net_usage,
+            ref_block,
+            self.is_verbose > 0 and is_verbose > 0)
+
+
     def show_action(self, action, data, permission=""):
         """ Implements the `push action` command without broadcasting. 
 
@@ -647,18 +974,31 @@ class Contract():
     def table(
             self, table_name, scope="",
             binary=False, 
-            limit=10, key="", lower="", upper=""):
+            limit=10, key="", lower="", upper="", decode=False):
         """ Return a contract's table object.
         """
         self._table = cleos.GetTable(
                     self.account.name, table_name, scope,
-                    binary=False, 
-                    limit=10, key="", lower="", upper="", 
-                    is_verbose=self.is_verbose)
+                    binary=binary, 
+                    limit=limit, key=key, lower=lower, upper=upper, 
+                    decode=decode, is_verbose=self.is_verbose)
 
         return self._table
 
 
+    def scan_table(
+            self, table_name, scopes, 
+            limit=100, key="", lower="", upper="", workers=8,
+            binary=False, decode=False):
+        """ Yield all the rows of a contract's table in the given scopes, as 
+        pairs of the scope name and the row. See `cleos.scan_table()`.
+        """
+        return cleos.scan_table(
+            self.account.name, table_name, scopes,
+            limit=limit, key=key, lower=lower, upper=upper, workers=workers,
+            binary=binary, decode=decode)
+
+
     def code(self, code="", abi="", wasm=False):
         return cleos.GetCode(
             self.account.name, code, abi, wasm, is_verbose=self.is_verbose)
@@ -695,6 +1035,18 @@ class Contract():
             return str(self.account)
 
 
+def _ram_usage(account_names):
+    """ Return the sum of the RAM used by the accounts, or `None` on error.
+    """
+    ram_usage = 0
+    for name in account_names:
+        get_account = cleos.GetAccount(name, is_verbose=-1)
+        if get_account.error:
+            return None
+        ram_usage += get_account.json.get("ram_usage", 0)
+    return ram_usage
+
+
 class AccountEosio():
 
     json = {}
@@ -707,7 +1059,7 @@ class AccountEosio():
 
         self.name = "eosio"
         self.json["name"] = self.name
-        config = teos.GetConfig(is_verbose=0)
+        config = teos.config()
 
         self.json["privateKey"] = config.json["EOSIO_KEY_PRIVATE"]
         self.json["publicKey"] = config.json["EOSIO_KEY_PUBLIC"]
@@ -751,6 +1103,7 @@ class AccountMaster(AccountEosio, _Eosf):
         else:
             return False
 
+    @tracing.traced("eosf.AccountMaster")
     def __init__(
             self, name="", owner_key_public="", active_key_public="", 
             is_verbose=1, verbosity=None):
@@ -803,8 +1156,10 @@ class AccountMaster(AccountEosio, _Eosf):
             else:
                 self.name = name
 
-            self.owner_key = cleos.CreateKey("owner", is_verbose=0)
-            self.active_key = cleos.CreateKey("active", is_verbose=0)
+            self.owner_key = cleos.CreateKey(
+                "owner", *keys.create_key(), is_verbose=0)
+            self.active_key = cleos.CreateKey(
+                "active", *keys.create_key(), is_verbose=0)
             self.OUT("""
                 Use the following data to register a new account on a public testnet:
                 Accout Name: {}
@@ -837,6 +1192,183 @@ class AccountMaster(AccountEosio, _Eosf):
     def __str__(self):
         return self.name
 
+class Account():
+    """ An account on the blockchain, with the methods operating it.
+
+    - **parameters**::
+
+        name: The name of the account.
+        owner_key: The owner key, a key object or a public key.
+        active_key: The active key, a key object or a public key.
+        is_verbose: Verbosity of the commands issued by the object.
+
+    - **attributes**::
+
+        name: The name of the account.
+        owner_key: The owner `keys.KeyPair`, or the public key, if given so.
+        active_key: The active `keys.KeyPair`, or the public key, if given so.
+        error: Whether the account failed to be created.
+        err_msg: The error message, if any.
+        transaction: The id of the transaction creating the account, if any.
+        json: The account json, as returned by `cleos get account`, fetched 
+            at the first access.
+
+    Account objects are made with `account()` and `account_object()`. They 
+    hold the names and the keys only, hence many may be kept in memory.
+    """
+    __slots__ = (
+        "name", "owner_key", "active_key", "is_verbose", "error", "err_msg",
+        "transaction", "object_name", "_console", "_json")
+
+    def __init__(
+            self, name, owner_key="", active_key="", is_verbose=1):
+        self.name = name
+        self.owner_key = _key_pair(owner_key)
+        self.active_key = _key_pair(active_key)
+        self.is_verbose = is_verbose
+        self.error = False
+        self.err_msg = ""
+        self.transaction = None
+        self.object_name = None
+        self._console = None
+        self._json = None
+
+
+    @classmethod
+    def from_command(cls, command, owner_key="", active_key=""):
+        """ Make an account object of a `cleos.CreateAccount`, 
+        `cleos_system.SystemNewaccount` or `cleos.RestoreAccount` object, 
+        keeping its error message on error only.
+        """
+        account_object = cls(
+            getattr(command, "name", ""), owner_key, active_key,
+            getattr(command, "is_verbose", 1))
+        account_object.error = command.error
+        if command.error:
+            account_object.err_msg = command.err_msg
+        account_object.transaction = getattr(command, "transaction", None)
+        return account_object
+
+
+    @property
+    def json(self):
+        if self._json is None:
+            account_ = cleos.GetAccount(self.name, is_verbose=0, json=True)
+            if account_.error:
+                return account_.json
+            self._json = account_.json
+        return self._json
+
+
+    def info(self):
+        return str(cleos.GetAccount(self.name, is_verbose=0))
+
+
+    def get_transaction(self):
+        return cleos.GetTransaction(self.transaction)
+
+
+    def code(self, code="", abi="", wasm=False):
+        return cleos.GetCode(
+            self, code, abi, wasm, is_verbose=self.is_verbose)
+
+
+    def set_contract(
+            self, contract_dir, 
+            wast_file="", abi_file="", 
+            permission="", expiration_sec=30, 
+            skip_signature=0, dont_broadcast=0, forceUnique=0,
+            max_cpu_usage=0, max_net_usage=0,
+            ref_block=""):
+
+        return cleos.SetContract(
+            self, contract_dir, 
+            wast_file, abi_file, 
+            permission, expiration_sec, 
+            skip_signature, dont_broadcast, forceUnique,
+            max_cpu_usage, max_net_usage,
+            ref_block,
+            is_verbose=self.is_verbose)
+
+
+    def push_action(
+            self, action, data,
+            permission="", expiration_sec=30, 
+            skip_signature=0, dont_broadcast=0, forceUnique=0,
+            max_cpu_usage=0, max_net_usage=0,
+            ref_block=""):
+        if not permission:
+            permission = self.name
+        else:
+            try: # permission is an account:
+                permission = permission.name
+            except: # permission is the name of an account:
+                permission = permission
+
+        action_ = cleos.PushAction(
+            self, action, data,
+            permission, expiration_sec, 
+            skip_signature, dont_broadcast, forceUnique,
+            max_cpu_usage, max_net_usage,
+            ref_block,
+            is_verbose=self.is_verbose)
+
+        if not action_.error:
+            try:
+                self._console = action_.console
+                if self.is_verbose > 0:
+                    print(self._console + "\n") 
+            except:
+                pass
+
+        return action_
+
+
+    def push_transaction(
+            self, permission="", max_actions=100, expiration_sec=30,
+            skip_signature=0, dont_broadcast=0, forceUnique=0,
+            max_cpu_usage=0, max_net_usage=0,
+            ref_block=""):
+
+        return PushTransaction(
+            self, permission, max_actions, expiration_sec,
+            skip_signature, dont_broadcast, forceUnique,
+            max_cpu_usage, max_net_usage,
+            ref_block,
+            is_verbose=self.is_verbose)
+
+
+    def table(
+            self, table_name, scope="", 
+            binary=False, 
+            limit=10, key="", lower="", upper=""):
+
+        return cleos.GetTable(
+            self, table_name, scope,
+            binary, 
+            limit, key, lower, upper,
+            is_verbose=self.is_verbose)
+
+
+    def console(self):
+        return self._console
+
+
+    def __str__(self):
+        return self.name
+
+
+def _key_pair(key):
+    # A key object, like `cleos.CreateKey`, is reduced to a `keys.KeyPair`:
+    if isinstance(key, keys.KeyPair):
+        return key
+    try:
+        return keys.KeyPair(key.key_public, key.key_private)
+    except AttributeError:
+        return key
+
+
+@tracing.traced("eosf.account_object")
 def account_object(
         account_object_name,
         creator="", 
@@ -857,32 +1389,13 @@ def account_object(
     self = _Eosf()
     is_verbose = self.verify_is_verbose(verbosity, is_verbose)
 
-    objects = None    
-    context_locals = inspect.stack()[1][0].f_locals
-    context_globals = inspect.stack()[1][0].f_globals
-    objects = {**context_globals, **context_locals}
-
-    wallet = None
-    wallets = []
-    for name in objects:
-        if isinstance(objects[name], Wallet):
-            wallets.append(name)
-            wallet = objects[name]
-
-    error = False
-
-    if len(wallets) == 0:
+    wallet = active_wallet()
+    if wallet is None:
         self.ERROR("""
             Cannot find any `Wallet` object.
             Add the definition of an `Wallet` object, for example:
             `wallet = eosf.Wallet()`
             """)
-    if len(wallets) > 1:
-        self.ERROR("""
-            Too many `Wallet` objects.
-            Can be precisely one wallet object in the scope, but there is many: 
-            {}
-            """.format(wallets))
 
     account_map_ = account_map()
     for name, acc_name in account_map_.items():
@@ -907,7 +1420,8 @@ def account_object(
                     ######### 
                     Create an account object named `{}`, for the blockchain account `{}`.
                     """.format(account_object_name, account_name))        
-        account_object = cleos.RestoreAccount(account_name, is_verbose)
+        account_object = Account.from_command(
+            cleos.RestoreAccount(account_name, is_verbose))
     else:
         if not account_name:
             account_name = cleos.account_name()
@@ -915,8 +1429,8 @@ def account_object(
             if not active_key:
                 active_key = owner_key
         else:
-            owner_key = cleos.CreateKey("owner", is_verbose=-1)
-            active_key = cleos.CreateKey("active", is_verbose=-1)
+            owner_key = keys.create_key()
+            active_key = keys.create_key()
 
         if not creator:
             creator = AccountMaster()
@@ -927,7 +1441,7 @@ def account_object(
                         Create an account object named `{}`, for a new, properly paid, blockchain account `{}`.
                         """.format(account_object_name, account_name))
 
-            account_object = cleos_system.SystemNewaccount(
+            command = cleos_system.SystemNewaccount(
                     creator, account_name, owner_key, active_key,
                     stake_net, stake_cpu,
                     permission,
@@ -944,7 +1458,7 @@ def account_object(
                         ######### 
                         Create an account object named `{}' for a new local testnet account `{}`.
                         """.format(account_object_name, account_name))            
-            account_object = cleos.CreateAccount(
+            command = cleos.CreateAccount(
                     creator, account_name, 
                     owner_key, active_key,
                     permission,
@@ -954,105 +1468,17 @@ def account_object(
                     is_verbose=is_verbose
                     )
 
+        account_object = Account.from_command(
+            command, owner_key, active_key)
         if account_object.error:
             self.ERROR(account_object.err_msg)
         else:
             self.EOSF("""The account object created.""")
 
-        account_object.owner_key = owner_key
-        account_object.active_key = active_key
-
-    # append account methodes to the account_object:
-
-    def code(self, code="", abi="", wasm=False):
-        return cleos.GetCode(
-            account_object, code, abi, 
-            is_verbose=account_object.is_verbose)
-
-    account_object.code = types.MethodType(code, account_object)
-
-    def set_contract(
-            self, contract_dir, 
-            wast_file="", abi_file="", 
-            permission="", expiration_sec=30, 
-            skip_signature=0, dont_broadcast=0, forceUnique=0,
-            max_cpu_usage=0, max_net_usage=0,
-            ref_block=""):
-
-        account_object.set_contract = cleos.SetContract(
-            account_object, contract_dir, 
-            wast_file, abi_file, 
-            permission, expiration_sec, 
-            skip_signature, dont_broadcast, forceUnique,
-            max_cpu_usage, max_net_usage,
-            ref_block,
-            is_verbose=account_object.is_verbose
-        )
-
-        return account_object.set_contract
-
-    account_object.set_contract = types.MethodType(
-                                    set_contract , account_object)
-
-    def push_action(
-            self, action, data,
-            permission="", expiration_sec=30, 
-            skip_signature=0, dont_broadcast=0, forceUnique=0,
-            max_cpu_usage=0, max_net_usage=0,
-            ref_block=""):
-        if not permission:
-            permission = account_object.name
-        else:
-            try: # permission is an account:
-                permission = permission.name
-            except: # permission is the name of an account:
-                permission = permission
-
-        account_object.action = cleos.PushAction(
-            account_object, action, data,
-            permission, expiration_sec, 
-            skip_signature, dont_broadcast, forceUnique,
-            max_cpu_usage, max_net_usage,
-            ref_block,
-            is_verbose=account_object.is_verbose)
-
-        if not account_object.action.error:
-            try:
-                account_object._console = account_object.action.console
-                if account_object.is_verbose > 0:
-                    print(account_object._console + "\n") 
-            except:
-                pass
-
-        return account_object.action
-
-    account_object.push_action = types.MethodType(
-                                    push_action , account_object)
-
-    def table(
-            self, table_name, scope="", 
-            binary=False, 
-            limit=10, key="", lower="", upper=""):
-
-        account_object._table = cleos.GetTable(
-                                account_object, table_name, scope,
-                                binary, 
-                                limit, key, lower, upper,
-                                is_verbose=account_object.is_verbose)
-        return account_object._table
-
-    account_object.table = types.MethodType(
-                                    table, account_object)
-
-    def __str__(self):
-        return account_object.name
-
-    account_object.__str__ = types.MethodType(
-                                        __str__, account_object)
-
     # export the account object to the globals in the calling module:
 
-    context_globals[account_object_name] = account_object
+    _caller_frame().f_globals[account_object_name] = account_object
+    set_object_name(account_object, account_object_name)
 
     # put the account object to the wallet:
 
@@ -1064,6 +1490,7 @@ def account_object(
     return account_object
 
 
+@tracing.traced("eosf.account")
 def account(
         creator, name="",
         owner_key="", active_key="",
@@ -1078,141 +1505,244 @@ def account(
         is_verbose=1,
         restore=False):
 
-    account_object = None
     if restore:
         if creator:
             name = creator
-        account_object = cleos.RestoreAccount(name, is_verbose)
+        return Account.from_command(cleos.RestoreAccount(name, is_verbose))
+
+    if not name:
+        name = cleos.account_name()
+
+    if owner_key:
+        if not active_key:
+            active_key = owner_key
+    else:
+        owner_key = keys.create_key()
+        active_key = keys.create_key()
+
+    if stake_net:
+        command = cleos_system.SystemNewaccount(
+                creator, name, owner_key, active_key,
+                stake_net, stake_cpu,
+                permission,
+                buy_ram_kbytes, buy_ram,
+                transfer,
+                expiration_sec,
+                skip_signature, dont_broadcast, forceUnique,
+                max_cpu_usage, max_net_usage,
+                ref_block,
+                is_verbose
+                )
     else:
+        command = cleos.CreateAccount(
+                creator, name, 
+                owner_key, active_key,
+                permission,
+                expiration_sec, skip_signature, dont_broadcast, forceUnique,
+                max_cpu_usage, max_net_usage,
+                ref_block,
+                is_verbose=is_verbose
+                )
 
-        if not name:
-            name = cleos.account_name()
+    return Account.from_command(command, owner_key, active_key)
 
-        if owner_key:
-            if not active_key:
-                active_key = owner_key
-        else:
-            owner_key = cleos.CreateKey("owner", is_verbose=-1)
-            active_key = cleos.CreateKey("active", is_verbose=-1)
 
-        if stake_net:
-            account_object = cleos_system.SystemNewaccount(
-                    creator, name, owner_key, active_key,
-                    stake_net, stake_cpu,
-                    permission,
-                    buy_ram_kbytes, buy_ram,
-                    transfer,
-                    expiration_sec,
-                    skip_signature, dont_broadcast, forceUnique,
-                    max_cpu_usage, max_net_usage,
-                    ref_block,
-                    is_verbose
-                    )
-        else:
-            account_object = cleos.CreateAccount(
-                    creator, name, 
-                    owner_key, active_key,
-                    permission,
-                    expiration_sec, skip_signature, dont_broadcast, forceUnique,
-                    max_cpu_usage, max_net_usage,
-                    ref_block,
-                    is_verbose=is_verbose
-                    )
+class AccountTable(_Eosf):
+    """ The accounts made with `create_accounts()`, in columns.
 
-        account_object.owner_key = owner_key
-        account_object.active_key = active_key
+    - **attributes**::
 
+        names: The list of the account names.
+        owner_keys: The list of the owner `keys.KeyPair` objects.
+        active_keys: The list of the active `keys.KeyPair` objects.
+        failed: The set of the names of the accounts not created.
+        transactions: The list of the pushed `cleos.PushTransaction` objects.
+        error: Whether any error ocurred.
 
-    def code(self, code="", abi="", wasm=False):
-        return cleos.GetCode(
-            account_object, code, abi, 
-            is_verbose=account_object.is_verbose)
+    Rows are `AccountTable.Row` tuples of the name and the keys::
 
-    account_object.code = types.MethodType(
-        code, account_object)
+        for name, owner_key, active_key in table:
+            print(name, active_key.key_public)
+    """
+    Row = collections.namedtuple("Row", ["name", "owner_key", "active_key"])
 
-    def set_contract(
-            self, contract_dir, 
-            wast_file="", abi_file="", 
-            permission="", expiration_sec=30, 
-            skip_signature=0, dont_broadcast=0, forceUnique=0,
-            max_cpu_usage=0, max_net_usage=0,
-            ref_block=""):
+    def __init__(
+            self, names, owner_keys, active_keys, is_verbose=1,
+            verbosity=None):
+        self.is_verbose = self.verify_is_verbose(verbosity, is_verbose)
+        self.names = names
+        self.owner_keys = owner_keys
+        self.active_keys = active_keys
+        self.failed = set()
+        self.transactions = []
+        self.error = False
+
+
+    def created(self):
+        """ Return the list of the names of the accounts created.
+        """
+        return [name for name in self.names if not name in self.failed]
 
-        account_object.set_contract = cleos.SetContract(
-            account_object, contract_dir,
-            wast_file, abi_file,
-            permission, expiration_sec,
-            skip_signature, dont_broadcast, forceUnique,
-            max_cpu_usage, max_net_usage,
-            ref_block,
-            is_verbose=account_object.is_verbose
-        )
 
-        return account_object.set_contract
+    def __len__(self):
+        return len(self.names)
 
-    account_object.set_contract = types.MethodType(
-        set_contract , account_object)
 
-    def push_action(
-            self, action, data,
-            permission="", expiration_sec=30, 
-            skip_signature=0, dont_broadcast=0, forceUnique=0,
-            max_cpu_usage=0, max_net_usage=0,
-            ref_block=""):
-        if not permission:
-            permission = account_object.name
-        else:
-            try: # permission is an account:
-                permission = permission.name
-            except: # permission is the name of an account:
-                permission = permission
+    def __getitem__(self, index):
+        return self.Row(
+            self.names[index], self.owner_keys[index],
+            self.active_keys[index])
 
-        account_object.action = cleos.PushAction(
-            account_object, action, data,
-            permission, expiration_sec, 
-            skip_signature, dont_broadcast, forceUnique,
-            max_cpu_usage, max_net_usage,
-            ref_block,
-            is_verbose=account_object.is_verbose)
 
-        if not account_object.action.error:
-            try:
-                account_object._console = account_object.action.console
-                if account_object.is_verbose > 0:
-                    print(account_object._console + "\n")
-            except:
-                pass
+    def __iter__(self):
+        return map(self.Row, self.names, self.owner_keys, self.active_keys)
 
-        return account_object.action
 
-    account_object.push_action = types.MethodType(
-        push_action , account_object)
+    def account(self, index):
+        """ Return the `Account` object of a row.
+        """
+        account_object = Account(
+            self.names[index], self.owner_keys[index],
+            self.active_keys[index], self.is_verbose)
+        if self.names[index] in self.failed:
+            account_object.error = True
+        return account_object
 
-    def table(
-            self, table_name, scope="", 
-            binary=False, 
-            limit=10, key="", lower="", upper=""):
 
-        account_object._table = cleos.GetTable(
-                                account_object, table_name, scope,
-                                binary, 
-                                limit, key, lower, upper,
-                                is_verbose=account_object.is_verbose)
-        return account_object._table
+@tracing.traced("eosf.create_accounts")
+def create_accounts(
+        creator, count,
+        stake_net="", stake_cpu="",
+        buy_ram_kbytes=0, buy_ram="",
+        transfer=False,
+        permission="",
+        wallet=None,
+        accounts_per_transaction=40,
+        window=8,
+        expiration_sec=30,
+        is_verbose=1):
+    """ Create many accounts with random names, in batched transactions.
 
-    account_object.table = types.MethodType(
-        table, account_object)
+    - **parameters**::
 
-    def __str__(self):
-        return account_object.name
+        creator: The account creating the new accounts, and paying for them.
+            May be an object having the attribute `name`, or a string.
+        count: The number of the new accounts.
+        stake_net, stake_cpu, buy_ram_kbytes, buy_ram, transfer: See
+            `cleos_system.SystemNewaccount`. If not set, the accounts are
+            created as with `cleos.CreateAccount`.
+        permission: An account and permission level to authorize, as in
+            'account@permission'. Default is `creator`.
+        wallet: A `Wallet` object, to import the private keys of the new
+            accounts into.
+        accounts_per_transaction: The number of accounts created in a
+            transaction.
+        window: The maximal number of transactions in flight, see
+            `pipeline.TransactionPipeline`.
+        expiration_sec: The time in seconds before a transaction expires.
+
+    Returns `AccountTable` object.
+
+    The `newaccount`, `buyrambytes`, `buyram` and `delegatebw` actions are
+    packed with `abi.system_abi`, hence `cleos` does not look up the ABI of
+    `eosio`. The keys are made with `keys.create_keys()`.
+    """
+    try:
+        creator_name = creator.name
+    except:
+        creator_name = creator
+    if not permission:
+        permission = creator_name
+
+    names = set()
+    while len(names) < count:
+        names.add(cleos.account_name())
+    names = list(names)
+    key_pairs = keys.create_keys(2 * count)
+    table = AccountTable(
+        names, key_pairs[:count], key_pairs[count:], is_verbose)
+
+    if stake_net or stake_cpu:
+        zero = abi.pair_to_asset(
+            0, abi.asset_to_pair(stake_net if stake_net else stake_cpu)[1])
+        stake_net = stake_net if stake_net else zero
+        stake_cpu = stake_cpu if stake_cpu else zero
+
+    def actions(index):
+        name = names[index]
+        yield abi.system_abi.action("eosio", "newaccount", {
+            "creator": creator_name, "name": name,
+            "owner": abi.authority(table.owner_keys[index].key_public),
+            "active": abi.authority(table.active_keys[index].key_public)
+            }, permission)
+        if buy_ram_kbytes:
+            yield abi.system_abi.action("eosio", "buyrambytes", {
+                "payer": creator_name, "receiver": name,
+                "bytes": buy_ram_kbytes * 1024
+                }, permission)
+        if buy_ram:
+            yield abi.system_abi.action("eosio", "buyram", {
+                "payer": creator_name, "receiver": name, "quant": buy_ram
+                }, permission)
+        if stake_net:
+            yield abi.system_abi.action("eosio", "delegatebw", {
+                "from": creator_name, "receiver": name,
+                "stake_net_quantity": stake_net,
+                "stake_cpu_quantity": stake_cpu,
+                "transfer": transfer
+                }, permission)
+
+    table.EOSF_TRACE("""
+        ######### 
+        Create {} accounts, {} in a transaction.
+        """.format(count, accounts_per_transaction))
+
+    batches = []
+    with pipeline.TransactionPipeline(
+            window=window, keep_receipts=False, expiration_sec=expiration_sec,
+            compact=True) as pipe:
+        for start in range(0, count, accounts_per_transaction):
+            indexes = range(
+                start, min(start + accounts_per_transaction, count))
+            batches.append((indexes, pipe.push_transaction(
+                [action for index in indexes for action in actions(index)])))
+
+    for indexes, future in batches:
+        try:
+            transaction = future.result()
+        except Exception as e:
+            transaction = pipeline.FailedReceipt("Error: {}".format(e))
+        table.transactions.append(transaction)
+        if transaction.error:
+            table.error = True
+            table.failed.update([names[index] for index in indexes])
+            table.ERROR(transaction.err_msg)
+
+    if wallet:
+        for wallet_import in wallet.import_keys(
+                [row for row in table if not row.name in table.failed]):
+            if wallet_import.error:
+                table.error = True
+                table.ERROR(wallet_import.err_msg)
+                break
+
+    table.EOSF("""{} accounts created.""".format(len(table.created())))
+    return table
+
+
+def stats(this_thread=False):
+    """ Return the counters of the subprocesses, HTTP requests, requests to
+    the node, cache hits, file reads and file writes, see `counters`.
+    """
+    return counters.stats(this_thread)
 
-    account_object.__str__ = types.MethodType(
-        __str__, account_object)
 
-    return account_object
+# Counts a block of code, and asserts its budget, for example:
+# `with eosf.measure("account", round_trip=6): eosf.account(account_master)`
+measure = counters.measure
 
 
+@tracing.traced("eosf.reset")
 def reset(is_verbose=1):
     return node.reset(is_verbose)
 
@@ -1226,6 +1756,10 @@ def stop(is_verbose=1):
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        import bench
+        sys.exit(bench.main(sys.argv[2:]))
+
     template = ""
     if len(sys.argv) > 2:
         template = str(sys.argv[2])
@@ -0,0 +1,355 @@
+#!/usr/bin/python3
+
+"""
+In-process generator of EOSIO key pairs.
+
+.. module:: keys
+    :platform: Unix, Windows
+    :synopsis: In-process generator of EOSIO key pairs.
+
+.. moduleauthor:: Tokenika
+
+Key pairs are made without a `cleos create key` process, for the K1 curve
+(Bitcoin), and for the R1 curve (iPhone). A background thread keeps a pool of
+pairs ready, hence `create_key()` is a queue look-up::
+
+    owner_key = cleos.CreateKey("owner", *keys.create_key())
+    pairs = keys.create_keys(5000)
+
+Private keys are drawn with `secrets`. The public key is computed with
+`coincurve` (K1) or `ecdsa` (K1 and R1), if importable. Else, new pairs are
+made with `cleos create key`, one at a request, without the pool.
+
+The module has its own implementation of the curves, computing the public key
+with a table of multiples of the generator point. It is fast, but not 
+constant-time, hence it is used only if set with `set_builtin_curves()`, for
+throwaway keys of a local node.
+"""
+
+import queue
+import hashlib
+import secrets
+import threading
+import collections
+import abi
+
+try:
+    import coincurve
+except ImportError:
+    coincurve = None
+
+try:
+    import ecdsa
+except ImportError:
+    ecdsa = None
+
+
+KeyPair = collections.namedtuple("KeyPair", ["key_public", "key_private"])
+KeyPair.__doc__ = """ A key pair, as strings in the `cleos` format. """
+
+
+class _Curve:
+    """ A short Weierstrass curve `y^2 = x^3 + a x + b` over a prime field.
+    """
+    def __init__(self, p, a, b, n, gx, gy):
+        self.p = p
+        self.a = a
+        self.b = b
+        self.n = n
+        self.g = (gx, gy)
+        self._table = None
+        self._lock = threading.Lock()
+
+
+    def _double(self, point):
+        # Jacobian coordinates:
+        x, y, z = point
+        p = self.p
+        if not y:
+            return (0, 1, 0)
+        yy = y * y % p
+        s = 4 * x * yy % p
+        m = (3 * x * x + self.a * pow(z, 4, p)) % p
+        x3 = (m * m - 2 * s) % p
+        return (x3, (m * (s - x3) - 8 * yy * yy) % p, 2 * y * z % p)
+
+
+    def _add(self, point, affine):
+        # A Jacobian point plus an affine point:
+        x1, y1, z1 = point
+        if not z1:
+            return (affine[0], affine[1], 1)
+        p = self.p
+        x2, y2 = affine
+        zz = z1 * z1 % p
+        u2 = x2 * zz % p
+        s2 = y2 * zz * z1 % p
+        h = (u2 - x1) % p
+        r = (s2 - y1) % p
+        if not h:
+            if not r:
+                return self._double(point)
+            return (0, 1, 0)
+        hh = h * h % p
+        hhh = h * hh % p
+        v = x1 * hh % p
+        x3 = (r * r - hhh - 2 * v) % p
+        return (x3, (r * (v - x3) - y1 * hhh) % p, z1 * h % p)
+
+
+    def _affine(self, point):
+        x, y, z = point
+        z_inv = pow(z, self.p - 2, self.p) # Fermat, the field is prime
+        zz_inv = z_inv * z_inv % self.p
+        return (x * zz_inv % self.p, y * zz_inv * z_inv % self.p)
+
+
+    def table(self):
+        """ The multiples `j * 256^i * G`, for the bytes of a scalar.
+        """
+        with self._lock:
+            if self._table is None:
+                table = []
+                base = self.g
+                for i in range(32):
+                    row = [None]
+                    point = (0, 1, 0)
+                    for j in range(1, 256):
+                        point = self._add(point, base)
+                        row.append(self._affine(point))
+                    table.append(row)
+                    base = self._affine(self._add(point, base))
+                self._table = table
+            return self._table
+
+
+    def multiply_g(self, scalar):
+        """ The affine point `scalar * G`.
+        """
+        table = self.table()
+        point = (0, 1, 0)
+        for i, byte in enumerate(scalar.to_bytes(32, "little")):
+            if byte:
+                point = self._add(point, table[i][byte])
+        return self._affine(point)
+
+
+K1 = _Curve(
+    p=0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F,
+    a=0,
+    b=7,
+    n=0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141,
+    gx=0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+    gy=0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8)
+""" The secp256k1 curve. """
+
+R1 = _Curve(
+    p=0xFFFFFFFF00000001000000000000000000000000FFFFFFFFFFFFFFFFFFFFFFFF,
+    a=0xFFFFFFFF00000001000000000000000000000000FFFFFFFFFFFFFFFFFFFFFFFC,
+    b=0x5AC635D8AA3A93E7B3EBBD55769886BC651D06B0CC53B0F63BCE3C3E27D2604B,
+    n=0xFFFFFFFF00000000FFFFFFFFFFFFFFFFBCE6FAADA7179E84F3B9CAC2FC632551,
+    gx=0x6B17D1F2E12C4247F8BCE6E563A440F277037D812DEB33A0F4A13945D898C296,
+    gy=0x4FE342E2FE1A7F9B8EE7EB4A7C0F9E162BCE33576B315ECECBB6406837BF51F5)
+""" The secp256r1 (NIST P-256) curve. """
+
+
+_is_builtin_curves = False
+
+def set_builtin_curves(status=True):
+    """ If set `True`, the public keys are computed with the curves of the
+    module, if no vetted library is importable. The computation is not 
+    constant-time: use it only for throwaway keys of a local node.
+    """
+    global _is_builtin_curves
+    _is_builtin_curves = status
+
+
+def is_vetted(r1=False):
+    """ Whether a vetted library computes the public keys of the curve.
+    """
+    if r1:
+        return not ecdsa is None
+    return not coincurve is None or not ecdsa is None
+
+
+def _is_in_process(r1=False):
+    return _is_builtin_curves or is_vetted(r1)
+
+
+def _public_key(curve, secret):
+    # The compressed public key, as bytes:
+    data = secret.to_bytes(32, "big")
+    if curve is K1 and coincurve:
+        return coincurve.PrivateKey(data).public_key.format(compressed=True)
+    if ecdsa:
+        return ecdsa.SigningKey.from_string(
+            data, curve=ecdsa.SECP256k1 if curve is K1 else ecdsa.NIST256p
+            ).get_verifying_key().to_string("compressed")
+    if not _is_builtin_curves:
+        raise abi.AbiError(
+            "Cannot compute a public key: install `coincurve` or `ecdsa`, or, "
+            "for throwaway keys of a local node, see `set_builtin_curves()`.")
+    x, y = curve.multiply_g(secret)
+    return bytes([2 + (y & 1)]) + x.to_bytes(32, "big")
+
+
+def _private_key_wif(secret):
+    data = b"\x80" + secret.to_bytes(32, "big")
+    checksum = hashlib.sha256(hashlib.sha256(data).digest()).digest()[:4]
+    return abi.base58_encode(data + checksum)
+
+
+def _private_key_r1(secret):
+    data = secret.to_bytes(32, "big")
+    return "PVT_R1_" + abi.base58_encode(
+        data + abi.ripemd160(data + b"R1")[:4])
+
+
+def key_pair(secret, r1=False):
+    """ Return the `KeyPair` of a private key given as an integer.
+    """
+    if r1:
+        return KeyPair(
+            abi._encode_key(1, _public_key(R1, secret), "PUB_"),
+            _private_key_r1(secret))
+    return KeyPair(
+        abi._encode_key(0, _public_key(K1, secret), "PUB_"),
+        _private_key_wif(secret))
+
+
+def from_private(key_private):
+    """ Return the `KeyPair` of a private key string, in the WIF format of
+    the K1 keys, or in the `PVT_R1_` format.
+    """
+    if key_private.startswith("PVT_R1_"):
+        data = abi.base58_decode(key_private[7:])
+        if abi.ripemd160(data[:-4] + b"R1")[:4] != data[-4:]:
+            raise abi.AbiError("Invalid key checksum.")
+        return key_pair(int.from_bytes(data[:-4], "big"), r1=True)
+
+    data = abi.base58_decode(key_private)
+    checksum = hashlib.sha256(hashlib.sha256(data[:-4]).digest()).digest()[:4]
+    if data[0] != 0x80 or checksum != data[-4:]:
+        raise abi.AbiError("Invalid key checksum.")
+    return key_pair(int.from_bytes(data[1:33], "big"))
+
+
+def generate(r1=False):
+    """ Make a new `KeyPair`, with `cleos create key` if the public key
+    cannot be computed in process, see `set_builtin_curves()`.
+    """
+    if not _is_in_process(r1):
+        import cleos
+        create_key = cleos.CreateKey("", r1=r1, is_verbose=-1)
+        if create_key.error:
+            raise abi.AbiError(create_key.err_msg)
+        return KeyPair(create_key.key_public, create_key.key_private)
+
+    curve = R1 if r1 else K1
+    return key_pair(secrets.randbelow(curve.n - 1) + 1, r1)
+
+
+class KeyPool:
+    """ A pool of new key pairs, refilled by a background thread.
+
+    - **parameters**::
+
+        size: The number of pairs kept ready.
+        r1: Make R1 keys, instead of K1 keys.
+
+    The thread starts at the first request, and runs until `stop()`. If the
+    pairs are made with `cleos create key`, see `generate()`, there is no
+    thread: each request makes its pair.
+    """
+    def __init__(self, size=256, r1=False):
+        self.size = size
+        self.r1 = r1
+        self._pairs = queue.Queue(maxsize=size)
+        self._thread = None
+        self._is_stopped = threading.Event()
+        self._lock = threading.Lock()
+
+
+    def _fill(self):
+        while not self._is_stopped.is_set():
+            pair = generate(self.r1)
+            while not self._is_stopped.is_set():
+                try:
+                    self._pairs.put(pair, timeout=0.5)
+                    break
+                except queue.Full:
+                    pass
+
+
+    def stop(self):
+        """ Stop the thread refilling the pool, and wait for it.
+        """
+        self._is_stopped.set()
+        with self._lock:
+            thread = self._thread
+        if thread:
+            thread.join()
+
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None and not self._is_stopped.is_set():
+                self._thread = threading.Thread(
+                    target=self._fill, name="keys", daemon=True)
+                self._thread.start()
+
+
+    def get(self):
+        """ Return a `KeyPair`, from the pool if it is not empty.
+        """
+        if not _is_in_process(self.r1):
+            return generate(self.r1)
+        self._start()
+        try:
+            return self._pairs.get_nowait()
+        except queue.Empty:
+            return generate(self.r1)
+
+
+    def get_many(self, count):
+        """ Return a list of `count` key pairs.
+        """
+        return [self.get() for i in range(count)]
+
+
+_pools = {}
+_pool_size = 256
+_pools_lock = threading.Lock()
+
+
+def set_pool_size(size=256):
+    """ Set the number of key pairs kept ready for `create_key()`.
+    """
+    global _pool_size
+    with _pools_lock:
+        _pool_size = size
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool_ in pools:
+        pool_.stop()
+
+
+def pool(r1=False):
+    """ Return the pool of key pairs shared in the process.
+    """
+    with _pools_lock:
+        if not r1 in _pools:
+            _pools[r1] = KeyPool(_pool_size, r1)
+        return _pools[r1]
+
+
+def create_key(r1=False):
+    """ Return a new `KeyPair`, taken from the pool.
+    """
+    return pool(r1).get()
+
+
+def create_keys(count, r1=False):
+    """ Return a list of `count` new key pairs.
+    """
+    return pool(r1).get_many(count)
@@ -11,8 +11,10 @@ Private testnet set-up and tear-down.
 
 """
 
+import setup
 import teos
 import cleos
+import cache
 
 
 def reset(is_verbose=1):
@@ -23,9 +25,12 @@ def reset(is_verbose=1):
     node = teos.NodeStart(1, is_verbose)
     # print("XXXXXXXXXXXXX teos.NodeStart(1, is_verbose)")
     cleos.set_wallet_url_arg(node, node.json["EOSIO_DAEMON_ADDRESS"], False)
+    # the blocks of the local node are new, even if the cache is not set now:
+    cache.clear("http://" + node.json["EOSIO_DAEMON_ADDRESS"])
     # print("XXXXXXXXXXXXX teos.NodeStart(1, is_verbose)")
 
     probe = teos.NodeProbe(is_verbose)
+    cleos.invalidate_node_is_running()
     if not probe.error:
         if node.is_verbose:
             print("OK")
@@ -40,6 +45,7 @@ def run(is_verbose=1):
     node = teos.NodeStart(0, is_verbose)
     cleos.set_wallet_url_arg(node, node.json["EOSIO_DAEMON_ADDRESS"], False)
     probe = teos.NodeProbe(is_verbose)
+    cleos.invalidate_node_is_running()
     if not probe.error:
         if node.is_verbose:
             print("OK")
@@ -54,6 +60,9 @@ def stop(is_verbose=1):
     is empty, otherwise `False`.
     """
     stop = teos.NodeStop(is_verbose)
+    # the node is gone, forget what is known about it:
+    cleos.invalidate_node_is_running()
+    cleos.chain_head().invalidate()
     cleos.set_wallet_url_arg(stop, "")
     return stop
 
@@ -70,7 +79,7 @@ def is_running():
     Check if testnet is running.
     """
     try:
-        head_block_num = int(cleos.GetInfo(0).json["head_block_num"])
+        head_block_num = int(cleos.chain_head().get_info().head_block)
     except:
         head_block_num = -1
     return head_block_num > 0
@@ -0,0 +1,222 @@
+#!/usr/bin/python3
+
+"""
+Pipelined submission of transactions.
+
+.. module:: pipeline
+    :platform: Unix, Windows
+    :synopsis: Pipelined submission of transactions.
+
+.. moduleauthor:: Tokenika
+
+"""
+
+import time
+import queue
+import asyncio
+import threading
+import concurrent.futures
+import cleos
+import tracing
+
+
+class FailedReceipt:
+    """ The receipt of a transaction that raised an exception.
+    """
+    error = True
+    latency = None
+
+    def __init__(self, err_msg):
+        self.err_msg = err_msg
+        self.json = {"ERROR": err_msg}
+
+
+class TransactionPipeline:
+    """ Keep up to `window` transactions in flight against the node.
+
+    - **parameters**::
+
+        window: The maximal number of transactions in flight. `push_action()`
+            and `push_transaction()` block while the window is full.
+        callback: A function called with each receipt, that is the
+            `cleos.PushAction` or `cleos.PushTransaction` object, as it
+            arrives. It is called in a worker thread. The `latency` 
+            attribute of a receipt is the time in seconds the command took.
+        keep_receipts: Keep the receipts for `receipts()` and the async
+            iteration. Default is `True` without a callback, and `False`
+            with it. The futures returned by `push_action()` and
+            `push_transaction()` give the receipts in any case.
+        expiration_sec: The time in seconds before a transaction expires.
+        forceUnique: Force the transactions to be unique. Identical actions
+            pushed with the same reference block in the same second are
+            rejected as duplicates otherwise.
+        is_verbose: Verbosity of the commands, default is `-1`.
+        compact: Keep compact receipts, see `cleos.PushAction`.
+
+    - **attributes**::
+
+        submitted: The number of submitted transactions.
+        completed: The number of completed transactions.
+        failed: The number of transactions completed with error.
+
+    The reference block for TAPOS is left to `cleos`: it takes it from the
+    `get_info` request it makes for the chain id anyway, while a given
+    `--ref-block` costs it a `get_block` request more.
+
+    Usage::
+
+        with pipeline.TransactionPipeline(window=16) as pipe:
+            for i in range(1000):
+                pipe.push_action(
+                    contract.account, "transfer", data, permission=alice)
+            for receipt in pipe.receipts():
+                print(receipt.transaction)
+    """
+    def __init__(
+            self, window=8, callback=None, keep_receipts=None,
+            expiration_sec=30, forceUnique=0, is_verbose=-1, compact=False):
+        self.window = window
+        self.callback = callback
+        self.keep_receipts = callback is None if keep_receipts is None \
+            else keep_receipts
+        self.expiration_sec = expiration_sec
+        self.forceUnique = forceUnique
+        self.is_verbose = is_verbose
+        self.compact = compact
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self._delivered = 0
+
+        self._slots = threading.BoundedSemaphore(window)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=window, thread_name_prefix="pipeline")
+        self._receipts = queue.Queue()
+        self._lock = threading.Lock()
+
+
+    def _done(self, future):
+        try:
+            receipt = future.result()
+        except Exception as e:
+            receipt = FailedReceipt("Error: {}".format(e))
+
+        with self._lock:
+            self.completed = self.completed + 1
+            if receipt.error:
+                self.failed = self.failed + 1
+        try:
+            if self.callback:
+                self.callback(receipt)
+        finally:
+            if self.keep_receipts:
+                self._receipts.put(receipt)
+            self._slots.release()
+
+
+    def submit(self, command_class, *args, **kwargs):
+        """ Execute a command class when a slot of the window is free.
+        Return a `concurrent.futures.Future` of the command object.
+        """
+        self._slots.acquire()
+        with self._lock:
+            self.submitted = self.submitted + 1
+        future = self._executor.submit(
+            tracing.bind(self._run), command_class, args, kwargs)
+        future.add_done_callback(self._done)
+        return future
+
+
+    def _run(self, command_class, args, kwargs):
+        start = time.perf_counter()
+        receipt = command_class(*args, **kwargs)
+        receipt.latency = time.perf_counter() - start
+        return receipt
+
+
+    def push_action(self, account, action, data, permission=""):
+        """ Push a transaction with a single action, see `cleos.PushAction`.
+        """
+        if not permission:
+            permission = account
+        try:
+            permission = permission.name
+        except:
+            pass
+
+        return self.submit(
+            cleos.PushAction, account, action, data, permission,
+            expiration_sec=self.expiration_sec,
+            forceUnique=self.forceUnique,
+            is_verbose=self.is_verbose,
+            compact=self.compact)
+
+
+    def push_transaction(self, actions):
+        """ Push a transaction with many actions, see `cleos.PushTransaction`.
+        """
+        return self.submit(
+            cleos.PushTransaction, actions,
+            expiration_sec=self.expiration_sec,
+            forceUnique=self.forceUnique,
+            is_verbose=self.is_verbose,
+            compact=self.compact)
+
+
+    def _is_delivered(self):
+        with self._lock:
+            return self._delivered >= self.submitted
+
+
+    def _deliver(self, receipt):
+        with self._lock:
+            self._delivered = self._delivered + 1
+        return receipt
+
+
+    def _check_receipts(self):
+        if not self.keep_receipts:
+            raise ValueError(
+                "The receipts are not kept, see `keep_receipts`.")
+
+
+    def receipts(self):
+        """ Yield the receipts in the order of arrival, until all the
+        submitted transactions are completed.
+        """
+        self._check_receipts()
+        while not self._is_delivered():
+            yield self._deliver(self._receipts.get())
+
+
+    async def __aiter__(self):
+        """ Iterate asynchronously over the receipts, see `receipts()`.
+        """
+        self._check_receipts()
+        loop = asyncio.get_running_loop()
+        while not self._is_delivered():
+            yield self._deliver(
+                await loop.run_in_executor(None, self._receipts.get))
+
+
+    def wait(self):
+        """ Wait until all the submitted transactions are completed.
+        """
+        for i in range(self.window):
+            self._slots.acquire()
+        for i in range(self.window):
+            self._slots.release()
+
+
+    def close(self):
+        self.wait()
+        self._executor.shutdown()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
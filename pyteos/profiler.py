@@ -0,0 +1,217 @@
+#!/usr/bin/python3
+
+"""
+Resources used by the actions of contracts.
+
+.. module:: profiler
+    :platform: Unix, Windows
+    :synopsis: Resources used by the actions of contracts.
+
+.. moduleauthor:: Tokenika
+
+With the profiler started, the receipts of the transactions pushed, with
+`cleos.PushAction`, `cleos.PushTransaction` or `eosf.Contract.push_action()`,
+are aggregated by the contract and the action: the billed CPU and NET, the
+`elapsed` time of the action traces, separately of the top-level and of the
+inline ones, and, with
+`eosf.Contract.push_action()`, the change of the RAM used by the contract
+account and by the account authorizing the action::
+
+    profiler.start()
+    ...
+    profiler.report()
+
+An action trace is aggregated under the receiver, the contract whose code
+runs. A notification of an action, like `eosio.token::transfer` sent to the
+recipients with `require_recipient()`, is an inline trace of each recipient,
+under the name of the action.
+
+The CPU and NET are billed for a transaction. If it has many actions, they
+are aggregated under the contract of the first action, and the names of all
+the actions joined with '+'.
+"""
+
+import math
+import threading
+
+
+_lock = threading.Lock()
+_is_enabled = False
+_is_ram = True
+_actions = {}
+
+
+class _Action():
+    __slots__ = (
+        "count", "inline", "cpu_usage_us", "net_usage_words", "elapsed_us",
+        "inline_elapsed_us", "ram_bytes")
+
+    def __init__(self):
+        self.count = 0
+        self.inline = 0
+        self.cpu_usage_us = []
+        self.net_usage_words = []
+        self.elapsed_us = []
+        self.inline_elapsed_us = []
+        self.ram_bytes = []
+
+
+def start(ram=True):
+    """ Clear the aggregates, and start the profiler. If `ram`, the RAM
+    used is read before and after each `eosf.Contract.push_action()`, what
+    costs two requests to the node.
+    """
+    global _is_enabled, _is_ram
+    with _lock:
+        _actions.clear()
+        _is_ram = ram
+        _is_enabled = True
+
+
+def stop():
+    """ Stop the profiler, and return `summary()`.
+    """
+    global _is_enabled
+    with _lock:
+        _is_enabled = False
+    return summary()
+
+
+def is_enabled():
+    return _is_enabled
+
+
+def is_ram():
+    return _is_enabled and _is_ram
+
+
+def _action(key):
+    action = _actions.get(key)
+    if action is None:
+        action = _actions[key] = _Action()
+    return action
+
+
+def _traces(traces, is_inline=False):
+    for trace in traces:
+        yield (trace, is_inline)
+        yield from _traces(trace.get("inline_traces", []), True)
+
+
+def record(json):
+    """ Aggregate the receipt and the action traces of a transaction pushed,
+    given as the json output of `cleos`.
+    """
+    try:
+        processed = json["processed"]
+        receipt = processed["receipt"]
+        traces = processed["action_traces"]
+    except (KeyError, TypeError):
+        return
+
+    names = [trace["act"]["name"] for trace in traces]
+    if not names:
+        return
+    billed = (traces[0]["act"]["account"], "+".join(names))
+
+    with _lock:
+        for trace, is_inline in _traces(traces):
+            act = trace["act"]
+            receiver = trace.get("receipt", {}).get("receiver", act["account"])
+            action = _action((receiver, act["name"]))
+            if is_inline:
+                action.inline += 1
+                elapsed_us = action.inline_elapsed_us
+            else:
+                action.count += 1
+                elapsed_us = action.elapsed_us
+            if "elapsed" in trace:
+                elapsed_us.append(trace["elapsed"])
+
+        action = _action(billed)
+        if len(names) > 1:
+            action.count += 1
+        if "cpu_usage_us" in receipt:
+            action.cpu_usage_us.append(receipt["cpu_usage_us"])
+        if "net_usage_words" in receipt:
+            action.net_usage_words.append(receipt["net_usage_words"])
+
+
+def record_ram(contract, action, ram_bytes):
+    """ Aggregate the change of the RAM used, in bytes, by an action.
+    """
+    with _lock:
+        _action((contract, action)).ram_bytes.append(ram_bytes)
+
+
+def _percentile(values, percent):
+    # nearest-rank, of a sorted list:
+    if not values:
+        return None
+    return values[max(1, int(math.ceil(percent / 100.0 * len(values)))) - 1]
+
+
+def _statistics(values):
+    if not values:
+        return None
+    values = sorted(values)
+    return {
+        "mean": sum(values) / len(values),
+        "p95": _percentile(values, 95),
+        "max": values[-1]
+        }
+
+
+def summary():
+    """ Return the list of the aggregates of the actions, the most expensive
+    first, by the total CPU. An aggregate is a dictionary of the contract,
+    the action, the number of the pushes, the number of the inline
+    executions, and the statistics, 'mean', 'p95' and 'max', of the billed
+    CPU, the billed NET, the elapsed time of the top-level traces, the
+    elapsed time of the inline traces, and the change of the RAM.
+    """
+    with _lock:
+        items = list(_actions.items())
+    result = []
+    for (contract, name), action in items:
+        result.append({
+            "contract": contract,
+            "action": name,
+            "count": action.count,
+            "inline": action.inline,
+            "cpu_usage_us": _statistics(action.cpu_usage_us),
+            "net_usage_words": _statistics(action.net_usage_words),
+            "elapsed_us": _statistics(action.elapsed_us),
+            "inline_elapsed_us": _statistics(action.inline_elapsed_us),
+            "ram_bytes": _statistics(action.ram_bytes),
+            "cpu_total": sum(action.cpu_usage_us)
+            })
+    result.sort(key=lambda item: -item["cpu_total"])
+    return result
+
+
+def report(summary_=None):
+    """ Print the table of `summary()`.
+    """
+    if summary_ is None:
+        summary_ = summary()
+
+    def column(statistics, key, format="{:.0f}"):
+        if not statistics:
+            return "-"
+        return format.format(statistics[key])
+
+    line = "{:<13}{:<20}{:>7}{:>7}{:>10}{:>9}{:>9}{:>10}{:>13}{:>13}{:>10}"
+    print(line.format(
+        "contract", "action", "count", "inline", "cpu mean", "cpu p95",
+        "cpu max", "net mean", "elapsed mean", "inline mean", "ram mean"))
+    for item in summary_:
+        print(line.format(
+            item["contract"], item["action"], item["count"], item["inline"],
+            column(item["cpu_usage_us"], "mean"),
+            column(item["cpu_usage_us"], "p95"),
+            column(item["cpu_usage_us"], "max"),
+            column(item["net_usage_words"], "mean"),
+            column(item["elapsed_us"], "mean"),
+            column(item["inline_elapsed_us"], "mean"),
+            column(item["ram_bytes"], "mean")))
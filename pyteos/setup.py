@@ -10,9 +10,24 @@ _print_request = False
 _print_response = False
 _nodeos_URL = None
 _is_use_keosd = False
+_is_native_transport = False
+_is_cache = False
+_is_lazy_results = False
 
 account_map = "accounts.json"
 password_map = "passwords.json"
+cache_file = os.path.join(os.path.expanduser("~"), ".eosfactory_cache.sqlite")
+config_file = os.path.dirname(os.path.abspath(__file__)) + "/../teos/config.json"
+
+
+def config_file_mtime():
+    """ The modification time of the configuration file, or `None` if it is
+    missing. Memoized configuration is valid while it does not change.
+    """
+    try:
+        return os.path.getmtime(config_file)
+    except OSError:
+        return None
 
 
 def set_nodeos_URL(url="localhost:8888"):
@@ -54,6 +69,62 @@ def is_use_keosd():
     return _is_use_keosd
     
 
+def set_native_transport(status=True):
+    """ If set `True`, the read commands of the `cleos` module query the 
+    node with an in-process HTTP client, instead of a `cleos` subprocess.
+
+    The client keeps alive a pool of connections to the node.
+    """
+    global _is_native_transport
+    _is_native_transport = status
+    if status:
+        print("##### native transport mode is set!")
+
+def is_native_transport():
+    """ If `True`, the read commands of the `cleos` module use the in-process
+    HTTP client.
+    """
+    global _is_native_transport
+    return _is_native_transport
+
+
+def set_cache(status=True):
+    """ If set `True`, irreversible blocks, their transactions and contract 
+    code are cached, in memory and in the file `cache_file`.
+    
+    See the `cache` module.
+    """
+    global _is_cache
+    _is_cache = status
+    if status:
+        print("##### cache mode is set!")
+
+def is_cache():
+    """ If `True`, immutable chain data is cached.
+    """
+    global _is_cache
+    return _is_cache
+
+
+def set_lazy_results(status=True):
+    """ If set `True`, the output text of a command object is released when
+    the object parses it into its `json` attribute. In any case, the `json`
+    attribute of `cleos.GetAccount`, `cleos.PushAction` and 
+    `cleos.PushTransaction` objects is parsed at the first access.
+    """
+    global _is_lazy_results
+    _is_lazy_results = status
+    if status:
+        print("##### lazy results mode is set!")
+
+def is_lazy_results():
+    """ If `True`, the output text of a command object is released once 
+    parsed.
+    """
+    global _is_lazy_results
+    return _is_lazy_results
+
+
 def set_verbose(status=1):
     """ If set `False`, print error messages only.
     """
@@ -140,7 +211,7 @@ class Setup:
 
     The configuration file is expected in the same folder as the current file.
     """
-    __setupFile = os.path.dirname(os.path.abspath(__file__)) + "/../teos/config.json"
+    __setupFile = config_file
     __CLEOS_EXE = "cleos_executable"    
     __TEOS_EXE = "teos_executable"
     __EOSIO_SOURCE_DIR = "EOSIO_SOURCE_DIR"
@@ -149,9 +220,20 @@ class Setup:
     __review = False
     cleos_exe = ""
     teos_exe = ""
+    # The executables found, keyed with the modification time of the
+    # configuration file:
+    __resolved = {}
 
     def __init__(self):
 
+        resolved = Setup.__resolved.get(config_file_mtime())
+        if resolved:
+            if not self.cleos_exe:
+                self.cleos_exe = resolved[0]
+            if not self.teos_exe:
+                self.teos_exe = resolved[1]
+            return
+
         with open(self.__setupFile) as json_data:
             setup_json = json.load(json_data)
 
@@ -220,3 +302,6 @@ as {{"{2}":"absolute-path-to-teos-executable"}}
                     )
                 )
 
+        if self.cleos_exe and self.teos_exe:
+            Setup.__resolved[config_file_mtime()] = (
+                self.cleos_exe, self.teos_exe)
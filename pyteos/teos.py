@@ -16,19 +16,22 @@ EOSIO `cleos`.
 """
 
 import os
-import subprocess
-import json as json_module
 import time
+import threading
+import subprocess
+import codec
 import re
 import pathlib
 import setup
 import cleos
+import tracing
+import counters
 import shutil
 
 
 setup_setup = setup.Setup()
 
-class _Teos:
+class _Teos(tracing.Traced):
     """ A prototype for the control classes.
 
     Each control class represents a call to a Tokenika `teos` instance that
@@ -39,16 +42,17 @@ class _Teos:
     error = False
     is_verbose = True
     _out = ""
-    json = json_module.loads("{}")
+    json = {}
 
     def __init__(
                 self, jarg, first, second, 
                 is_verbose_arg=True):
 
+        span = tracing.current()
         self.jarg = jarg     
 
         cl = [setup_setup.teos_exe, first, second,
-            "--jarg", str(self.jarg).replace("'", '"'), "--both"]
+            "--jarg", codec.dumps(self.jarg), "--both"]
 
         if setup.is_verbose() and is_verbose_arg:
             cl.append("-V")
@@ -56,7 +60,7 @@ class _Teos:
         if setup.is_print_request():
             print("REQUEST:")
             print("---------------------")
-            print(json_module.dumps(jarg))
+            print(codec.dumps(jarg))
             print("---------------------")
             print("")   
 
@@ -65,11 +69,19 @@ class _Teos:
             print(" ".join(cl))
             print("")
 
+        counters.count("subprocess")
+        start = time.perf_counter()
         process = subprocess.run(
             cl,
             stdout=subprocess.PIPE, 
             stderr=subprocess.PIPE,
             cwd=str(pathlib.Path(setup_setup.teos_exe).parent)) 
+        if span:
+            span.set_argv(cl)
+            span.set(
+                spawn_us=round((time.perf_counter() - start) * 1e6, 1),
+                stdout_bytes=len(process.stdout),
+                stderr_bytes=len(process.stderr))
 
         # Both, right and error output is passed with stdout:
         self._out = process.stdout.decode("utf-8")
@@ -82,7 +94,7 @@ class _Teos:
         if setup.is_print_response():
             print("RESPONSE:")
             print("---------------------")
-            print(json_module.dumps(json_module.loads(json_resp), indent=4))
+            print(codec.dumps(codec.loads(json_resp), indent=4))
             print("---------------------")
             print("")
 
@@ -93,8 +105,11 @@ class _Teos:
             self.error = True
             if is_verbose_arg >= 0 and setup.is_verbose() >= 0:
                 print(self._out)
+        if span:
+            span.set(error=self.error)
+            span.mark_command_end()
         try:
-            self.json = json_module.loads(json_resp)
+            self.json = codec.loads(json_resp)
         except:
             self.json = json_resp
 
@@ -109,23 +124,68 @@ class GetConfig(_Teos):
     Get the configurationt of the teos executable.
     """
     def __init__(self, contract_dir="", is_verbose=1):
-        jarg = json_module.loads("{}")
+        jarg = {}
         jarg["contract-dir"] = contract_dir
         _Teos.__init__(self, jarg, "get", "config", is_verbose) 
 
 
+_configs = {}
+_configs_lock = threading.Lock()
+
+
+def _is_config_valid(config, contract_dir):
+    # The contract files resolved may be removed, or not built yet:
+    if not contract_dir:
+        return True
+    try:
+        return os.path.isfile(config.json["contract-wast"]) \
+            and os.path.isfile(config.json["contract-abi"])
+    except:
+        return False
+
+
+def config(contract_dir=""):
+    """
+    Get the configuration of the teos executable, see `GetConfig`,
+    memoized in the process.
+
+    A `GetConfig` object is reused, for each contract directory, while the
+    configuration file `setup.config_file` is not modified, and the contract
+    files it resolves exist.
+    """
+    mtime = setup.config_file_mtime()
+    with _configs_lock:
+        entry = _configs.get(contract_dir)
+    if entry and entry[0] == mtime and _is_config_valid(entry[1], contract_dir):
+        return entry[1]
+
+    get_config = GetConfig(contract_dir, is_verbose=0)
+    if not get_config.error and isinstance(get_config.json, dict):
+        with _configs_lock:
+            _configs[contract_dir] = (mtime, get_config)
+    return get_config
+
+
+def invalidate_config():
+    """
+    Forget the configuration memoized with `config()`.
+    """
+    with _configs_lock:
+        _configs.clear()
+
+
 def get_node_wallet_dir():
     """
     Get the directory of the `nodeos` local wallet.
     """
-    return GetConfig(is_verbose=0).json["EOSIO_WALLET_DIR"]
+    return config().json["EOSIO_WALLET_DIR"]
 
 
 def get_keosd_wallet_dir():
     """
     Get the directory of the `nodeos` local wallet.
     """
-    return GetConfig(is_verbose=0).json["KEOSD_WALLET_DIR"]
+    return config().json["KEOSD_WALLET_DIR"]
 
 
 class Template(_Teos):
@@ -134,7 +194,7 @@ class Template(_Teos):
             visual_studio_code=False, is_verbose=1
         ):
 
-        jarg = json_module.loads("{}")
+        jarg = {}
         jarg["name"] = name
         if template:
             jarg["template"] = template
@@ -171,7 +231,7 @@ class ABI(_Teos):
         except:
             pass
 
-        jarg = json_module.loads("{}")
+        jarg = {}
         jarg["sourceDir"] = source
         jarg["includeDir"] = include_dir
         jarg["codeName"] = code_name
@@ -188,7 +248,7 @@ class WAST(_Teos):
         except:
             pass
 
-        jarg = json_module.loads("{}")
+        jarg = {}
         jarg["sourceDir"] = source
         jarg["includeDir"] = include_dir
         jarg["codeName"] = code_name
@@ -198,7 +258,7 @@ class WAST(_Teos):
 
 class NodeStart(_Teos):
     def __init__(self, clear=0, is_verbose=1):
-        jarg = json_module.loads("{}")
+        jarg = {}
         jarg["delete-all-blocks"] = clear
         jarg["DO_NOT_LAUNCH"] = 1
         _Teos.__init__(self, jarg, "daemon", "start", is_verbose)
@@ -209,6 +269,7 @@ class NodeStart(_Teos):
                 return
                 
             self.command_line = self.json["command_line"]
+            counters.count("subprocess")
             if self.json["is_windows_ubuntu"] == "true":
                 subprocess.call(
                     ["cmd.exe", "/c", "start", "/MIN", "bash.exe", "-c", 
@@ -230,38 +291,29 @@ class NodeProbe:
     get_info = ""
 
     def __init__(self, is_verbose=1):
-        count = 15
+        timeout = 15
         num = 5
-       
-        while True:
-            time.sleep(1)
-            self.get_info = cleos.GetInfo(is_verbose=-1)
-            self.ok = False
-            count = count - 1
-
-            try:
-                head_block_num = int(self.get_info.json["head_block_num"])
-            except:
-                head_block_num = -1
-
-            if head_block_num >= num:
-                self.error = False
-                break      
 
-            if count <= 0:
-                break
+        chain_head = cleos.chain_head()
+        chain_head.invalidate()
+        self.ok = False
+        self.get_info = chain_head.wait_for_block(num, timeout)
+        if not self.get_info is None:
+            self.error = False
+        else:
+            self.get_info = chain_head.get_info()
 
 
 class NodeStop(_Teos):
     def __init__(self, is_verbose=1):
-        jarg = json_module.loads("{}")
+        jarg = {}
         _Teos.__init__(self, jarg, "daemon", "stop", is_verbose)
 
 
 class NodeIsRunning(_Teos):
     daemon_pid = ""
     def __init__(self, is_verbose=1):
-        jarg = json_module.loads("{}")
+        jarg = {}
         _Teos.__init__(self, jarg, "daemon", "isrunning", is_verbose)
 
         if not self.error:
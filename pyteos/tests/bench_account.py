@@ -0,0 +1,80 @@
+""" Memory footprint of account objects, per 10k accounts.
+
+Compares `eosf.Account` objects with synthetic objects patched with closures,
+as `eosf.account()` made them before. The synthetic object is a plain
+`_Command` holding a made-up command output and `json` of the real sizes,
+not a `cleos.GetAccount` object: that had a few attributes more, hence the
+figures of the patched objects are rather low. No node is needed::
+
+    python3 bench_account.py [count]
+"""
+
+import sys
+import types
+import secrets
+import tracemalloc
+import keys
+import eosf
+
+
+def key_pair():
+    # Random strings of the size of the keys, instead of slow real keys:
+    return keys.KeyPair(
+        "EOS" + secrets.token_hex(25), "5" + secrets.token_hex(25))
+
+
+class _Command():
+    pass
+
+
+def patched_account(name, owner_key, active_key):
+    account_object = _Command()
+    account_object.name = name
+    account_object.owner_key = owner_key
+    account_object.active_key = active_key
+    account_object.error = False
+    account_object.is_verbose = 1
+    account_object.err_msg = ""
+    account_object._out = "executed transaction: {}  200 bytes  ...\n" \
+        .format(secrets.token_hex(32)) * 4
+    account_object.json = {
+        "account_name": name, "head_block_num": 1000,
+        "permissions": [{"perm_name": "active",
+            "required_auth": {"keys": [{"key": active_key.key_public}]}}]}
+
+    for method in ("code", "set_contract", "push_action", "push_transaction",
+            "table", "__str__"):
+        def closure(self, *args, **kwargs):
+            return account_object
+        setattr(account_object, method,
+            types.MethodType(closure, account_object))
+
+    return account_object
+
+
+def compact_account(name, owner_key, active_key):
+    return eosf.Account(name, owner_key, active_key)
+
+
+def footprint(make, count):
+    names = ["acc{:09d}".format(i) for i in range(count)]
+    pairs = [(key_pair(), key_pair()) for i in range(count)]
+
+    tracemalloc.start()
+    accounts = [make(names[i], *pairs[i]) for i in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size
+
+
+def main(count=10000):
+    print("{:<20}{:>16}{:>16}".format("object", "bytes/10k", "bytes/account"))
+    for label, make in (
+            ("patched", patched_account), ("eosf.Account", compact_account)):
+        size = footprint(make, count)
+        print("{:<20}{:>16,}{:>16,}".format(
+            label, size * 10000 // count, size // count))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
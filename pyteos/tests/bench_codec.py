@@ -0,0 +1,76 @@
+""" Parse time of large block and table responses, for each JSON backend
+importable, see the `codec` module. No node is needed::
+
+    python3 bench_codec.py [transactions] [rows]
+"""
+
+import sys
+import json
+import timeit
+import codec
+
+
+def block(transactions):
+    return json.dumps({
+        "timestamp": "2018-06-01T12:00:00.000",
+        "producer": "eosio",
+        "block_num": 1000,
+        "ref_block_prefix": 3823564741,
+        "id": "000003e8" + "ab" * 28,
+        "transactions": [{
+            "status": "executed",
+            "cpu_usage_us": 412,
+            "net_usage_words": 18,
+            "trx": {
+                "id": "{:064x}".format(i),
+                "signatures": ["SIG_K1_" + "K" * 94],
+                "compression": "none",
+                "packed_context_free_data": "",
+                "packed_trx": "f5" * 80,
+                "transaction": {
+                    "expiration": "2018-06-01T12:00:30",
+                    "ref_block_num": 999,
+                    "ref_block_prefix": 3823564741,
+                    "actions": [{
+                        "account": "eosio.token",
+                        "name": "transfer",
+                        "authorization": [
+                            {"actor": "alice", "permission": "active"}],
+                        "data": {
+                            "from": "alice", "to": "carol",
+                            "quantity": "0.0001 EOS", "memo": str(i)},
+                        "hex_data": "00" * 40
+                        }]
+                    }
+                }
+            } for i in range(transactions)]
+        }, indent=2)
+
+
+def table(rows):
+    return json.dumps({
+        "rows": [{
+            "id": i, "owner": "acc{:09d}".format(i),
+            "balance": "{}.0000 EOS".format(i), "memo": "row " + str(i)
+            } for i in range(rows)],
+        "more": False
+        }, indent=2)
+
+
+def main(transactions=2000, rows=50000):
+    payloads = (("block", block(transactions)), ("table", table(rows)))
+    print("{:<8}{:<10}{:>12}{:>14}".format(
+        "payload", "backend", "MB", "ms/parse"))
+    for name, text in payloads:
+        for backend in codec.backends():
+            codec.set_backend(backend)
+            number = 5
+            seconds = min(timeit.repeat(
+                lambda: codec.loads(text), number=number, repeat=3)) / number
+            print("{:<8}{:<10}{:>12.2f}{:>14.2f}".format(
+                name, backend, len(text) / 1e6, seconds * 1000))
+    codec.set_backend()
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,440 @@
+""" Overhead of the pyteos wrappers, measured against stub `cleos` and `teos`
+executables answering with canned responses, hence without a node.
+
+For each entry point of `cleos`, `cleos_system`, `teos` and `eosf`, the time
+of a call is split into the time spent in `subprocess.run()`, that is the
+spawning of the stub, and the rest, that is the overhead of pyteos: argument
+assembly, decoding, the error keyword scan and parsing. The memory allocated
+in a call is traced with `tracemalloc`. The decoding, the error scan and the
+JSON parsing of each canned response are timed separately.
+
+The overheads are compared with a baseline file, and a regression sets the
+exit status. The baseline depends on the machine, hence it is not in the
+repository: the first run stores it, and `--save` replaces it::
+
+    python3 microbench.py [--calls 50] [--save] [--tolerance 0.25]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+import tracemalloc
+
+# the pyteos modules, if not on PYTHONPATH:
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import setup
+import codec
+import cleos
+import cleos_system
+import teos
+import keys
+import eosf
+
+
+BASELINE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "microbench_baseline.json")
+
+# The stub skips the options of the URLs, and prints the files of the command,
+# named after its first two words:
+_STUB = """#!/bin/sh
+dir=$(dirname "$0")
+while [ $# -gt 0 ]; do
+    case "$1" in
+        --url|-u|--wallet-url) shift 2 ;;
+        -*) shift ;;
+        *) break ;;
+    esac
+done
+[ -f "$dir/$1_$2.err" ] && cat "$dir/$1_$2.err" >&2
+[ -f "$dir/$1_$2.out" ] && cat "$dir/$1_$2.out"
+exit 0
+"""
+
+# throwaway keys of the stub executables:
+keys.set_builtin_curves(True)
+KEY_PAIR = keys.key_pair(0x1234567890ABCDEF)
+TRANSACTION_ID = "5d1b4b0c8a8f3e2a1c9b7d6e5f4a3b2c1d0e9f8a7b6c5d4e3f2a1b0c9d8e7f6a"
+
+
+def _trace(name, data):
+    return {
+        "receipt": {
+            "receiver": "alice", "act_digest": "ab" * 32,
+            "global_sequence": 1234, "recv_sequence": 12,
+            "auth_sequence": [["alice", 34]], "code_sequence": 1,
+            "abi_sequence": 1},
+        "act": {
+            "account": "alice", "name": name,
+            "authorization": [{"actor": "alice", "permission": "active"}],
+            "data": data, "hex_data": "00" * 40},
+        "elapsed": 120, "cpu_usage": 0, "console": "Hello, alice!",
+        "total_cpu_usage": 0, "trx_id": TRANSACTION_ID, "inline_traces": []
+        }
+
+
+def _push(actions):
+    return json.dumps({
+        "transaction_id": TRANSACTION_ID,
+        "processed": {
+            "id": TRANSACTION_ID, "block_num": 1234,
+            "receipt": {
+                "status": "executed", "cpu_usage_us": 412,
+                "net_usage_words": 16},
+            "elapsed": 412, "net_usage": 128, "scheduled": False,
+            "action_traces": [
+                _trace("hi", {"user": "alice"}) for i in range(actions)],
+            "except": None
+            }
+        }, indent=2) + "\n"
+
+
+_ACCOUNT = json.dumps({
+    "account_name": "alice", "head_block_num": 1234,
+    "privileged": False, "ram_quota": 8150, "ram_usage": 2996,
+    "net_weight": 10000, "cpu_weight": 10000,
+    "net_limit": {"used": 0, "available": 1000, "max": 1000},
+    "cpu_limit": {"used": 0, "available": 1000, "max": 1000},
+    "permissions": [{
+        "perm_name": level, "parent": "owner" if level == "active" else "",
+        "required_auth": {
+            "threshold": 1,
+            "keys": [{"key": KEY_PAIR.key_public, "weight": 1}],
+            "accounts": [], "waits": []}
+        } for level in ("active", "owner")]
+    }, indent=2) + "\n"
+
+_BLOCK = json.dumps({
+    "timestamp": "2018-06-01T12:00:00.000", "producer": "eosio",
+    "confirmed": 0, "previous": "00" * 32, "block_num": 1234,
+    "ref_block_prefix": 3823564741, "id": "000004d2" + "ab" * 28,
+    "transactions": [{
+        "status": "executed", "cpu_usage_us": 412, "net_usage_words": 16,
+        "trx": TRANSACTION_ID} for i in range(20)]
+    }, indent=2) + "\n"
+
+_TABLE = json.dumps({
+    "rows": [{"balance": "{}.0000 EOS".format(i)} for i in range(10)],
+    "more": False}, indent=2) + "\n"
+
+
+def _cleos_responses(contract_dir):
+    return {
+        "get_info": (json.dumps({
+            "server_version": "0f6695cb", "head_block_num": 1234,
+            "last_irreversible_block_num": 1233,
+            "head_block_id": "000004d2" + "ab" * 28,
+            "head_block_time": "2018-06-01T12:00:00",
+            "head_block_producer": "eosio"}, indent=2) + "\n", ""),
+        "get_block": (_BLOCK, ""),
+        "get_account": (_ACCOUNT, ""),
+        "get_code": ("code hash: " + "cd" * 32 + "\n", ""),
+        "get_table": (_TABLE, ""),
+        "create_key": ("Private key: {}\nPublic key: {}\n".format(
+            KEY_PAIR.key_private, KEY_PAIR.key_public), ""),
+        "create_account": (
+            "", "executed transaction: {}  200 bytes  400 us\n"
+            "#         eosio <= eosio::newaccount            {{...}}\n"
+            .format(TRANSACTION_ID)),
+        "system_newaccount": (
+            "", "executed transaction: {}  344 bytes  1200 us\n"
+            .format(TRANSACTION_ID)),
+        "set_contract": (
+            "", "Reading WAST/WASM from {0}/contract.wast...\n"
+            "Publishing contract...\n"
+            "executed transaction: {1}  3200 bytes  2200 us\n"
+            "#         eosio <= eosio::setcode {{\"code\":\"{2}\"}}\n".format(
+                contract_dir, TRANSACTION_ID, "0061736d" * 800)),
+        "push_action": (_push(1), ""),
+        "push_transaction": (_push(4), ""),
+        "wallet_import": ("imported private key for: {}\n".format(
+            KEY_PAIR.key_public), ""),
+        "wallet_keys": ('[  "{}"\n]\n'.format(KEY_PAIR.key_public), ""),
+        "wallet_list": ('Wallets:\n[\n  "default *"\n]\n', ""),
+        "wallet_open": ('Opened: default\n', ""),
+        }
+
+
+def _teos_responses(contract_dir):
+    return {
+        "get_config": ("", json.dumps({
+            "contract-dir": contract_dir,
+            "contract-wast": os.path.join(contract_dir, "contract.wast"),
+            "contract-abi": os.path.join(contract_dir, "contract.abi"),
+            "EOSIO_WALLET_DIR": contract_dir,
+            "KEOSD_WALLET_DIR": contract_dir,
+            "EOSIO_DAEMON_ADDRESS": "127.0.0.1:8888",
+            "EOSIO_KEY_PRIVATE": KEY_PAIR.key_private,
+            "EOSIO_KEY_PUBLIC": KEY_PAIR.key_public
+            }))
+        }
+
+
+def make_stubs(directory):
+    """ Write the stub executables, and their responses, to a directory.
+    Return the paths of the stub `cleos` and the stub `teos`.
+    """
+    contract_dir = os.path.join(directory, "contract")
+    os.makedirs(contract_dir)
+    for name in ("contract.wast", "contract.abi"):
+        with open(os.path.join(contract_dir, name), "w") as out:
+            out.write("")
+
+    paths = []
+    for name, responses in (
+            ("cleos", _cleos_responses(contract_dir)),
+            ("teos", _teos_responses(contract_dir))):
+        stub_dir = os.path.join(directory, name + "_stub")
+        os.makedirs(stub_dir)
+        for command, (out, err) in responses.items():
+            for suffix, text in ((".out", out), (".err", err)):
+                if text:
+                    with open(os.path.join(
+                            stub_dir, command + suffix), "w") as output:
+                        output.write(text)
+        path = os.path.join(stub_dir, name)
+        with open(path, "w") as out:
+            out.write(_STUB)
+        os.chmod(path, 0o755)
+        paths.append(path)
+    return paths + [contract_dir]
+
+
+def entry_points(contract_dir):
+    """ Return the list of pairs of the name of an entry point and a function
+    calling it.
+    """
+    alice = eosf.Account("alice", KEY_PAIR, KEY_PAIR, is_verbose=-1)
+    contract = eosf.Contract(alice, contract_dir, is_verbose=-1)
+    action = {
+        "account": "alice", "name": "hi",
+        "authorization": [{"actor": "alice", "permission": "active"}],
+        "data": {"user": "alice"}}
+    return [
+        ("cleos.GetInfo", lambda: cleos.GetInfo(is_verbose=-1)),
+        ("cleos.GetBlock", lambda: cleos.GetBlock(1234, is_verbose=-1)),
+        ("cleos.GetAccount", lambda: cleos.GetAccount(
+            "alice", is_verbose=-1, json=True)),
+        ("cleos.GetCode", lambda: cleos.GetCode("alice", is_verbose=-1)),
+        ("cleos.GetTable", lambda: cleos.GetTable(
+            "alice", "accounts", "alice", is_verbose=-1)),
+        ("cleos.CreateKey", lambda: cleos.CreateKey("owner", is_verbose=-1)),
+        ("cleos.CreateAccount", lambda: cleos.CreateAccount(
+            "eosio", "alice", KEY_PAIR, KEY_PAIR, is_verbose=-1)),
+        ("cleos.SetContract", lambda: cleos.SetContract(
+            "alice", contract_dir, is_verbose=-1)),
+        ("cleos.PushAction", lambda: cleos.PushAction(
+            "alice", "hi", '{"user":"alice"}', "alice", is_verbose=-1)),
+        ("cleos.PushTransaction", lambda: cleos.PushTransaction(
+            [action] * 4, is_verbose=-1)),
+        ("cleos.WalletImport", lambda: cleos.WalletImport(
+            KEY_PAIR.key_private, "default", is_verbose=-1)),
+        ("cleos.WalletKeys", lambda: cleos.WalletKeys(is_verbose=-1)),
+        ("cleos.WalletList", lambda: cleos.WalletList(is_verbose=-1)),
+        ("cleos.WalletOpen", lambda: cleos.WalletOpen(is_verbose=-1)),
+        ("cleos_system.SystemNewaccount",
+            lambda: cleos_system.SystemNewaccount(
+                "eosio", "alice", KEY_PAIR, KEY_PAIR,
+                "10.0000 EOS", "10.0000 EOS", is_verbose=-1)),
+        ("teos.GetConfig", lambda: teos.GetConfig(is_verbose=-1)),
+        ("teos.config", lambda: teos.config(contract_dir)),
+        ("eosf.account", lambda: eosf.account(
+            "eosio", "alice", KEY_PAIR, KEY_PAIR, is_verbose=-1)),
+        ("eosf.Account.push_action", lambda: alice.push_action(
+            "hi", '{"user":"alice"}')),
+        ("eosf.Account.table", lambda: alice.table("accounts", "alice")),
+        ("eosf.Contract.push_action", lambda: contract.push_action(
+            "hi", '{"user":"alice"}')),
+        ]
+
+
+class _SpawnTimer():
+    """ Measure the time spent in `subprocess.run()`.
+    """
+    def __init__(self):
+        self.run = subprocess.run
+        self.seconds = 0
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.run(*args, **kwargs)
+        finally:
+            self.seconds = self.seconds + time.perf_counter() - start
+            self.count = self.count + 1
+
+    def __enter__(self):
+        subprocess.run = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        subprocess.run = self.run
+
+
+def measure(function, calls):
+    """ Return the median time of a call, and of its spawns, in
+    microseconds, the number of spawns of a call, and the peak of the memory
+    allocated in a call, in bytes.
+    """
+    function() # warm up, and fill the caches
+    totals = []
+    spawns = []
+    with _SpawnTimer() as timer:
+        for i in range(calls):
+            spawn_seconds = timer.seconds
+            start = time.perf_counter()
+            result = function()
+            totals.append(time.perf_counter() - start)
+            spawns.append(timer.seconds - spawn_seconds)
+            if getattr(result, "error", False):
+                raise RuntimeError("The call has failed: {}".format(
+                    result.err_msg))
+    spawn_count = timer.count / calls
+
+    peaks = []
+    tracemalloc.start()
+    for i in range(min(calls, 5)):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        function()
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+
+    total = statistics.median(totals) * 1e6
+    spawn = statistics.median(spawns) * 1e6
+    return {
+        "total_us": round(total, 1),
+        "spawn_us": round(spawn, 1),
+        "overhead_us": round(total - spawn, 1),
+        "spawns": spawn_count,
+        "peak_bytes": int(statistics.median(peaks))
+        }
+
+
+def phases(contract_dir, calls):
+    """ Return the time, in microseconds, of the decoding, the error keyword
+    scan and the JSON parsing of each canned `cleos` response.
+    """
+    def timed(function):
+        start = time.perf_counter()
+        for i in range(calls):
+            function()
+        return round((time.perf_counter() - start) / calls * 1e6, 2)
+
+    results = {}
+    for command, (out, err) in sorted(
+            _cleos_responses(contract_dir).items()):
+        out_bytes = out.encode("utf-8")
+        err_bytes = err.encode("utf-8")
+        decode = timed(
+            lambda: (out_bytes.decode("utf-8"), err_bytes.decode("utf-8")))
+        scan = timed(lambda: [
+            word in err for word in ("Error", "error", "Failed")])
+        parse = None
+        if out.startswith("{"):
+            parse = timed(lambda: codec.loads(out))
+        results[command] = {
+            "bytes": len(out_bytes) + len(err_bytes),
+            "decode_us": decode, "scan_us": scan, "parse_us": parse}
+    return results
+
+
+def compare(results, baseline, tolerance, min_delta_us):
+    """ Return the list of the names of the entry points whose overhead
+    exceeds the baseline by the fraction `tolerance`, and by `min_delta_us`.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        delta = result["overhead_us"] - base["overhead_us"]
+        if delta > min_delta_us \
+                and result["overhead_us"] > base["overhead_us"] * (1 + tolerance):
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=50,
+        help="the number of the calls of an entry point")
+    parser.add_argument("--baseline", default=BASELINE,
+        help="the baseline json file")
+    parser.add_argument("--save", action="store_true",
+        help="store the results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+        help="the relative increase of an overhead counted as a regression")
+    parser.add_argument("--min-delta", type=float, default=100,
+        help="the least increase of an overhead, in microseconds, counted "
+            "as a regression")
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(prefix="pyteos_microbench_")
+    try:
+        cleos_stub, teos_stub, contract_dir = make_stubs(directory)
+        cleos.setup_setup.cleos_exe = cleos_stub
+        teos.setup_setup.teos_exe = teos_stub
+        setup.set_nodeos_URL("127.0.0.1:8888")
+        setup.set_verbose(False)
+        cleos._wallet_url_arg = [] # no node checks
+        teos.invalidate_config()
+        eosf.set_verbosity([])
+
+        results = {}
+        for name, function in entry_points(contract_dir):
+            results[name] = measure(function, args.calls)
+        response_phases = phases(contract_dir, 1000)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+        teos.invalidate_config()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as input:
+            baseline = json.load(input)
+    else: # the first run on the machine:
+        args.save = True
+    regressions = compare(
+        results, baseline, args.tolerance, args.min_delta)
+
+    print("{:<32}{:>10}{:>10}{:>11}{:>8}{:>11}{:>10}".format(
+        "entry point", "total us", "spawn us", "overhead", "spawns",
+        "peak KiB", "baseline"))
+    for name, result in results.items():
+        base = baseline.get(name, {}).get("overhead_us")
+        print("{:<32}{:>10.0f}{:>10.0f}{:>11.0f}{:>8.1f}{:>11.1f}{:>10}{}"
+            .format(
+                name, result["total_us"], result["spawn_us"],
+                result["overhead_us"], result["spawns"],
+                result["peak_bytes"] / 1024,
+                "" if base is None else "{:.0f}".format(base),
+                "  REGRESSION" if name in regressions else ""))
+
+    print("\n{:<20}{:>8}{:>12}{:>10}{:>11}".format(
+        "response", "bytes", "decode us", "scan us", "parse us"))
+    for name, result in response_phases.items():
+        print("{:<20}{:>8}{:>12}{:>10}{:>11}".format(
+            name, result["bytes"], result["decode_us"], result["scan_us"],
+            "" if result["parse_us"] is None else result["parse_us"]))
+
+    if args.save:
+        with open(args.baseline, "w") as out:
+            out.write(json.dumps(results, indent=4, sort_keys=True) + "\n")
+        print("\nThe baseline is stored in {}.".format(args.baseline))
+
+    if regressions:
+        print("\n{} regression(s).".format(len(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,9 +2,13 @@ import setup
 import cleos
 import teos
 import eosf
+import codec
+import tracing
 import unittest
 from termcolor import colored, cprint
 import time
+import os
+import tempfile
 
 setup.set_json(False)        
 setup.set_verbose(True)
@@ -62,6 +66,66 @@ class Test1(unittest.TestCase):
         # self.assertTrue(not contract.error)
         # print(contract)
 
+    def test_15(self):
+        global wallet
+
+        alice = eosf.account(account_master, is_verbose=0)
+        self.assertTrue(not alice.error, "account")
+        self.assertTrue(isinstance(alice, eosf.Account))
+        self.assertTrue(not hasattr(alice, "__dict__"))
+        self.assertEqual(alice.json["account_name"], alice.name)
+
+        wallet.import_key(alice)
+        code = alice.code()
+        self.assertTrue(not code.error, "Account.code")
+
+    def test_20(self):
+        global wallet
+
+        descriptor, path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(descriptor)
+        tracing.start(path)
+        carol = eosf.account(account_master, is_verbose=0)
+        wallet.import_key(carol)
+        tracing.stop()
+
+        with open(path) as spans_file:
+            spans = [codec.loads(line) for line in spans_file]
+        os.remove(path)
+        ids = {
+            span["name"]: span["id"] for span in spans if span["cat"] == "eosf"}
+        self.assertTrue("eosf.account" in ids)
+        self.assertTrue("eosf.Wallet.import_key" in ids)
+
+        self.assertTrue(not [span for span in spans
+            if span["name"] in ("cleos._Cleos", "teos._Teos")])
+        commands = [span for span in spans
+            if span["cat"] in ("cleos", "cleos_system")
+                and span["parent"] == ids["eosf.account"]]
+        self.assertTrue(commands, "commands nested under eosf.account")
+        for span in commands:
+            self.assertTrue("argv" in span["args"], span["name"])
+            self.assertTrue(
+                "spawn_us" in span["args"] or "request_us" in span["args"])
+            self.assertTrue("stdout_bytes" in span["args"])
+            self.assertTrue(not span["args"]["error"])
+
+    def test_25(self):
+        global wallet
+
+        with eosf.measure(
+                "eosf.account", this_thread=True, round_trip=6, file_write=0) as measure:
+            dave = eosf.account(account_master, is_verbose=0)
+        self.assertTrue(not dave.error, "account")
+        self.assertTrue(measure.counts["round_trip"] >= 5)
+
+        with eosf.measure(
+                "Wallet.import_key", this_thread=True, round_trip=2,
+                file_write=1):
+            wallet.import_key(dave)
+
+        self.assertTrue(eosf.stats()["round_trip"] >= 3)
+
     # def test_10(self):
     #     global wallet
 
@@ -0,0 +1,64 @@
+import asyncio
+import unittest
+import setup
+import cleos
+import aio
+import eosf
+
+
+class Test1(unittest.TestCase):
+
+    def run(self, result=None):
+        """ Stop after first error """
+        if not result.failures:
+            super().run(result)
+        print("-------------------------------------------\n")
+
+    @classmethod
+    def setUpClass(cls):
+        setup.set_verbose(True)
+        setup.set_json(False)
+        setup.use_keosd(False)
+
+    def setUp(self):
+        pass
+
+
+    def test_05(self):
+        node_reset = eosf.reset()
+        self.assertTrue(node_reset)
+
+    def test_10(self):
+        async def get_blocks():
+            return await asyncio.gather(
+                *[aio.get_block(n, is_verbose=-1) for n in range(1, 6)])
+
+        blocks = asyncio.run(get_blocks())
+        for n, block in enumerate(blocks, 1):
+            self.assertTrue(not block.error, "GetBlock")
+            self.assertEqual(block.block_num, n)
+
+    def test_15(self):
+        get_info = aio.run(aio.get_info(is_verbose=-1))
+        self.assertTrue(not get_info.error, "GetInfo")
+        print(get_info.head_block)
+
+    def test_20(self):
+        setup.set_native_transport(True)
+        tables = aio.run(
+            *[aio.get_table("eosio", "producers", "eosio", is_verbose=-1)
+                for i in range(100)])
+        setup.set_native_transport(False)
+        for table in tables:
+            self.assertTrue(not table.error, "GetTable")
+
+    def tearDown(self):
+        pass
+
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import json
+import unittest
+import setup
+import cleos
+import cache
+import keys
+import eosf
+
+
+class Test1(unittest.TestCase):
+
+    def run(self, result=None):
+        """ Stop after first error """
+        if not result.failures:
+            super().run(result)
+        print("-------------------------------------------\n")
+
+    @classmethod
+    def setUpClass(cls):
+        setup.set_verbose(True)
+        setup.set_json(False)
+        setup.use_keosd(False)
+
+    def setUp(self):
+        pass
+
+
+    def test_05(self):
+        node_reset = eosf.reset()
+        self.assertTrue(node_reset)
+
+    def test_10(self):
+        setup.set_native_transport(True)
+        get_info = cleos.GetInfo()
+        self.assertTrue(not get_info.error, "GetInfo")
+        print(get_info.head_block)
+        print(get_info.last_irreversible_block_num)
+
+    def test_15(self):
+        setup.set_native_transport(True)
+        native = cleos.GetBlock(3, is_verbose=0)
+        self.assertTrue(not native.error, "GetBlock native")
+
+        setup.set_native_transport(False)
+        subprocess = cleos.GetBlock(3, is_verbose=0)
+        self.assertTrue(not subprocess.error, "GetBlock cleos")
+        self.assertEqual(native.json["id"], subprocess.json["id"])
+        print(native.ref_block_prefix)
+
+    def test_20(self):
+        setup.set_native_transport(True)
+        get_account = cleos.GetAccount("eosio")
+        self.assertTrue(not get_account.error, "GetAccount")
+        print(json.dumps(get_account.json, indent=4))
+
+    def test_25(self):
+        setup.set_native_transport(True)
+        get_account = cleos.GetAccount("nonexistent", is_verbose=-1)
+        self.assertTrue(get_account.error, "GetAccount nonexistent")
+        print(get_account.err_msg)
+
+    def test_30(self):
+        setup.set_native_transport(True)
+        get_code = cleos.GetCode("eosio")
+        self.assertTrue(not get_code.error, "GetCode")
+        print(get_code.code_hash)
+
+    def test_35(self):
+        setup.set_native_transport(True)
+        block_nums = [
+            block.block_num for block in cleos.iter_blocks(1, 20, prefetch=4)]
+        self.assertEqual(block_nums, list(range(1, 21)))
+
+        head = cleos.GetInfo(is_verbose=-1).head_block
+        blocks = cleos.iter_blocks(head, follow=True)
+        for block_num in range(head, head + 4):
+            self.assertEqual(next(blocks).block_num, block_num)
+        blocks.close()
+
+    def test_40(self):
+        setup.set_cache(True)
+        last_irreversible_block_num = cleos.GetInfo(
+            is_verbose=-1).last_irreversible_block_num
+        self.assertTrue(last_irreversible_block_num > 2)
+
+        get_block = cleos.GetBlock(2, is_verbose=0)
+        stores = cache.stats()["stores"]
+        get_block_cached = cleos.GetBlock(2, is_verbose=0)
+        self.assertTrue(get_block_cached.is_cached)
+        self.assertEqual(get_block.json, get_block_cached.json)
+        self.assertEqual(cache.stats()["stores"], stores)
+        setup.set_cache(False)
+
+    def test_45(self):
+        chain_head = cleos.chain_head()
+        get_info = chain_head.get_info()
+        self.assertTrue(not get_info.error, "ChainHead.get_info")
+        self.assertTrue(chain_head.get_info(max_age_sec=60) is get_info)
+
+        get_info = chain_head.wait_for_block(get_info.head_block + 2)
+        self.assertTrue(not get_info is None, "ChainHead.wait_for_block")
+        get_info = chain_head.wait_for_irreversible(
+            get_info.head_block, timeout=10)
+        self.assertTrue(not get_info is None, "ChainHead.wait_for_irreversible")
+
+    def test_50(self):
+        keys.set_builtin_curves(True) # throwaway keys of the local node
+        for r1 in (False, True):
+            create_key = cleos.CreateKey("key", r1=r1, is_verbose=0)
+            self.assertTrue(not create_key.error, "CreateKey")
+            self.assertEqual(
+                keys.from_private(create_key.key_private).key_public,
+                create_key.key_public)
+
+        pairs = keys.create_keys(100)
+        self.assertEqual(len(set(pairs)), 100)
+
+    def tearDown(self):
+        setup.set_native_transport(False)
+
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+if __name__ == "__main__":
+    unittest.main()
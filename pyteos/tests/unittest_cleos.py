@@ -147,6 +147,8 @@ class Test1(unittest.TestCase):
         global contract_test
         contract_test = eosf.Contract(account_test, "eosio.token").deploy()
         self.assertTrue(not contract_test.error, "Contract(account_test")
+        self.assertEqual(contract_test.status, "executed")
+        self.assertTrue(contract_test.transaction in contract_test.payload())
 
     def test_69(self):
         global account_test
@@ -0,0 +1,215 @@
+import setup
+import cleos
+import eosf
+import pipeline
+import abi
+import profiler
+import unittest
+
+setup.set_json(False)
+setup.set_verbose(True)
+setup.use_keosd(False)
+
+class Test1(unittest.TestCase):
+
+    def run(self, result=None):
+        """ Stop after first error """
+        if not result.failures:
+            super().run(result)
+        print("-------------------------------------------\n")
+
+    @classmethod
+    def setUpClass(cls):
+        global wallet
+        global account_master
+        global alice
+        global carol
+        global contract
+
+        reset = eosf.reset()
+
+        account_master = eosf.AccountMaster()
+        wallet = eosf.Wallet()
+        wallet.import_key(account_master)
+        eosf.Contract(account_master, "eosio.bios").deploy()
+
+        alice = eosf.account(account_master)
+        wallet.import_key(alice)
+        carol = eosf.account(account_master)
+        wallet.import_key(carol)
+
+        account_token = eosf.account(account_master)
+        wallet.import_key(account_token)
+        contract = eosf.Contract(account_token, "eosio.token")
+        contract.deploy()
+        contract.push_action(
+            "create", 
+            '{"issuer":"eosio", "maximum_supply":"1000000000.0000 EOS", \
+                "can_freeze":0, "can_recall":0, "can_whitelist":0}')
+        contract.push_action(
+            "issue", 
+            '{"to":"' + alice.name + '", "quantity":"100.0000 EOS", \
+                "memo":"100.0000 EOS to alice"}',
+            permission=account_master)
+
+
+    def setUp(self):
+        pass
+
+
+    def test_05(self):
+        transaction = contract.push_transaction(
+            permission=alice, max_actions=4)
+        for i in range(10):
+            transaction.action(
+                "transfer", {
+                    "from": alice.name, "to": carol.name,
+                    "quantity": "1.0000 EOS", "memo": str(i)})
+        self.assertEqual(len(transaction), 10)
+
+        transactions = transaction.push()
+        self.assertTrue(not transaction.error)
+        self.assertEqual(len(transactions), 3)
+
+        results = transaction.results()
+        self.assertEqual(len(results), 10)
+        for result in results:
+            print(result["console"])
+
+        table = contract.table("accounts", carol)
+        self.assertEqual(table.json["rows"][0]["balance"], "10.0000 EOS")
+
+    def test_10(self):
+        transaction = alice.push_transaction()
+        transaction.action(
+            "transfer", {
+                "from": alice.name, "to": carol.name,
+                "quantity": "1.0000 EOS", "memo": ""},
+            account=contract.account)
+        transactions = transaction.push()
+        self.assertTrue(not transactions[0].error)
+        self.assertEqual(len(transactions[0].action_traces), 1)
+
+    def test_15(self):
+        receipts = []
+        with pipeline.TransactionPipeline(
+                window=4, callback=receipts.append, keep_receipts=True,
+                forceUnique=1) as pipe:
+            for i in range(20):
+                pipe.push_action(
+                    contract.account, "transfer",
+                    '{"from":"' + alice.name + '", "to":"' + carol.name 
+                        + '", "quantity":"0.0001 EOS", "memo":"' + str(i) 
+                        + '"}',
+                    permission=alice)
+            arrived = list(pipe.receipts())
+
+        self.assertEqual(len(arrived), 20)
+        self.assertEqual(len(receipts), 20)
+        self.assertEqual(pipe.failed, 0)
+
+    def test_20(self):
+        rows = list(contract.scan_table(
+            "accounts", [alice, carol, "nobody"], limit=1))
+        self.assertEqual(
+            sorted([scope for scope, row in rows]), 
+            sorted([alice.name, carol.name]))
+
+    def test_25(self):
+        token_abi = abi.get_abi(contract.account)
+        self.assertEqual(
+            token_abi.json["structs"],
+            abi.Abi.from_contract_dir(contract.contract_dir).json["structs"])
+
+        data = {
+            "from": alice.name, "to": carol.name,
+            "quantity": "1.0000 EOS", "memo": "packed"}
+        action = token_abi.action(contract.account, "transfer", data, alice)
+        self.assertEqual(
+            token_abi.unpack_action_data("transfer", action["data"]), data)
+
+        push_transaction = cleos.PushTransaction([action])
+        self.assertTrue(not push_transaction.error)
+        self.assertEqual(
+            push_transaction.action_traces[0]["act"]["data"], data)
+
+    def test_30(self):
+        table = contract.table("accounts", carol)
+        decoded = contract.table("accounts", carol, decode=True)
+        self.assertTrue(not decoded.error)
+        self.assertEqual(decoded.json["rows"], table.json["rows"])
+
+        columns = decoded.columns()
+        self.assertEqual(
+            abi.pair_to_asset(
+                columns["balance.amount"][0], columns["balance.symbol"][0]),
+            table.json["rows"][0]["balance"])
+
+    def test_35(self):
+        table = eosf.create_accounts(
+            account_master, 100, wallet=wallet, accounts_per_transaction=25)
+        self.assertTrue(not table.error)
+        self.assertEqual(len(table.created()), 100)
+        self.assertEqual(len(table.transactions), 4)
+
+        get_account = cleos.GetAccount(table[99].name, is_verbose=0)
+        self.assertTrue(not get_account.error)
+
+    def test_40(self):
+        data = '{"from":"' + alice.name + '", "to":"' + carol.name \
+            + '", "quantity":"0.0001 EOS", "memo":"compact"}'
+        action = cleos.PushAction(
+            contract.account, "transfer", data, alice, forceUnique=1,
+            is_verbose=0, compact=True)
+        self.assertTrue(not action.error)
+        self.assertEqual(action.status, "executed")
+        self.assertTrue(action.cpu_usage_us > 0)
+        self.assertEqual(action._out, "")
+        self.assertEqual(action.data, None)
+
+        setup.set_lazy_results(True)
+        action = cleos.PushAction(
+            contract.account, "transfer", data, alice, forceUnique=1,
+            is_verbose=0, json=True)
+        setup.set_lazy_results(False)
+        self.assertTrue(not action.error)
+        self.assertEqual(action.data["memo"], "compact")
+        self.assertEqual(action._out, "")
+
+    def test_45(self):
+        profiler.start()
+        for memo in ("one", "two", "three"):
+            contract.push_action(
+                "transfer", 
+                '{"from":"' + alice.name + '", "to":"' + carol.name 
+                    + '", "quantity":"0.0001 EOS", "memo":"' + memo + '"}',
+                alice, forceUnique=1, is_verbose=0)
+        summary = profiler.stop()
+        profiler.report(summary)
+
+        transfer = [item for item in summary 
+            if item["contract"] == contract.account.name 
+                and item["action"] == "transfer"][0]
+        self.assertEqual(transfer["count"], 3)
+        notified = [item for item in summary
+            if item["contract"] in (alice.name, carol.name)
+                and item["action"] == "transfer"]
+        self.assertEqual(len(notified), 2, "notifications")
+        for item in notified:
+            self.assertEqual(item["count"], 0)
+            self.assertEqual(item["inline"], 3)
+        self.assertTrue(transfer["cpu_usage_us"]["max"] > 0)
+        self.assertTrue(
+            transfer["cpu_usage_us"]["p95"] <= transfer["cpu_usage_us"]["max"])
+        self.assertTrue(transfer["elapsed_us"]["max"] > 0)
+        self.assertTrue(transfer["ram_bytes"] is not None)
+
+    def tearDown(self):
+        pass
+
+    @classmethod
+    def tearDownClass(cls):
+        eosf.stop()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ import setup
 import cleos
 import node
 import eosf
+import keys
 import time
 
 
@@ -76,6 +77,40 @@ NEXT TEST ====================================================================
         self.assertTrue(wallet.error)
 
 
+    def test_import_keys(self):
+        setup.use_keosd(False)
+        eosf.reset(is_verbose=0)
+        wallet = eosf.Wallet()
+        setup.set_native_transport(True)
+
+        key_pairs = keys.create_keys(200)
+        imported_keys = wallet.import_keys(
+            key_pairs, object_names={"account1": "alice", "account2": "carol"})
+        setup.set_native_transport(False)
+        self.assertEqual(len(imported_keys), 200)
+        self.assertTrue(not any([key.error for key in imported_keys]))
+        self.assertEqual(eosf.account_map()["account2"], "carol")
+
+        wallet_keys = cleos.WalletKeys(is_verbose=0).json[""]
+        self.assertTrue(key_pairs[199].key_public in wallet_keys)
+
+
+    def test_registry(self):
+        setup.use_keosd(False)
+        eosf.reset(is_verbose=0)
+        wallet = eosf.Wallet()
+        self.assertTrue(eosf.active_wallet() is wallet)
+
+        account_master = eosf.AccountMaster()
+        wallet.import_key(account_master)
+        self.assertEqual(
+            eosf.account_map()[account_master.name], "account_master")
+
+        eosf.account_object("alice", account_master)
+        self.assertEqual(alice.object_name, "alice")
+        self.assertEqual(eosf.account_map()[alice.name], "alice")
+
+
     def tearDown(self):
         pass
 
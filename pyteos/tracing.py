@@ -0,0 +1,286 @@
+#!/usr/bin/python3
+
+"""
+Spans of the commands, nested under the operations issuing them.
+
+.. module:: tracing
+    :platform: Unix, Windows
+    :synopsis: Spans of the commands, nested under the operations issuing them.
+
+.. moduleauthor:: Tokenika
+
+With tracing started, each `cleos` and `teos` command object records a span,
+carrying its command line, the time spent in the subprocess, the sizes of
+its output, the time spent parsing the output, its error flag, and the
+`elapsed` time reported by the node, if any. The spans nest under the spans
+of `eosf` operations, like `eosf.account()`, `eosf.Contract.deploy()` or
+`eosf.Wallet.import_key()`. The commands executed in a thread pool nest under
+the span submitting them, see `bind()`::
+
+    tracing.start("setup.trace.json")
+    ...
+    tracing.stop()
+
+The file is in the Chrome trace format, to be loaded in `chrome://tracing`,
+or, if its name ends with `.jsonl`, it is in the JSON lines format, a span
+in a line.
+"""
+
+import os
+import time
+import atexit
+import threading
+import itertools
+import functools
+import codec
+
+
+_lock = threading.Lock()
+_local = threading.local()
+_ids = itertools.count(1)
+_is_enabled = False
+_path = None
+_format = None
+_spans = []
+_origin = 0
+
+# The longest command line argument recorded:
+max_arg_length = 200
+
+
+class Span():
+    """ A time interval of an operation, with its attributes in `args`.
+    """
+    __slots__ = (
+        "id", "parent", "name", "category", "thread", "start", "end", "args",
+        "command_end")
+
+    def __init__(self, name, category, args):
+        self.id = next(_ids)
+        stack = _stack()
+        self.parent = stack[-1].id if stack else None
+        self.name = name
+        self.category = category
+        self.thread = threading.get_ident()
+        self.args = args
+        self.command_end = None
+        self.start = time.perf_counter()
+        self.end = None
+
+
+    def set(self, **args):
+        self.args.update(args)
+
+
+    def set_argv(self, argv):
+        self.args["argv"] = [
+            arg if len(arg) <= max_arg_length
+                else arg[:max_arg_length] + "..."
+            for arg in [str(arg) for arg in argv]]
+
+
+    def mark_command_end(self):
+        """ Mark the end of the command, the rest of the span is parsing.
+        """
+        self.command_end = time.perf_counter()
+
+
+def _stack():
+    try:
+        return _local.stack
+    except AttributeError:
+        _local.stack = []
+        return _local.stack
+
+
+def is_enabled():
+    return _is_enabled
+
+
+def start(path, format=None):
+    """ Start recording spans, to be written to the file `path` by `stop()`,
+    or at the exit. The `format` is 'chrome' or 'jsonl'; by default, it is
+    'jsonl' if the file name ends with `.jsonl`, and 'chrome' otherwise.
+    """
+    global _is_enabled, _path, _format, _origin
+    with _lock:
+        _path = path
+        _format = format if format \
+            else "jsonl" if path.endswith(".jsonl") else "chrome"
+        _spans.clear()
+        _origin = time.perf_counter()
+        _is_enabled = True
+
+
+def stop():
+    """ Stop recording spans, and write them. Return the path of the file,
+    or `None`, if tracing is not started.
+    """
+    global _is_enabled
+    with _lock:
+        if not _is_enabled:
+            return None
+        _is_enabled = False
+        spans = list(_spans)
+        _spans.clear()
+
+    with open(_path, "w") as out:
+        if _format == "jsonl":
+            for span in spans:
+                out.write(codec.dumps(span) + "\n")
+        else:
+            out.write(codec.dumps({
+                "traceEvents": [_chrome_event(span) for span in spans],
+                "displayTimeUnit": "ms"
+                }))
+    return _path
+
+
+atexit.register(stop)
+
+
+def spans():
+    """ Return the list of the spans recorded, as dictionaries.
+    """
+    with _lock:
+        return list(_spans)
+
+
+def current():
+    """ Return the innermost open `Span` of the thread, or `None`.
+    """
+    if not _is_enabled:
+        return None
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def bind(function, parent=None):
+    """ Return `function` to be called in another thread, with the spans it
+    records nested under the span `parent`, by default, the current span of
+    the calling thread::
+
+        executor.submit(tracing.bind(cleos.GetBlock), block_num)
+    """
+    if parent is None:
+        parent = current()
+    if parent is None:
+        return function
+
+    @functools.wraps(function)
+    def bound(*args, **kwargs):
+        stack = _stack()
+        depth = len(stack)
+        stack.append(parent)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            del stack[depth:]
+    return bound
+
+
+class span():
+    """ A context manager recording a span, if tracing is started. It binds
+    the `Span` object, or `None`::
+
+        with tracing.span("eosf.reset", "eosf") as span_:
+            ...
+    """
+    __slots__ = ("span",)
+
+    def __init__(self, name, category="eosf", **args):
+        self.span = Span(name, category, args) if _is_enabled else None
+
+
+    def __enter__(self):
+        if self.span:
+            _stack().append(self.span)
+        return self.span
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        span_ = self.span
+        if not span_:
+            return
+        span_.end = time.perf_counter()
+        stack = _stack()
+        if stack and stack[-1] is span_:
+            stack.pop()
+        if span_.command_end:
+            span_.args["parse_us"] = round(
+                (span_.end - span_.command_end) * 1e6, 1)
+        if exc_type:
+            span_.args["exception"] = exc_type.__name__
+        _record(span_)
+
+
+def _record(span_):
+    record = {
+        "id": span_.id,
+        "parent": span_.parent,
+        "name": span_.name,
+        "cat": span_.category,
+        "thread": span_.thread,
+        "start_us": round((span_.start - _origin) * 1e6, 1),
+        "dur_us": round((span_.end - span_.start) * 1e6, 1),
+        "args": span_.args
+        }
+    with _lock:
+        if _is_enabled:
+            _spans.append(record)
+
+
+def _chrome_event(record):
+    args = dict(record["args"])
+    args["id"] = record["id"]
+    args["parent"] = record["parent"]
+    return {
+        "name": record["name"], "cat": record["cat"], "ph": "X",
+        "ts": record["start_us"], "dur": record["dur_us"],
+        "pid": os.getpid(), "tid": record["thread"], "args": args
+        }
+
+
+def traced(name, category="eosf"):
+    """ Decorate a function, recording a span of each call, if tracing is
+    started. See `is_wrapper()`.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _is_enabled:
+                return function(*args, **kwargs)
+            with span(name, category):
+                return function(*args, **kwargs)
+        wrapper.__traced__ = True
+        return wrapper
+    return decorator
+
+
+class Traced():
+    """ A base class the construction of the objects of its subclasses is a
+    span of, named after the subclass and categorized with its module. The
+    direct subclasses are prototypes, like `cleos._Cleos`: their `__init__`
+    sets the arguments of the span of the subclass calling it, and is not a
+    span of its own.
+    """
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if Traced in cls.__bases__:
+            return
+        if "__init__" in cls.__dict__ \
+                and not hasattr(cls.__init__, "__traced__"):
+            cls.__init__ = traced(
+                cls.__module__ + "." + cls.__qualname__, cls.__module__)(
+                    cls.__init__)
+
+
+_wrapper_code = traced("")(lambda: None).__code__
+
+def is_wrapper(frame):
+    """ Whether a frame is of a function decorated with `traced()`. Code
+    looking at the frames of its callers skips such frames.
+    """
+    return frame.f_code is _wrapper_code